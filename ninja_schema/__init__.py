@@ -2,9 +2,10 @@
 
 __version__ = "0.14.3"
 
+from .orm.expressions import Expr
 from .orm.factory import SchemaFactory
 from .orm.model_schema import ModelSchema
 from .orm.model_validators import model_validator
 from .orm.schema import Schema
 
-__all__ = ["SchemaFactory", "Schema", "ModelSchema", "model_validator"]
+__all__ = ["SchemaFactory", "Schema", "ModelSchema", "model_validator", "Expr"]
@@ -0,0 +1,481 @@
+"""
+Bulk write of schema data to model instances.
+
+`apply_many` applies schemas to existing instances and saves them with one
+`bulk_update` per batch, updating only the union of fields changed in that batch.
+`bulk_create` builds new instances and saves them with `bulk_create`. `upsert`
+validates records per batch and writes them with a conflict handling `bulk_create`
+(`update_conflicts`), skipping rows whose values did not change.
+
+Foreign keys are assigned through their `attname` (`category_id`) from a pk, a nested
+schema's data or a model instance. Reverse relations (`Config.reverse_relations`) are
+read-only and are not written. Many-to-many fields are synchronized per batch and
+field: the existing rows of the auto created through table are read with one query, the
+removed rows are deleted with one query and the added rows are created with one
+`bulk_create`.
+"""
+
+import time
+import typing as t
+from enum import Enum
+from itertools import islice
+
+import django
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models, transaction
+from django.db.models import Field, ForeignObjectRel
+from pydantic import BaseModel
+
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import get_many_validator
+
+if t.TYPE_CHECKING:
+    from .model_schema import ModelSchemaConfig
+
+__all__ = [
+    "UpsertBatch",
+    "apply_many",
+    "assign_changed_fields",
+    "bulk_create",
+    "get_reverse_accessor_names",
+    "upsert",
+]
+
+
+def _iter_batches(
+    items: t.Iterable[t.Any], batch_size: t.Optional[int]
+) -> t.Iterator[t.List[t.Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size or None))
+        if not batch:
+            return
+        yield batch
+
+
+def _to_pk(value: t.Any, related_model: t.Type[models.Model]) -> t.Any:
+    if isinstance(value, models.Model):
+        return value.pk
+    if isinstance(value, dict):
+        return value.get(related_model._meta.pk.name)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _to_db_value(field: Field, value: t.Any) -> t.Any:
+    if isinstance(value, Enum):
+        value = value.value
+    # e.g. pydantic URL types to `str`, so unchanged values compare equal
+    return field.to_python(value) if value is not None else None
+
+
+def _set_if_changed(instance: models.Model, field: Field, value: t.Any) -> bool:
+    if getattr(instance, field.attname) == value:
+        return False
+    setattr(instance, field.attname, value)
+    return True
+
+
+def get_reverse_accessor_names(model: t.Type[models.Model]) -> t.Set[str]:
+    """Accessor names (`reading_set`) of the reverse relations of `model`"""
+    return {t.cast(str, rel.get_accessor_name()) for rel in model._meta.related_objects}
+
+
+def assign_changed_fields(
+    instance: models.Model, data: t.Dict[str, t.Any]
+) -> t.List[str]:
+    """
+    Assigns `data` to `instance` and returns the names of the concrete fields whose
+    value changed, to pass as `save(update_fields=...)`.
+    """
+    opts = instance._meta
+    reverse_accessors = get_reverse_accessor_names(type(instance))
+    update_fields = []
+    for name, value in data.items():
+        if name in reverse_accessors:
+            continue
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            field = None
+        if isinstance(field, ForeignObjectRel):
+            continue
+        if field is None or not field.concrete or field.many_to_many:
+            setattr(instance, name, value)
+            continue
+        if field.is_relation:
+            value = _to_pk(value, t.cast(t.Type[models.Model], field.related_model))
+        else:
+            value = _to_db_value(field, value)
+        if _set_if_changed(instance, field, value):
+            update_fields.append(field.name)
+    return update_fields
+
+
+class BulkWriter:
+    """Splits dumped schema data into column values and many-to-many pk sets"""
+
+    def __init__(
+        self, schema_cls: t.Type[BaseModel], config: "ModelSchemaConfig"
+    ) -> None:
+        self.schema_cls = schema_cls
+        self.model = t.cast(t.Type[models.Model], config.model)
+        # dumps with `by_alias=True` use the `attname` of foreign keys
+        self.django_fields = {
+            **{
+                field.attname: field
+                for field in config.django_fields.values()
+                if hasattr(field, "attname")
+            },
+            **config.django_fields,
+        }
+
+    def split(
+        self, data: t.Dict[str, t.Any]
+    ) -> t.Tuple[t.Dict[Field, t.Any], t.Dict[Field, t.Set[t.Any]], t.Dict]:
+        columns: t.Dict[Field, t.Any] = {}
+        m2m: t.Dict[Field, t.Set[t.Any]] = {}
+        extra: t.Dict[str, t.Any] = {}
+        for name, value in data.items():
+            field = self.django_fields.get(name)
+            if isinstance(field, ForeignObjectRel):
+                continue
+            if field is None or not field.concrete:
+                extra[name] = value
+            elif field.many_to_many:
+                related_model = t.cast(t.Type[models.Model], field.related_model)
+                m2m[field] = {_to_pk(item, related_model) for item in value or ()}
+            elif field.is_relation:
+                related_model = t.cast(t.Type[models.Model], field.related_model)
+                columns[field] = _to_pk(value, related_model)
+            else:
+                columns[field] = _to_db_value(field, value)
+        return columns, m2m, extra
+
+    def get_field(self, name: str) -> Field:
+        field = self.django_fields.get(name)
+        if field is None or not field.concrete or field.many_to_many:
+            raise ConfigError(
+                f"'{name}' is not a column of {self.model.__name__} in the schema."
+            )
+        return field
+
+    def set_m2m_after_insert(
+        self,
+        instances: t.List[models.Model],
+        m2m_values: t.Dict[Field, t.List[t.Tuple[int, t.Set[t.Any]]]],
+    ) -> None:
+        for field, values in m2m_values.items():
+            if any(instances[index].pk is None for index, _ in values):
+                raise ConfigError(
+                    f"Can not set '{field.name}' after bulk_create, the database "
+                    f"did not return the primary keys of {self.model.__name__}."
+                )
+            self.sync_m2m(
+                field,
+                [instances[index] for index, _ in values],
+                [pks for _, pks in values],
+            )
+
+    def sync_m2m(
+        self,
+        field: Field,
+        instances: t.List[models.Model],
+        values: t.List[t.Set[t.Any]],
+    ) -> bool:
+        """Sets `field` of every instance to the given pk sets, returns whether rows changed"""
+        remote_field = t.cast(t.Any, field.remote_field)
+        through = remote_field.through
+        if not through._meta.auto_created:
+            changed = False
+            for instance, pks in zip(instances, values):
+                manager = getattr(instance, field.name)
+                if set(manager.values_list("pk", flat=True)) != pks:
+                    manager.set(pks)
+                    changed = True
+            return changed
+
+        source = through._meta.get_field(field.m2m_field_name()).attname  # type: ignore[attr-defined]
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname  # type: ignore[attr-defined]
+        wanted = {instance.pk: pks for instance, pks in zip(instances, values)}
+        if None in wanted:
+            raise ValueError(
+                f"Can not set '{field.name}' of unsaved {self.model.__name__} instances."
+            )
+
+        existing: t.Dict[t.Any, t.Set[t.Any]] = {pk: set() for pk in wanted}
+        stale = []
+        for row_pk, source_pk, target_pk in through._default_manager.filter(
+            **{f"{source}__in": list(wanted)}
+        ).values_list("pk", source, target):
+            existing[source_pk].add(target_pk)
+            if target_pk not in wanted[source_pk]:
+                stale.append(row_pk)
+        added = [
+            through(**{source: source_pk, target: target_pk})
+            for source_pk, pks in wanted.items()
+            for target_pk in pks - existing[source_pk]
+        ]
+        if stale:
+            through._default_manager.filter(pk__in=stale).delete()
+        if added:
+            through._default_manager.bulk_create(added)
+        return bool(stale or added)
+
+
+def apply_many(
+    schema_cls: t.Type[BaseModel],
+    config: "ModelSchemaConfig",
+    instances: t.Sequence[models.Model],
+    schemas: t.Sequence[BaseModel],
+    *,
+    batch_size: t.Optional[int] = None,
+    **kwargs: t.Any,
+) -> t.Set[str]:
+    if len(instances) != len(schemas):
+        raise ValueError(
+            f"Got {len(instances)} instances for {len(schemas)} schema instances."
+        )
+    writer = BulkWriter(schema_cls, config)
+    updated_fields: t.Set[str] = set()
+    pairs = list(zip(instances, schemas))
+    with transaction.atomic(using=writer.model._default_manager.db):
+        for batch in _iter_batches(pairs, batch_size):
+            changed: t.Set[Field] = set()
+            m2m_values: t.Dict[Field, t.List[t.Tuple[int, t.Set[t.Any]]]] = {}
+            batch_instances = [instance for instance, _ in batch]
+            for index, (instance, schema) in enumerate(batch):
+                columns, m2m, extra = writer.split(schema.dict(**kwargs))
+                for field, value in columns.items():
+                    if field.primary_key:
+                        continue
+                    if _set_if_changed(instance, field, value):
+                        changed.add(field)
+                for name, value in extra.items():
+                    setattr(instance, name, value)
+                for field, pks in m2m.items():
+                    m2m_values.setdefault(field, []).append((index, pks))
+
+            if changed:
+                writer.model._default_manager.bulk_update(
+                    batch_instances, fields=[field.name for field in changed]
+                )
+                updated_fields.update(field.name for field in changed)
+            for field, values in m2m_values.items():
+                if writer.sync_m2m(
+                    field,
+                    [batch_instances[index] for index, _ in values],
+                    [pks for _, pks in values],
+                ):
+                    updated_fields.add(field.name)
+    return updated_fields
+
+
+def bulk_create(
+    schema_cls: t.Type[BaseModel],
+    config: "ModelSchemaConfig",
+    schemas: t.Sequence[BaseModel],
+    *,
+    batch_size: t.Optional[int] = None,
+    **kwargs: t.Any,
+) -> t.List[models.Model]:
+    writer = BulkWriter(schema_cls, config)
+    created: t.List[models.Model] = []
+    with transaction.atomic(using=writer.model._default_manager.db):
+        for batch in _iter_batches(schemas, batch_size):
+            instances = []
+            m2m_values: t.Dict[Field, t.List[t.Tuple[int, t.Set[t.Any]]]] = {}
+            for index, schema in enumerate(batch):
+                columns, m2m, extra = writer.split(schema.dict(**kwargs))
+                instance = writer.model(
+                    **{field.attname: value for field, value in columns.items()}
+                )
+                for name, value in extra.items():
+                    setattr(instance, name, value)
+                instances.append(instance)
+                for field, pks in m2m.items():
+                    m2m_values.setdefault(field, []).append((index, pks))
+
+            instances = writer.model._default_manager.bulk_create(instances)
+            writer.set_m2m_after_insert(instances, m2m_values)
+            created.extend(instances)
+    return created
+
+
+class UpsertBatch:
+    """Counts and timings of one `upsert` batch"""
+
+    def __init__(
+        self,
+        index: int,
+        size: int,
+        created: int,
+        updated: int,
+        unchanged: int,
+        update_fields: t.List[str],
+        validate_seconds: float,
+        write_seconds: float,
+    ) -> None:
+        self.index = index
+        self.size = size
+        self.created = created
+        self.updated = updated
+        self.unchanged = unchanged
+        self.update_fields = update_fields
+        self.validate_seconds = validate_seconds
+        self.write_seconds = write_seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"<UpsertBatch {self.index}: size={self.size} created={self.created} "
+            f"updated={self.updated} unchanged={self.unchanged} "
+            f"validate={self.validate_seconds:.4f}s write={self.write_seconds:.4f}s>"
+        )
+
+
+def _existing_rows_filter(
+    unique: t.List[Field], keys: t.List[t.Tuple[t.Any, ...]]
+) -> models.Q:
+    if len(unique) == 1:
+        return models.Q(**{f"{unique[0].attname}__in": [key[0] for key in keys]})
+    query = models.Q()
+    for key in keys:
+        query |= models.Q(**{field.attname: value for field, value in zip(unique, key)})
+    return query
+
+
+def upsert(
+    schema_cls: t.Type[BaseModel],
+    config: "ModelSchemaConfig",
+    records: t.Iterable[t.Any],
+    *,
+    unique_fields: t.Sequence[str],
+    update_fields: str = "changed",
+    batch_size: t.Optional[int] = None,
+    **kwargs: t.Any,
+) -> t.List[UpsertBatch]:
+    if django.VERSION < (4, 1):
+        raise ConfigError("upsert requires Django 4.1 or newer.")
+    if update_fields not in ("changed", "all"):
+        raise ConfigError(
+            f"Invalid update_fields '{update_fields}'. Expected 'changed' or 'all'."
+        )
+    writer = BulkWriter(schema_cls, config)
+    unique = [writer.get_field(name) for name in unique_fields]
+    validate_many = get_many_validator(schema_cls)
+    manager = writer.model._default_manager
+    results = []
+
+    with transaction.atomic(using=manager.db):
+        for batch_index, batch in enumerate(_iter_batches(records, batch_size)):
+            started = time.perf_counter()
+            schemas = validate_many(batch)
+            validated = time.perf_counter()
+
+            rows = [writer.split(schema.dict(**kwargs)) for schema in schemas]
+            keys = []
+            candidates: t.Dict[Field, None] = {}
+            for columns, _, _ in rows:
+                missing = [field.name for field in unique if field not in columns]
+                if missing:
+                    raise ConfigError(
+                        f"Unique field(s) {missing} are missing from the record."
+                    )
+                keys.append(tuple(columns[field] for field in unique))
+                candidates.update(
+                    dict.fromkeys(
+                        field
+                        for field in columns
+                        if not field.primary_key and field not in unique
+                    )
+                )
+
+            pk_attname = writer.model._meta.pk.attname
+            compared = list(candidates)
+            existing = {
+                tuple(row[1 : len(unique) + 1]): row
+                for row in manager.filter(
+                    _existing_rows_filter(unique, keys)
+                ).values_list(
+                    pk_attname,
+                    *(field.attname for field in unique),
+                    *(field.attname for field in compared),
+                )
+            }
+
+            created = updated = unchanged = 0
+            changed: t.Dict[Field, None] = {}
+            instances = []
+            to_write = []
+            m2m_values: t.Dict[Field, t.List[t.Tuple[int, t.Set[t.Any]]]] = {}
+            for index, ((columns, m2m, extra), key) in enumerate(zip(rows, keys)):
+                instance = writer.model(
+                    **{field.attname: value for field, value in columns.items()}
+                )
+                for name, value in extra.items():
+                    setattr(instance, name, value)
+                row = existing.get(key)
+                if row is None:
+                    created += 1
+                    to_write.append(instance)
+                else:
+                    differs = [
+                        field
+                        for field, current in zip(compared, row[len(unique) + 1 :])
+                        if field in columns and columns[field] != current
+                    ]
+                    changed.update(dict.fromkeys(differs))
+                    if differs:
+                        updated += 1
+                    else:
+                        unchanged += 1
+                    if differs or update_fields == "all":
+                        to_write.append(instance)
+                instances.append(instance)
+                for field, pks in m2m.items():
+                    m2m_values.setdefault(field, []).append((index, pks))
+
+            written = list(candidates if update_fields == "all" else changed)
+            if to_write and written:
+                manager.bulk_create(
+                    to_write,
+                    update_conflicts=True,
+                    unique_fields=[field.name for field in unique],
+                    update_fields=[field.name for field in written],
+                )
+            elif to_write:
+                manager.bulk_create(to_write, ignore_conflicts=True)
+
+            if m2m_values:
+                # existing rows are written without their pk to keep the batch in
+                # one INSERT, new rows only get theirs back on some databases
+                row_pks = {key: row[0] for key, row in existing.items()}
+                if any(
+                    instance.pk is None and key not in row_pks
+                    for instance, key in zip(instances, keys)
+                ):
+                    row_pks.update(
+                        (tuple(row[1:]), row[0])
+                        for row in manager.filter(
+                            _existing_rows_filter(unique, keys)
+                        ).values_list(pk_attname, *(field.attname for field in unique))
+                    )
+                for instance, key in zip(instances, keys):
+                    if instance.pk is None:
+                        setattr(instance, pk_attname, row_pks.get(key))
+                writer.set_m2m_after_insert(instances, m2m_values)
+
+            results.append(
+                UpsertBatch(
+                    batch_index,
+                    len(batch),
+                    created,
+                    updated,
+                    unchanged,
+                    [field.name for field in written],
+                    validated - started,
+                    time.perf_counter() - validated,
+                )
+            )
+    return results
@@ -0,0 +1,336 @@
+"""
+Columnar export of querysets.
+
+`to_columns` reads a queryset chunk by chunk with `values_list` and appends every
+value to a typed buffer chosen from the schema's converted python type. Buffers use
+Arrow's physical layouts: fixed width values, scaled integers for decimals, epoch
+offsets for temporal types, offsets + UTF-8 data for strings and dictionary codes for
+choice Enums. Nullable columns carry a byte validity mask (1 = valid).
+
+When NumPy is installed, fixed width buffers are exposed as NumPy arrays without
+copying.
+"""
+
+import datetime
+import typing as t
+import uuid
+from array import array
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+
+from django.db import models
+from django.db.models import Field, QuerySet
+from pydantic import BaseModel
+
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import (
+    get_literal_values,
+    iter_schema_fields,
+    unwrap_optional,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
+
+if t.TYPE_CHECKING:
+    from .model_schema import ModelSchemaConfig
+
+__all__ = ["Column", "to_columns"]
+
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=datetime.timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+MAX_INT64_DIGITS = 18
+
+STRING_FIELDS = (
+    models.CharField,
+    models.TextField,
+    models.FileField,
+    models.FilePathField,
+    models.GenericIPAddressField,
+)
+
+# kind: (array typecode, numpy dtype)
+FIXED_WIDTH_KINDS = {
+    "bool": ("B", "bool"),
+    "int64": ("q", "int64"),
+    "float64": ("d", "float64"),
+    "decimal": ("q", "int64"),
+    "timestamp[us]": ("q", "datetime64[us]"),
+    "date32": ("i", "datetime64[D]"),
+    "time64[us]": ("q", "int64"),
+    "duration[us]": ("q", "timedelta64[us]"),
+    "dictionary": ("i", "int32"),
+}
+
+
+def _time_to_micro(value: datetime.time) -> int:
+    return (
+        (value.hour * 60 + value.minute) * 60 + value.second
+    ) * 1_000_000 + value.microsecond
+
+
+def _micro_to_time(value: int) -> datetime.time:
+    seconds, microsecond = divmod(value, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return datetime.time(hour, minute, second, microsecond)
+
+
+class Column:
+    """
+    One exported column.
+
+    `values` holds the fixed width values (or the UTF-8 data of `utf8` columns and the
+    16-byte values of `uuid` columns), `validity` the byte mask of nullable columns,
+    `offsets` the string offsets of `utf8` columns, `categories` the Enum members of
+    `dictionary` columns and `scale` the decimal places of `decimal` columns.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        python_type: t.Any,
+        nullable: bool,
+        scale: int = 0,
+        categories: t.Optional[t.List[Enum]] = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.python_type = python_type
+        self.scale = scale
+        self.categories = categories
+        self.tz: t.Optional[datetime.tzinfo] = None
+        self.length = 0
+        self.validity: t.Optional[t.Any] = array("B") if nullable else None
+        self.offsets: t.Any = array("q", [0]) if kind == "utf8" else None
+        self.values: t.Any
+        if kind in FIXED_WIDTH_KINDS:
+            self.values = array(FIXED_WIDTH_KINDS[kind][0])
+        elif kind in ("utf8", "uuid"):
+            self.values = bytearray()
+        else:
+            self.values = []
+        # decoding reads the array buffers, which stay shared with NumPy views
+        self._raw_values = self.values
+        self._raw_validity = self.validity
+        self._encode = self._get_encoder()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"<Column {self.name}: {self.kind}[{self.length}]>"
+
+    def _get_encoder(self) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+        kind = self.kind
+        if kind == "decimal":
+            scale = self.scale
+            return lambda value: int(value.scaleb(scale))
+        if kind == "timestamp[us]":
+            return self._encode_datetime
+        if kind == "date32":
+            return lambda value: value.toordinal() - EPOCH_ORDINAL
+        if kind == "time64[us]":
+            return _time_to_micro
+        if kind == "duration[us]":
+            return lambda value: value // ONE_MICROSECOND
+        if kind == "dictionary":
+            codes = {member.value: code for code, member in enumerate(self.categories)}  # type: ignore[arg-type]
+            return codes.__getitem__
+        return None
+
+    def _encode_datetime(self, value: datetime.datetime) -> int:
+        if value.tzinfo is None:
+            return (value - EPOCH) // ONE_MICROSECOND
+        self.tz = datetime.timezone.utc
+        return (value - EPOCH_UTC) // ONE_MICROSECOND
+
+    def extend(self, chunk: t.List[t.Any]) -> None:
+        if self.validity is not None:
+            self.validity.extend([value is not None for value in chunk])
+        elif None in chunk:
+            raise ValueError(f"Column '{self.name}' is not nullable but got NULL.")
+
+        if self.kind == "utf8":
+            self._extend_utf8(chunk)
+        elif self.kind == "uuid":
+            for value in chunk:
+                self.values += value.bytes if value is not None else bytes(16)
+        elif self.kind == "object":
+            self.values.extend(chunk)
+        else:
+            encode = self._encode
+            if encode is None:
+                self.values.extend([0 if value is None else value for value in chunk])
+            else:
+                self.values.extend(
+                    [0 if value is None else encode(value) for value in chunk]
+                )
+        self.length += len(chunk)
+
+    def _extend_utf8(self, chunk: t.List[t.Any]) -> None:
+        offsets, data = self.offsets, self.values
+        offset = offsets[-1]
+        for value in chunk:
+            if value is not None:
+                encoded = str(value).encode()
+                data += encoded
+                offset += len(encoded)
+            offsets.append(offset)
+
+    def to_numpy(self) -> "Column":
+        """Exposes fixed width buffers as NumPy arrays, sharing their memory"""
+        if self.kind in FIXED_WIDTH_KINDS:
+            typecode, dtype = FIXED_WIDTH_KINDS[self.kind]
+            self.values = numpy.frombuffer(self.values, dtype=typecode).view(dtype)
+        elif self.kind == "uuid":
+            self.values = numpy.frombuffer(self.values, dtype="S16")
+        elif self.kind == "utf8":
+            self.offsets = numpy.frombuffer(self.offsets, dtype="int64")
+        if self.validity is not None:
+            self.validity = numpy.frombuffer(self.validity, dtype="bool")
+        return self
+
+    def is_valid(self, index: int) -> bool:
+        return self._raw_validity is None or bool(self._raw_validity[index])
+
+    def to_pylist(self) -> t.List[t.Any]:
+        """Decodes the column back into the schema's python values"""
+        return [
+            self._decode(index) if self.is_valid(index) else None
+            for index in range(self.length)
+        ]
+
+    def _decode(self, index: int) -> t.Any:
+        kind, values = self.kind, self._raw_values
+        if kind == "utf8":
+            start, end = self.offsets[index], self.offsets[index + 1]
+            return bytes(values[start:end]).decode()
+        if kind == "uuid":
+            return uuid.UUID(bytes=bytes(values[index * 16 : index * 16 + 16]))
+
+        value = values[index]
+        if kind == "bool":
+            return bool(value)
+        if kind == "float64":
+            return float(value)
+        if kind == "decimal":
+            return Decimal(value).scaleb(-self.scale)
+        if kind == "timestamp[us]":
+            epoch = EPOCH_UTC if self.tz else EPOCH
+            return epoch + datetime.timedelta(microseconds=value)
+        if kind == "date32":
+            return datetime.date.fromordinal(value + EPOCH_ORDINAL)
+        if kind == "time64[us]":
+            return _micro_to_time(value)
+        if kind == "duration[us]":
+            return datetime.timedelta(microseconds=value)
+        if kind == "dictionary":
+            return self.categories[value]  # type: ignore[index]
+        return value
+
+
+def get_column_kind(python_type: t.Any, field: Field) -> t.Tuple[str, t.Dict]:
+    literal_values = get_literal_values(python_type)
+    if literal_values is not None:
+        # choices as Literal hold plain values, typed like the first one
+        return get_column_kind(type(literal_values[0]), field)
+    if not isinstance(python_type, type):
+        return "object", {}
+    if issubclass(python_type, Enum):
+        return "dictionary", {"categories": list(python_type)}
+    if issubclass(python_type, bool):
+        return "bool", {}
+    if issubclass(python_type, int):
+        return "int64", {}
+    if issubclass(python_type, float):
+        return "float64", {}
+    if issubclass(python_type, Decimal):
+        if (
+            getattr(field, "max_digits", None) or MAX_INT64_DIGITS + 1
+        ) > MAX_INT64_DIGITS:
+            return "object", {}
+        return "decimal", {"scale": field.decimal_places}  # type: ignore[attr-defined]
+    if issubclass(python_type, datetime.datetime):
+        return "timestamp[us]", {}
+    if issubclass(python_type, datetime.date):
+        return "date32", {}
+    if issubclass(python_type, datetime.time):
+        return "time64[us]", {}
+    if issubclass(python_type, datetime.timedelta):
+        return "duration[us]", {}
+    if issubclass(python_type, uuid.UUID):
+        return "uuid", {}
+    if issubclass(python_type, str) or isinstance(field, STRING_FIELDS):
+        return "utf8", {}
+    return "object", {}
+
+
+def get_column_fields(
+    schema_cls: t.Type, config: "ModelSchemaConfig"
+) -> t.Dict[str, t.Tuple[Field, t.Any]]:
+    """Schema fields backed by a database column, with their converted python type"""
+    annotations = {
+        name: unwrap_optional(annotation)[0]
+        for name, _, annotation in iter_schema_fields(schema_cls)
+    }
+    columns = {}
+    for name, field in config.django_fields.items():
+        if not field.concrete or field.many_to_many or name not in annotations:
+            continue
+        python_type = annotations[name]
+        if isinstance(python_type, type) and issubclass(python_type, BaseModel):
+            # nested depth schema, not a column
+            continue
+        columns[name] = (field, python_type)
+    return columns
+
+
+def to_columns(
+    schema_cls: t.Type,
+    config: "ModelSchemaConfig",
+    queryset: QuerySet,
+    *,
+    fields: t.Optional[t.Iterable[str]] = None,
+    chunk_size: int = 2000,
+    use_numpy: t.Optional[bool] = None,
+) -> t.Dict[str, Column]:
+    column_fields = get_column_fields(schema_cls, config)
+    names = list(fields) if fields is not None else list(column_fields)
+    invalid = set(names) - column_fields.keys()
+    if invalid:
+        raise ConfigError(
+            f"Field(s) {invalid} of {schema_cls.__name__} can not be exported as columns."
+        )
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError("NumPy is required for `use_numpy=True`")
+
+    columns = {}
+    for name in names:
+        field, python_type = column_fields[name]
+        kind, options = get_column_kind(python_type, field)
+        columns[name] = Column(name, kind, python_type, field.null, **options)
+
+    rows = queryset.values_list(
+        *(column_fields[name][0].attname for name in names)
+    ).iterator(chunk_size=chunk_size)
+    column_list = list(columns.values())
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        for column, values in zip(column_list, zip(*chunk)):
+            column.extend(list(values))
+
+    if use_numpy:
+        for column in column_list:
+            column.to_numpy()
+    return columns
@@ -0,0 +1,145 @@
+"""
+Builds schema instances from trusted sources (rows read back from our own database)
+without running validation.
+
+Every schema class gets a construct plan, computed once, that maps each field to the
+attribute it is read from and to a converter that only does the work validation would
+have to do anyway: building nested schemas, reducing related model instances to their
+pk and turning raw choice values into the schema's ``Enum`` members. Nested schemas
+are built once per related row while an ``IdentityMap`` is active.
+"""
+
+import typing as t
+from enum import Enum
+
+from django.db.models import Model
+from typing_extensions import Annotated, get_args, get_origin
+
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1, iter_schema_fields
+
+from .expressions import load_field_expressions
+from .getters import convert_result
+from .identity import get_identity_map
+
+if IS_PYDANTIC_V1:
+    from pydantic import BaseModel
+else:
+    from pydantic import (
+        AnyUrl,
+        BaseModel,
+        IPvAnyAddress,
+        IPvAnyInterface,
+        IPvAnyNetwork,
+        TypeAdapter,
+    )
+
+__all__ = ["ConstructPlan", "get_construct_plan", "construct_from_object"]
+
+ConstructPlan = t.List[
+    t.Tuple[str, str, t.Optional[t.Callable[[t.Any], t.Any]]]
+]  # (field name, source attribute, converter)
+
+_MISSING = object()
+
+
+def _leaf_coercer(python_type: type) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+    """
+    Types whose database value differs from the validated value. Everything else
+    (str, int, Decimal, date, UUID, EmailStr, ...) is stored exactly as the database
+    returns it.
+    """
+    if issubclass(python_type, Enum):
+        return python_type
+    if IS_PYDANTIC_V1:
+        # pydantic v1 url and ip types serialize raw strings just as well
+        return None
+    if issubclass(python_type, AnyUrl):
+        return TypeAdapter(python_type).validate_python
+    if issubclass(python_type, (IPvAnyAddress, IPvAnyInterface, IPvAnyNetwork)):
+        return python_type
+    return None
+
+
+def _leaf_converter(python_type: type) -> t.Callable[[t.Any], t.Any]:
+    coerce = _leaf_coercer(python_type)
+
+    def convert(value: t.Any) -> t.Any:
+        if isinstance(value, Model):
+            return value.pk
+        if coerce is None or isinstance(value, python_type):
+            return value
+        return coerce(value)
+
+    return convert
+
+
+def _nested_converter(schema_cls: t.Type[BaseModel]) -> t.Callable[[t.Any], t.Any]:
+    build = t.cast(t.Any, schema_cls).from_orm_trusted
+
+    def convert(value: t.Any) -> t.Any:
+        identity_map = get_identity_map()
+        if identity_map is None:
+            return build(value)
+        return identity_map.get_or_build(schema_cls, value, build)
+
+    return convert
+
+
+def _build_converter(annotation: t.Any) -> t.Optional[t.Callable[[t.Any], t.Any]]:
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _build_converter(get_args(annotation)[0])
+
+    if origin is t.Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _build_converter(args[0]) if len(args) == 1 else None
+
+    if origin in (list, t.List, set, t.Set, tuple, t.Tuple):
+        item_args = get_args(annotation)
+        item_converter = _build_converter(item_args[0]) if item_args else None
+        if item_converter is None:
+            return None
+        return lambda value: [item_converter(item) for item in value]
+
+    if not isinstance(annotation, type):
+        return None
+
+    if issubclass(annotation, BaseModel) and hasattr(annotation, "from_orm_trusted"):
+        return _nested_converter(annotation)
+
+    return _leaf_converter(annotation)
+
+
+def get_construct_plan(schema_cls: t.Type[BaseModel]) -> ConstructPlan:
+    plan = schema_cls.__dict__.get("__ninja_construct_plan__")
+    if plan is None:
+        plan = [
+            (name, source, _build_converter(annotation))
+            for name, source, annotation in iter_schema_fields(schema_cls)
+        ]
+        setattr(schema_cls, "__ninja_construct_plan__", plan)  # noqa: B010
+    return t.cast(ConstructPlan, plan)
+
+
+def construct_from_object(
+    schema_cls: t.Type[BaseModel],
+    obj: t.Any,
+    plan: t.Optional[ConstructPlan] = None,
+) -> t.Any:
+    is_dict = isinstance(obj, dict)
+    if not is_dict:
+        load_field_expressions(schema_cls, obj)
+    values = {}
+    for name, source, converter in plan or get_construct_plan(schema_cls):
+        value = obj.get(source, _MISSING) if is_dict else getattr(obj, source, _MISSING)
+        if value is _MISSING:
+            # left unset, construct applies the field default
+            continue
+        value = convert_result(schema_cls, value, source)
+        if converter is not None and value is not None:
+            value = converter(value)
+        values[name] = value
+
+    if IS_PYDANTIC_V1:
+        return schema_cls.construct(**values)
+    return schema_cls.model_construct(**values)
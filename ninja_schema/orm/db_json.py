@@ -0,0 +1,291 @@
+"""
+JSON built by the database.
+
+`db_json` annotates a queryset with one `JSONObject` per row, built from the schema's
+converted fields, and reads it back as text: Python only joins the rows into an
+array. Nested schemas of forward foreign keys are nested `JSONObject`s over the joined
+columns, many-to-many fields are JSON arrays aggregated in a correlated subquery, in
+the order `from_orm` lists them: the relation's `relation_ordering`, else the related
+model's `Meta.ordering`, else `pk`.
+
+Only values the database writes as JSON the way the schema dumps them are supported:
+integers, floats, strings, booleans, dates and choices of those. Decimals, datetimes,
+times, durations, UUIDs, files and JSON fields raise a ConfigError, as do fields that
+are not model fields. Validators and serializers of the schema do not run, and key
+order follows the database (PostgreSQL `jsonb` sorts keys).
+
+Supported databases: SQLite (JSON1) and PostgreSQL.
+"""
+
+import datetime
+import typing as t
+from enum import Enum
+
+import django
+from django.db import connections, models
+from django.db.models import (
+    Aggregate,
+    Case,
+    F,
+    Func,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    When,
+    Window,
+)
+from django.db.models.expressions import RowRange
+from pydantic import BaseModel
+
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import (
+    get_literal_values,
+    iter_schema_fields,
+    unwrap_optional,
+)
+
+from .getters import RelationWindow
+from .query_plan import get_nested_schema
+
+if django.VERSION >= (3, 2):
+    from django.db.models.functions import Cast, JSONObject
+
+if t.TYPE_CHECKING:
+    from .model_schema import ModelSchemaConfig
+
+__all__ = ["db_json", "get_db_json_expression"]
+
+SUPPORTED_VENDORS = ("sqlite", "postgresql")
+JSON_ANNOTATION = "ninja_schema_json"
+JSON_SCALAR_TYPES = (bool, int, float, str)
+
+# models.JSONField only exists on Django >= 3.1
+_json_field_cls = getattr(models, "JSONField", models.TextField)
+
+
+class JSONValue(Func):
+    """A JSON value embedded in a JSON object. SQLite re-reads text as JSON."""
+
+    template = "%(expressions)s"
+
+    def __init__(self, expression: t.Any) -> None:
+        super().__init__(expression, output_field=_json_field_cls())
+
+    def as_sqlite(self, compiler: t.Any, connection: t.Any, **extra_context: t.Any):  # type: ignore[no-untyped-def]
+        # subqueries and CASE drop the JSON subtype of their value
+        return self.as_sql(compiler, connection, template="JSON(%(expressions)s)")
+
+
+class JSONBoolean(Func):
+    """Booleans, stored as 0/1 integers by SQLite"""
+
+    template = "%(expressions)s"
+
+    def as_sqlite(self, compiler: t.Any, connection: t.Any, **extra_context: t.Any):  # type: ignore[no-untyped-def]
+        return self.as_sql(
+            compiler,
+            connection,
+            template=(
+                "JSON(CASE WHEN %(expressions)s THEN 'true' "
+                "WHEN NOT %(expressions)s THEN 'false' END)"
+            ),
+        )
+
+
+class JSONList(Func):
+    """The JSON array of a subquery, `[]` when it has no row"""
+
+    template = "COALESCE(%(expressions)s, '[]')"
+
+    def __init__(self, expression: t.Any) -> None:
+        super().__init__(expression, output_field=_json_field_cls())
+
+    def as_sqlite(self, compiler: t.Any, connection: t.Any, **extra_context: t.Any):  # type: ignore[no-untyped-def]
+        return self.as_sql(
+            compiler, connection, template="JSON(COALESCE(%(expressions)s, '[]'))"
+        )
+
+    def as_postgresql(self, compiler: t.Any, connection: t.Any, **extra_context: t.Any):  # type: ignore[no-untyped-def]
+        return self.as_sql(
+            compiler, connection, template="COALESCE(%(expressions)s, '[]'::json)"
+        )
+
+
+class JSONArrayAgg(Aggregate):
+    function = "JSON_AGG"
+
+    def __init__(self, expression: t.Any) -> None:
+        super().__init__(expression, output_field=_json_field_cls())
+
+    def as_sqlite(self, compiler: t.Any, connection: t.Any, **extra_context: t.Any):  # type: ignore[no-untyped-def]
+        return self.as_sql(compiler, connection, function="JSON_GROUP_ARRAY")
+
+
+def _is_json_scalar(python_type: t.Any, field: models.Field) -> bool:
+    if isinstance(field, (models.FileField, _json_field_cls)):
+        return False
+    literal_values = get_literal_values(python_type)
+    if literal_values is not None:
+        return all(isinstance(value, JSON_SCALAR_TYPES) for value in literal_values)
+    if not isinstance(python_type, type):
+        return False
+    if issubclass(python_type, Enum):
+        return all(
+            isinstance(member.value, JSON_SCALAR_TYPES) for member in python_type
+        )
+    if issubclass(python_type, datetime.date):
+        return not issubclass(python_type, datetime.datetime)
+    return issubclass(python_type, JSON_SCALAR_TYPES)
+
+
+def _scalar_expression(lookup: str, python_type: t.Any) -> t.Any:
+    if isinstance(python_type, type) and issubclass(python_type, bool):
+        return JSONBoolean(F(lookup))
+    return F(lookup)
+
+
+def _order_by(ordering: t.Iterable[t.Any]) -> t.List[t.Any]:
+    """Expressions of an `order_by`/`Meta.ordering` sequence"""
+    expressions = []
+    for part in ordering:
+        if not isinstance(part, str):
+            expressions.append(part if hasattr(part, "descending") else part.asc())
+        elif part.startswith("-"):
+            expressions.append(F(part[1:]).desc())
+        elif part != "?":
+            expressions.append(F(part).asc())
+    return expressions
+
+
+def _related_list_expression(
+    field: models.Field,
+    nested: t.Optional[t.Type[BaseModel]],
+    window: t.Optional[RelationWindow],
+    prefix: str,
+    unsupported: t.List[str],
+) -> t.Any:
+    related_model = field.related_model
+    query_name = field.related_query_name()  # type: ignore[attr-defined]
+    item = (
+        F("pk")
+        if nested is None
+        else _json_object(nested, nested.get_schema_config(), "", unsupported)  # type: ignore[attr-defined]
+    )
+    ordering = (
+        window.ordering
+        if window is not None
+        else related_model._meta.ordering or ("pk",)  # type: ignore[union-attr]
+    )
+    # the order of an aggregate's input rows is unspecified, the order of a window
+    # is not: every row of the whole-partition frame holds the complete array
+    items = (
+        related_model._default_manager.filter(**{query_name: OuterRef(f"{prefix}pk")})  # type: ignore[union-attr]
+        .order_by()
+        .annotate(
+            items=Window(
+                JSONArrayAgg(item),
+                order_by=_order_by(ordering),
+                frame=RowRange(start=None, end=None),
+            )
+        )
+        .values("items")[:1]
+    )
+    return JSONList(Subquery(items, output_field=_json_field_cls()))
+
+
+def _json_object(
+    schema_cls: t.Type[BaseModel],
+    config: "ModelSchemaConfig",
+    prefix: str,
+    unsupported: t.List[str],
+) -> t.Any:
+    values = {}
+    for name, _, annotation in iter_schema_fields(schema_cls):
+        field = config.django_fields.get(name)
+        if field is None:
+            unsupported.append(f"{prefix}{name}")
+            continue
+        if not field.is_relation:
+            python_type, _ = unwrap_optional(annotation)
+            if _is_json_scalar(python_type, field):
+                values[name] = _scalar_expression(
+                    f"{prefix}{field.attname}", python_type
+                )
+            else:
+                unsupported.append(f"{prefix}{name}")
+            continue
+
+        nested = get_nested_schema(annotation)
+        if field.many_to_many and not field.auto_created:
+            window = config.relation_windows.get(name)
+            if window is not None and window.limit is not None:
+                # capped lists are not aggregated in the database
+                unsupported.append(f"{prefix}{name}")
+                continue
+            values[name] = _related_list_expression(
+                field, nested, window, prefix, unsupported
+            )
+        elif field.concrete and (field.many_to_one or field.one_to_one):
+            lookup = f"{prefix}{field.attname}"
+            if nested is None:
+                values[name] = F(lookup)
+                continue
+            nested_object = _json_object(
+                nested,
+                nested.get_schema_config(),  # type: ignore[attr-defined]
+                f"{prefix}{name}__",
+                unsupported,
+            )
+            values[name] = JSONValue(
+                Case(
+                    When(Q(**{f"{lookup}__isnull": False}), then=nested_object),
+                    output_field=_json_field_cls(),
+                )
+            )
+        else:
+            unsupported.append(f"{prefix}{name}")
+    return JSONObject(**values)
+
+
+def get_db_json_expression(
+    schema_cls: t.Type[BaseModel], config: "ModelSchemaConfig"
+) -> t.Any:
+    """The text expression of the JSON object of a row, built once per schema"""
+    expression = schema_cls.__dict__.get("__ninja_db_json_expression__")
+    if expression is None:
+        if django.VERSION < (3, 2):
+            raise ConfigError("db_json requires Django 3.2 or newer.")
+        unsupported: t.List[str] = []
+        json_object = _json_object(schema_cls, config, "", unsupported)
+        if unsupported:
+            raise ConfigError(
+                f"db_json does not support the field(s) {', '.join(unsupported)} "
+                f"of '{schema_cls.__name__}'."
+            )
+        expression = Cast(json_object, output_field=models.TextField())
+        setattr(schema_cls, "__ninja_db_json_expression__", expression)  # noqa: B010
+    return expression
+
+
+def db_json(
+    schema_cls: t.Type[BaseModel],
+    config: "ModelSchemaConfig",
+    queryset: QuerySet,
+    *,
+    chunk_size: int = 2000,
+) -> bytes:
+    vendor = connections[queryset.db].vendor
+    if vendor not in SUPPORTED_VENDORS:
+        raise ConfigError(
+            f"db_json does not support the '{vendor}' database. "
+            f"Expected one of {', '.join(SUPPORTED_VENDORS)}."
+        )
+    rows = (
+        queryset.annotate(
+            **{JSON_ANNOTATION: get_db_json_expression(schema_cls, config)}
+        )
+        .values_list(JSON_ANNOTATION, flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    return ("[" + ",".join(rows) + "]").encode()
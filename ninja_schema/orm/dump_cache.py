@@ -0,0 +1,234 @@
+"""
+Cache of the JSON dumped for model rows, in a Django cache backend.
+
+`DumpCache` stores the dumped bytes of a schema per row under
+`ninja_schema:<schema fingerprint>:<pk>`. An entry is only served while:
+
+- the row's version (e.g. an `updated_at` field) is the version it was dumped at
+- the row was not saved or deleted since (`post_save`/`post_delete` delete its entry)
+- no row of a nested depth schema or relation changed since: saving one (or a
+  `m2m_changed` of a related set) replaces the schema's generation token, which
+  is part of every entry, so all its entries become stale at once
+
+Changes that send no signal (`QuerySet.update`, `bulk_update`, raw SQL) are not seen,
+`version_field` covers them when it is kept up to date.
+
+The signal receivers of a schema are connected by its first `cached_dump` (or
+`get_dump_cache`) call in the process, so a process that saves rows before that call
+leaves the entries of a shared cache stale. `Config.dump_cache` (a cache alias or a
+list of aliases) connects them when the schema class is created instead.
+"""
+
+import hashlib
+import typing as t
+import uuid
+import weakref
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from pydantic import BaseModel
+
+from ninja_schema.pydanticutils import iter_schema_fields
+
+from .encoders import get_json_backend
+from .query_plan import get_nested_schema
+
+__all__ = ["DumpCache", "get_dump_cache"]
+
+KEY_PREFIX = "ninja_schema"
+
+ModelType = t.Type[models.Model]
+
+# caches to invalidate per concrete model: rows of the schema's own model, rows of
+# nested/related models and through models of many-to-many fields (with whether the
+# field belongs to the schema itself rather than to a nested schema). Weak, so schema
+# classes created at runtime are not kept alive by the signal receivers.
+_own_models: t.Dict[ModelType, "weakref.WeakSet[DumpCache]"] = {}
+_related_models: t.Dict[ModelType, "weakref.WeakSet[DumpCache]"] = {}
+_through_models: t.Dict[ModelType, "weakref.WeakKeyDictionary[DumpCache, bool]"] = {}
+
+
+def get_schema_fingerprint(schema_cls: t.Type[BaseModel]) -> str:
+    """Hash of the schema's name, model and fields, stable across processes"""
+    fingerprint = schema_cls.__dict__.get("__ninja_schema_fingerprint__")
+    if fingerprint is None:
+        config = t.cast(t.Any, schema_cls).get_schema_config()
+        parts = [
+            f"{schema_cls.__module__}.{schema_cls.__qualname__}",
+            config.model._meta.label,
+        ]
+        parts.extend(
+            f"{name}:{alias}:{annotation!r}"
+            for name, alias, annotation in iter_schema_fields(schema_cls)
+        )
+        fingerprint = hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+        setattr(schema_cls, "__ninja_schema_fingerprint__", fingerprint)  # noqa: B010
+    return t.cast(str, fingerprint)
+
+
+def _get_through_model(field: t.Any) -> t.Optional[ModelType]:
+    # ManyToManyRel has `through`, ManyToManyField has it on its remote field
+    through = getattr(field, "through", None) or field.remote_field.through
+    return t.cast(t.Optional[ModelType], through)
+
+
+def collect_watched_models(
+    schema_cls: t.Type[BaseModel],
+    related: t.Set[ModelType],
+    through: t.Dict[ModelType, bool],
+    own_level: bool = True,
+) -> None:
+    """Adds the models whose changes change the dump of `schema_cls`"""
+    config = t.cast(t.Any, schema_cls).get_schema_config()
+    annotations = {
+        name: annotation for name, _, annotation in iter_schema_fields(schema_cls)
+    }
+    for name, field in config.django_fields.items():
+        if not field.is_relation or name not in annotations:
+            continue
+        if field.many_to_many:
+            through_model = _get_through_model(field)
+            if through_model is not None:
+                through[through_model] = through.get(through_model, False) or own_level
+        elif field.one_to_many or not field.concrete:
+            # reverse relations change when the related rows are saved
+            related.add(field.related_model._meta.concrete_model)
+        nested = get_nested_schema(annotations[name])
+        if nested is not None:
+            related.add(field.related_model._meta.concrete_model)
+            collect_watched_models(nested, related, through, own_level=False)
+
+
+def _on_row_changed(sender: ModelType, instance: models.Model, **kwargs: t.Any) -> None:
+    model = t.cast(ModelType, sender._meta.concrete_model)
+    for dump_cache in list(_related_models.get(model, ())):
+        dump_cache.invalidate_all()
+    for dump_cache in list(_own_models.get(model, ())):
+        dump_cache.invalidate(instance.pk)
+
+
+def _on_m2m_changed(
+    sender: ModelType,
+    instance: models.Model,
+    action: str,
+    model: ModelType,
+    pk_set: t.Optional[t.Set[t.Any]],
+    **kwargs: t.Any,
+) -> None:
+    if not action.startswith("post_"):
+        return
+    for dump_cache, own_level in list(_through_models.get(sender, {}).items()):
+        if not own_level:
+            dump_cache.invalidate_all()
+        elif isinstance(instance, dump_cache.model):
+            dump_cache.invalidate(instance.pk)
+        elif pk_set and model._meta.concrete_model is dump_cache.model:
+            # changed from the other side of the relation
+            for pk in pk_set:
+                dump_cache.invalidate(pk)
+        else:
+            dump_cache.invalidate_all()
+
+
+def _connect_signals() -> None:
+    for signal in (post_save, post_delete):
+        signal.connect(_on_row_changed, dispatch_uid="ninja_schema_dump_cache")
+    m2m_changed.connect(_on_m2m_changed, dispatch_uid="ninja_schema_dump_cache")
+
+
+class DumpCache:
+    """Dumped JSON of one schema in one Django cache, with hit and miss counts"""
+
+    def __init__(self, schema_cls: t.Type[BaseModel], cache_alias: str) -> None:
+        self.schema_cls = schema_cls
+        self.cache_alias = cache_alias
+        self.model: ModelType = (
+            t.cast(t.Any, schema_cls).get_schema_config().model._meta.concrete_model
+        )
+        self.prefix = f"{KEY_PREFIX}:{get_schema_fingerprint(schema_cls)}"
+        self.generation_key = f"{self.prefix}:generation"
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def cache(self) -> t.Any:
+        # `caches` holds one backend instance per thread
+        return caches[self.cache_alias]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_key(self, pk: t.Any) -> str:
+        return f"{self.prefix}:{pk}"
+
+    def watch(self) -> None:
+        """Connects the invalidation of the cache to the models the schema touches"""
+        related: t.Set[ModelType] = set()
+        through: t.Dict[ModelType, bool] = {}
+        collect_watched_models(self.schema_cls, related, through)
+        _own_models.setdefault(self.model, weakref.WeakSet()).add(self)
+        for model in related:
+            _related_models.setdefault(model, weakref.WeakSet()).add(self)
+        for model, own_level in through.items():
+            _through_models.setdefault(model, weakref.WeakKeyDictionary())[self] = (
+                own_level
+            )
+        _connect_signals()
+
+    def _get_generation(self, entries: t.Dict[str, t.Any]) -> str:
+        generation = entries.get(self.generation_key)
+        if generation is None:
+            # a fresh token, also when the previous one was evicted
+            generation = uuid.uuid4().hex
+            if not self.cache.add(self.generation_key, generation, timeout=None):
+                generation = self.cache.get(self.generation_key, generation)
+        return t.cast(str, generation)
+
+    def dump(
+        self,
+        obj: models.Model,
+        version_field: t.Optional[str] = None,
+        timeout: t.Any = DEFAULT_TIMEOUT,
+    ) -> bytes:
+        """Returns the JSON of `obj` dumped with the schema, from the cache if valid"""
+        backend = get_json_backend(self.schema_cls)
+        if obj.pk is None:
+            return backend.dumps_bytes(self.schema_cls.from_orm(obj))
+        version = getattr(obj, version_field) if version_field else None
+        key = self.get_key(obj.pk)
+        entries = self.cache.get_many([key, self.generation_key])
+        generation = self._get_generation(entries)
+        entry = entries.get(key)
+        if entry is not None and entry[0] == version and entry[1] == generation:
+            self.hits += 1
+            return t.cast(bytes, entry[2])
+        self.misses += 1
+        data = backend.dumps_bytes(self.schema_cls.from_orm(obj))
+        self.cache.set(key, (version, generation, data), timeout=timeout)
+        return data
+
+    def invalidate(self, pk: t.Any) -> None:
+        self.invalidations += 1
+        self.cache.delete(self.get_key(pk))
+
+    def invalidate_all(self) -> None:
+        self.invalidations += 1
+        self.cache.set(self.generation_key, uuid.uuid4().hex, timeout=None)
+
+
+def get_dump_cache(schema_cls: t.Type[BaseModel], cache_alias: str) -> DumpCache:
+    """Returns the DumpCache of `schema_cls` in `cache_alias`, created once"""
+    dump_caches = schema_cls.__dict__.get("__ninja_dump_caches__")
+    if dump_caches is None:
+        dump_caches = {}
+        setattr(schema_cls, "__ninja_dump_caches__", dump_caches)  # noqa: B010
+    dump_cache = dump_caches.get(cache_alias)
+    if dump_cache is None:
+        dump_cache = dump_caches[cache_alias] = DumpCache(schema_cls, cache_alias)
+        dump_cache.watch()
+    return t.cast(DumpCache, dump_cache)
@@ -0,0 +1,213 @@
+"""
+JSON encoder backends used by `json()` and the bulk/streaming dump APIs of a schema.
+
+The backend is selected with `Config.json_backend` (`model_config["json_backend"]`):
+
+- ``"pydantic"`` (default): pydantic-core's native serializer on pydantic v2, the stock
+  `json()` of pydantic v1.
+- ``"orjson"``: `orjson` when it is installed, falls back to ``"json"`` otherwise.
+- ``"json"``: the standard library `json` module.
+
+Per-type encoders (`json_encoders` from the config, then pydantic's own encoders) are
+resolved once per type and schema instead of walking the MRO on every value.
+"""
+
+import datetime
+import json
+import typing as t
+
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+if IS_PYDANTIC_V1:
+    from pydantic import BaseModel
+    from pydantic.json import ENCODERS_BY_TYPE, pydantic_encoder
+
+    def _get_config_json_encoders(schema_cls: t.Type[BaseModel]) -> t.Dict:
+        return dict(getattr(schema_cls.__config__, "json_encoders", None) or {})  # type: ignore[attr-defined]
+
+    def _get_config_option(schema_cls: t.Type[BaseModel], name: str) -> t.Any:
+        return getattr(schema_cls.__config__, name, None)  # type: ignore[attr-defined]
+
+else:
+    from pydantic import BaseModel, TypeAdapter
+    from pydantic_core import to_jsonable_python
+
+    ENCODERS_BY_TYPE = {}
+
+    def pydantic_encoder(obj: t.Any) -> t.Any:
+        return to_jsonable_python(obj)
+
+    def _get_config_json_encoders(schema_cls: t.Type[BaseModel]) -> t.Dict:
+        return dict(schema_cls.model_config.get("json_encoders") or {})
+
+    def _get_config_option(schema_cls: t.Type[BaseModel], name: str) -> t.Any:
+        return schema_cls.model_config.get(name)
+
+
+__all__ = ["JSONBackend", "JSON_BACKENDS", "get_json_backend", "build_default_encoder"]
+
+DUMP_KWARGS = (
+    "include",
+    "exclude",
+    "by_alias",
+    "exclude_unset",
+    "exclude_defaults",
+    "exclude_none",
+)
+
+
+def build_default_encoder(
+    json_encoders: t.Dict[t.Any, t.Callable[[t.Any], t.Any]],
+) -> t.Callable[[t.Any], t.Any]:
+    """
+    Returns a `default` function for `json.dumps`/`orjson.dumps` which resolves the
+    encoder of a type once and reuses it for every value of that type.
+    """
+    resolved: t.Dict[type, t.Callable[[t.Any], t.Any]] = {}
+
+    def resolve(obj_type: type) -> t.Callable[[t.Any], t.Any]:
+        for base in obj_type.__mro__[:-1]:
+            if base in json_encoders:
+                return json_encoders[base]
+            if base in ENCODERS_BY_TYPE:
+                return ENCODERS_BY_TYPE[base]  # type: ignore[no-any-return]
+        return t.cast(t.Callable[[t.Any], t.Any], pydantic_encoder)
+
+    def default(obj: t.Any) -> t.Any:
+        obj_type = type(obj)
+        encoder = resolved.get(obj_type)
+        if encoder is None:
+            encoder = resolved[obj_type] = resolve(obj_type)
+        return encoder(obj)
+
+    return default
+
+
+def _split_kwargs(kwargs: t.Dict[str, t.Any]) -> t.Tuple[t.Dict, t.Dict]:
+    dump_kwargs = {key: kwargs.pop(key) for key in DUMP_KWARGS if key in kwargs}
+    return dump_kwargs, kwargs
+
+
+class JSONBackend:
+    name: str = ""
+
+    def __init__(self, schema_cls: t.Type[BaseModel]) -> None:
+        self.schema_cls = schema_cls
+        self.json_encoders = _get_config_json_encoders(schema_cls)
+        self.default = build_default_encoder(self.json_encoders)
+
+    def encode(self, data: t.Any, **options: t.Any) -> bytes:
+        raise NotImplementedError
+
+    def dumps(self, instance: BaseModel, **kwargs: t.Any) -> str:
+        dump_kwargs, options = _split_kwargs(kwargs)
+        return self.encode(instance.dict(**dump_kwargs), **options).decode()
+
+    def dumps_bytes(self, instance: BaseModel, **dump_kwargs: t.Any) -> bytes:
+        return self.encode(instance.dict(**dump_kwargs))
+
+    def dump_many(
+        self, instances: t.Iterable[BaseModel], **dump_kwargs: t.Any
+    ) -> bytes:
+        return self.encode([instance.dict(**dump_kwargs) for instance in instances])
+
+    def iter_lines(
+        self, instances: t.Iterable[BaseModel], **dump_kwargs: t.Any
+    ) -> t.Iterator[bytes]:
+        for instance in instances:
+            yield self.dumps_bytes(instance, **dump_kwargs) + b"\n"
+
+
+class StdlibJSONBackend(JSONBackend):
+    name = "json"
+
+    def encode(self, data: t.Any, **options: t.Any) -> bytes:
+        return json.dumps(data, default=self.default, **options).encode()
+
+
+class OrjsonJSONBackend(JSONBackend):
+    name = "orjson"
+
+    def __init__(self, schema_cls: t.Type[BaseModel]) -> None:
+        super().__init__(schema_cls)
+        self.option = 0
+        # orjson serializes these natively unless told to pass them to `default`
+        if any(
+            isinstance(tp, type) and issubclass(tp, (datetime.date, datetime.time))
+            for tp in self.json_encoders
+        ):
+            self.option |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    def encode(self, data: t.Any, **options: t.Any) -> bytes:
+        option = self.option
+        if options.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+        if options.pop("sort_keys", False):
+            option |= orjson.OPT_SORT_KEYS
+        if options:
+            raise TypeError(
+                f"Unexpected option(s) for the orjson backend: {', '.join(options)}"
+            )
+        return orjson.dumps(data, default=self.default, option=option)
+
+
+if IS_PYDANTIC_V1:
+
+    class PydanticJSONBackend(StdlibJSONBackend):
+        name = "pydantic"
+
+        def dumps(self, instance: BaseModel, **kwargs: t.Any) -> str:
+            return BaseModel.json(instance, **kwargs)
+
+else:
+
+    class PydanticJSONBackend(JSONBackend):  # type:ignore[no-redef]
+        name = "pydantic"
+
+        def __init__(self, schema_cls: t.Type[BaseModel]) -> None:
+            super().__init__(schema_cls)
+            self._list_adapter: t.Optional[TypeAdapter] = None
+
+        def dumps(self, instance: BaseModel, **kwargs: t.Any) -> str:
+            return instance.model_dump_json(**kwargs)
+
+        def dumps_bytes(self, instance: BaseModel, **dump_kwargs: t.Any) -> bytes:
+            return instance.__pydantic_serializer__.to_json(instance, **dump_kwargs)
+
+        def dump_many(
+            self, instances: t.Iterable[BaseModel], **dump_kwargs: t.Any
+        ) -> bytes:
+            if self._list_adapter is None:
+                self._list_adapter = TypeAdapter(t.List[self.schema_cls])  # type: ignore[name-defined]
+            return self._list_adapter.dump_json(list(instances), **dump_kwargs)
+
+
+JSON_BACKENDS: t.Dict[str, t.Type[JSONBackend]] = {
+    "pydantic": PydanticJSONBackend,
+    "orjson": OrjsonJSONBackend,
+    "json": StdlibJSONBackend,
+}
+
+
+def get_json_backend(schema_cls: t.Type[BaseModel]) -> JSONBackend:
+    """Returns the JSON backend of `schema_cls`, created once per schema class"""
+    backend = schema_cls.__dict__.get("__ninja_json_backend__")
+    if backend is None:
+        name = _get_config_option(schema_cls, "json_backend") or "pydantic"
+        if name not in JSON_BACKENDS:
+            raise ConfigError(
+                f"Invalid json_backend '{name}'. "
+                f"Expected one of {', '.join(JSON_BACKENDS)}."
+            )
+        backend_cls = JSON_BACKENDS[name]
+        if backend_cls is OrjsonJSONBackend and orjson is None:
+            backend_cls = StdlibJSONBackend
+        backend = backend_cls(schema_cls)
+        setattr(schema_cls, "__ninja_json_backend__", backend)  # noqa: B010
+    return t.cast(JSONBackend, backend)
@@ -0,0 +1,90 @@
+"""
+Schema fields computed by the database.
+
+A field annotated with `Expr` is read from the object like any other attribute, by
+its alias. `annotate(schema_cls, queryset)` adds the expressions of the schema as
+queryset annotations, so a list is computed in its query:
+
+    class WeekSchema(ModelSchema):
+        days_count: Annotated[int, Expr(Count("days"))]
+
+    WeekSchema.annotate(Week.objects.all())
+
+Model instances without the attribute (not loaded with `annotate`) get their missing
+expressions with one query per instance when they are serialized.
+"""
+
+import typing as t
+
+from django.db.models import Model, QuerySet
+from pydantic import BaseModel
+
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+
+__all__ = ["Expr", "annotate", "get_field_expressions", "load_field_expressions"]
+
+
+class Expr:
+    """`Annotated` metadata of a schema field computed by a query expression"""
+
+    __slots__ = ("expression",)
+
+    def __init__(self, expression: t.Any) -> None:
+        self.expression = expression
+
+    def __repr__(self) -> str:
+        return f"Expr({self.expression!r})"
+
+
+def _iter_field_metadata(
+    schema_cls: t.Type[BaseModel],
+) -> t.Iterator[t.Tuple[str, t.Iterable[t.Any]]]:
+    """yields (alias, Annotated metadata) of every field"""
+    if IS_PYDANTIC_V1:
+        for field in schema_cls.__fields__.values():  # type: ignore[attr-defined]
+            annotation = getattr(field, "annotation", None)
+            yield field.alias, getattr(annotation, "__metadata__", ())
+    else:
+        for name, field in schema_cls.model_fields.items():
+            alias = field.validation_alias
+            if not isinstance(alias, str):
+                alias = field.alias
+            yield alias or name, field.metadata
+
+
+def get_field_expressions(schema_cls: t.Type[BaseModel]) -> t.Dict[str, t.Any]:
+    """Query expressions of the `Expr` fields of a schema by alias"""
+    expressions = schema_cls.__dict__.get("__ninja_field_expressions__")
+    if expressions is None:
+        expressions = {
+            alias: metadata.expression
+            for alias, field_metadata in _iter_field_metadata(schema_cls)
+            for metadata in field_metadata
+            if isinstance(metadata, Expr)
+        }
+        setattr(schema_cls, "__ninja_field_expressions__", expressions)  # noqa: B010
+    return t.cast(t.Dict[str, t.Any], expressions)
+
+
+def annotate(schema_cls: t.Type[BaseModel], queryset: QuerySet) -> QuerySet:
+    expressions = get_field_expressions(schema_cls)
+    return queryset.annotate(**expressions) if expressions else queryset
+
+
+def load_field_expressions(schema_cls: t.Type[BaseModel], obj: t.Any) -> None:
+    """Sets the missing `Expr` fields of a saved model instance, in one query"""
+    expressions = get_field_expressions(schema_cls)
+    if not expressions or not isinstance(obj, Model) or obj.pk is None:
+        return
+    missing = {
+        alias: expression
+        for alias, expression in expressions.items()
+        if alias not in obj.__dict__
+    }
+    if not missing:
+        return
+    manager = type(obj)._default_manager.using(obj._state.db)
+    values = manager.filter(pk=obj.pk).annotate(**missing).values_list(*missing).first()
+    if values is not None:
+        for alias, value in zip(missing, values):
+            setattr(obj, alias, value)
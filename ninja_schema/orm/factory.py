@@ -1,6 +1,7 @@
 import typing
-from typing import TYPE_CHECKING, List, Optional, Type, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union, cast
 
+from django.apps import apps
 from django.db.models import Model
 
 from ninja_schema.errors import ConfigError
@@ -14,7 +15,64 @@ if TYPE_CHECKING:
     from .model_schema import ModelSchema
     from .schema import Schema
 
-__all__ = ["SchemaFactory"]
+__all__ = ["SchemaFactory", "rebuild_factory_schema"]
+
+FactoryKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+# a factory key and the number of schemas created with it before, so identical
+# `create_schema` calls each get a class of their own
+SchemaKey = Tuple[str, Tuple[Tuple[str, Any], ...], int]
+
+# schemas created by the factory in this process, by (model label, normalized config,
+# index) and the number of schemas created per (model label, normalized config)
+_factory_schemas: Dict[SchemaKey, Type["ModelSchema"]] = {}
+_factory_counts: Dict[FactoryKey, int] = {}
+
+
+def _normalize_names(names: Optional[Union[str, List[str]]]) -> Any:
+    if names is None or isinstance(names, str):
+        return names
+    return tuple(sorted(names))
+
+
+def get_factory_key(
+    model: Type[Model], factory_config: Dict[str, Any]
+) -> Optional[FactoryKey]:
+    key = (model._meta.label, tuple(sorted(factory_config.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def rebuild_factory_schema(
+    model_label: str, factory_config: Tuple[Tuple[str, Any], ...], index: int = 0
+) -> Type["ModelSchema"]:
+    """
+    Unpickles a schema created by `SchemaFactory.create_schema`, building it only
+    once per process.
+    """
+    key = (model_label, factory_config, index)
+    schema = _factory_schemas.get(key)
+    if schema is None:
+        config = dict(factory_config)
+        skip_registry = config.pop("skip_registry")
+        model = apps.get_model(model_label)
+        registered = schema_registry.get_model_schema(model)
+        if getattr(registered, "__ninja_factory_key__", None) == key:
+            schema = cast(Type["ModelSchema"], registered)
+        else:
+            schema = cast(
+                Type["ModelSchema"],
+                SchemaFactory.create_schema(model, skip_registry=True, **config),
+            )
+            # known by the key of the pickled schema only
+            _factory_schemas.pop(schema.__ninja_factory_key__, None)
+            schema.__ninja_factory_key__ = key
+            if not skip_registry and registered is None:
+                schema_registry.register_model(model, schema)
+        _factory_schemas[key] = schema
+    return schema
 
 
 class SchemaFactory:
@@ -34,7 +92,7 @@ class SchemaFactory:
         *,
         registry: SchemaRegister = schema_registry,
         name: str = "",
-        depth: int = 0,
+        depth: Union[int, Dict[str, int]] = 0,
         fields: Optional[List[str]] = None,
         exclude: Optional[List[str]] = None,
         skip_registry: bool = False,
@@ -70,6 +128,28 @@ class SchemaFactory:
         )
 
         new_schema = cast(Type[ModelSchema], new_schema)
+        factory_key = get_factory_key(
+            model,
+            {
+                "name": name,
+                "depth": (
+                    depth
+                    if isinstance(depth, int)
+                    else tuple(sorted(dict(depth).items()))
+                ),
+                "fields": _normalize_names(fields),
+                "exclude": _normalize_names(exclude),
+                "optional_fields": _normalize_names(optional_fields),
+                "skip_registry": skip_registry,
+                **model_config_options,
+            },
+        )
+        if factory_key is not None:
+            index = _factory_counts.get(factory_key, 0)
+            _factory_counts[factory_key] = index + 1
+            schema_key = (*factory_key, index)
+            new_schema.__ninja_factory_key__ = schema_key
+            _factory_schemas[schema_key] = new_schema
         if not skip_registry:
             registry.register_model(model, new_schema)
         return new_schema
@@ -0,0 +1,241 @@
+"""
+URLs of the files of `FileField`s, resolved in batches.
+
+By default a file field is dumped as `FieldFile.url`, one `storage.url(name)` call
+per row. `Config.file_url_resolver` sets a `FileURLResolver` for every file field of
+a schema, or a `{field: resolver}` mapping per field:
+
+    class DocumentSchema(ModelSchema):
+        class Config:
+            model = Document
+            file_url_resolver = CachedFileURLResolver(SignedURLResolver(), timeout=300)
+
+A resolver turns many names of one storage into URLs in one `resolve_many` call,
+which storages that sign URLs (or look them up) can override. `from_orm_many`,
+`construct_many`, `dump_json_many` and `iter_json_lines` resolve the file names of
+their rows, and of the loaded (prefetched or joined) rows of their nested schemas, in
+batches and memoize the URLs in a `FileURLMemo`, so a file shared by many rows is
+resolved once. The memo lives for the call, or for the whole request with
+`FileURLMemoMiddleware` (or a `with FileURLMemo().activate():` block).
+`CachedFileURLResolver` also keeps the URLs in a Django cache between calls.
+"""
+
+import hashlib
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from pydantic import BaseModel
+
+from ninja_schema.pydanticutils import iter_schema_fields
+
+from .query_plan import get_nested_schema
+
+__all__ = [
+    "FileURLResolver",
+    "CachedFileURLResolver",
+    "FileURLMemo",
+    "FileURLMemoMiddleware",
+    "get_file_url_memo",
+    "get_file_url_resolver",
+    "resolve_file_url",
+]
+
+_active_file_url_memo: "ContextVar[t.Optional[FileURLMemo]]" = ContextVar(
+    "ninja_schema_file_url_memo", default=None
+)
+
+
+class FileURLResolver:
+    """Resolves the URLs of the files of a storage, a batch of names at a time"""
+
+    def resolve_many(self, storage: t.Any, names: t.Sequence[str]) -> t.Dict[str, str]:
+        return {name: storage.url(name) for name in names}
+
+
+class CachedFileURLResolver(FileURLResolver):
+    """A resolver whose URLs are kept in a Django cache for `timeout` seconds"""
+
+    def __init__(
+        self,
+        resolver: t.Optional[FileURLResolver] = None,
+        cache_alias: str = "default",
+        timeout: t.Any = DEFAULT_TIMEOUT,
+        key_prefix: str = "ninja_schema:file_url",
+    ) -> None:
+        self.resolver = resolver or FileURLResolver()
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, storage: t.Any, name: str) -> str:
+        storage_cls = type(getattr(storage, "_wrapped", storage))
+        location = getattr(storage, "base_url", None) or ""
+        digest = hashlib.sha1(f"{location}\n{name}".encode()).hexdigest()
+        return f"{self.key_prefix}:{storage_cls.__qualname__}:{digest}"
+
+    def resolve_many(self, storage: t.Any, names: t.Sequence[str]) -> t.Dict[str, str]:
+        cache = caches[self.cache_alias]
+        keys = {name: self.get_key(storage, name) for name in names}
+        cached = cache.get_many(list(keys.values()))
+        urls = {name: cached[key] for name, key in keys.items() if key in cached}
+        missing = [name for name in names if name not in urls]
+        self.hits += len(urls)
+        self.misses += len(missing)
+        if missing:
+            resolved = self.resolver.resolve_many(storage, missing)
+            cache.set_many(
+                {keys[name]: url for name, url in resolved.items()},
+                timeout=self.timeout,
+            )
+            urls.update(resolved)
+        return urls
+
+
+class FileURLMemo:
+    """The URLs resolved during one call, by (resolver, storage, name)"""
+
+    def __init__(self) -> None:
+        self._urls: t.Dict[t.Tuple[t.Any, t.Any, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def resolve_many(
+        self, resolver: FileURLResolver, storage: t.Any, names: t.Iterable[str]
+    ) -> None:
+        """Resolves the names not resolved yet in one `resolve_many` call"""
+        missing = list(
+            dict.fromkeys(
+                name for name in names if (resolver, storage, name) not in self._urls
+            )
+        )
+        if missing:
+            for name, url in resolver.resolve_many(storage, missing).items():
+                self._urls[(resolver, storage, name)] = url
+
+    def resolve(self, resolver: FileURLResolver, field_file: FieldFile) -> str:
+        name = t.cast(str, field_file.name)
+        key = (resolver, field_file.storage, name)
+        url = self._urls.get(key)
+        if url is None:
+            self.resolve_many(resolver, field_file.storage, [name])
+            url = self._urls[key]
+        return url
+
+    def prefetch(self, schema_cls: t.Type[BaseModel], objs: t.Iterable[t.Any]) -> None:
+        """
+        Resolves the files of `objs` read by the file fields of `schema_cls` and of
+        its nested schemas, one `resolve_many` call per resolver and storage
+        """
+        batches: t.Dict[t.Tuple[t.Any, t.Any], t.List[str]] = {}
+        _collect_file_names(schema_cls, objs, batches)
+        for (resolver, storage), names in batches.items():
+            self.resolve_many(resolver, storage, names)
+
+    @contextmanager
+    def activate(self) -> t.Iterator["FileURLMemo"]:
+        token = _active_file_url_memo.set(self)
+        try:
+            yield self
+        finally:
+            _active_file_url_memo.reset(token)
+
+
+class FileURLMemoMiddleware:
+    """Memoizes the file URLs resolved during a request, across schemas and calls"""
+
+    def __init__(self, get_response: t.Callable[[t.Any], t.Any]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: t.Any) -> t.Any:
+        with FileURLMemo().activate():
+            return self.get_response(request)
+
+
+def _get_loaded_related(obj: t.Any, name: str, config: t.Any) -> t.List[t.Any]:
+    """The related rows of `obj` already loaded for relation `name`, without a query"""
+    if not isinstance(obj, models.Model):
+        return []
+    window = config.relation_windows.get(name)
+    if window is not None and window.to_attr is not None:
+        windowed = getattr(obj, window.to_attr, None)
+        if windowed is not None:
+            return list(windowed)
+    descriptor: t.Any = getattr(type(obj), name, None)
+    if hasattr(descriptor, "is_cached"):
+        # forward and reverse one-to-one and foreign keys
+        if not descriptor.is_cached(obj):
+            return []
+        try:
+            related = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return []
+        return [related] if related is not None else []
+    queryset = getattr(obj, name).all()
+    if queryset._result_cache is None:
+        return []
+    return list(queryset)
+
+
+def _collect_file_names(
+    schema_cls: t.Type[BaseModel],
+    objs: t.Iterable[t.Any],
+    batches: t.Dict[t.Tuple[t.Any, t.Any], t.List[str]],
+) -> None:
+    config = getattr(schema_cls, "__ninja_schema_config__", None)
+    if config is None:
+        return
+    resolvers = config.file_url_resolvers
+    nested_schemas = {}
+    for name, _, annotation in iter_schema_fields(schema_cls):
+        nested = get_nested_schema(annotation)
+        if nested is not None:
+            nested_schemas[name] = nested
+    if not resolvers and not nested_schemas:
+        return
+    related: t.Dict[str, t.List[t.Any]] = {name: [] for name in nested_schemas}
+    for obj in objs:
+        for name, resolver in resolvers.items():
+            field_file = getattr(obj, name, None)
+            if isinstance(field_file, FieldFile) and field_file:
+                batches.setdefault((resolver, field_file.storage), []).append(
+                    t.cast(str, field_file.name)
+                )
+        for name in nested_schemas:
+            related[name].extend(_get_loaded_related(obj, name, config))
+    for name, nested in nested_schemas.items():
+        if related[name]:
+            _collect_file_names(nested, related[name], batches)
+
+
+def get_file_url_memo() -> t.Optional[FileURLMemo]:
+    return _active_file_url_memo.get()
+
+
+def get_file_url_resolver(schema_cls: t.Any, key: str) -> t.Optional[FileURLResolver]:
+    config = getattr(schema_cls, "__ninja_schema_config__", None)
+    if config is None:
+        return None
+    return config.file_url_resolvers.get(key)  # type: ignore[no-any-return]
+
+
+def resolve_file_url(
+    field_file: FieldFile, resolver: t.Optional[FileURLResolver]
+) -> t.Optional[str]:
+    if not field_file:
+        return None
+    if resolver is None:
+        return field_file.url
+    memo = get_file_url_memo()
+    if memo is None:
+        name = t.cast(str, field_file.name)
+        return resolver.resolve_many(field_file.storage, [name])[name]
+    return memo.resolve(resolver, field_file)
@@ -1,30 +1,112 @@
 import typing as t
 
 import pydantic
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Manager, QuerySet
 from django.db.models.fields.files import FieldFile
 
 from ninja_schema.pydanticutils import IS_PYDANTIC_V1
 
+from .file_urls import get_file_url_resolver, resolve_file_url
+
 __all__ = [
     "DjangoGetter",
 ]
 
 
-class DjangoGetterMixin:
-    def _convert_result(self, result: t.Any) -> t.Any:
-        if isinstance(result, Manager):
-            return list(result.all())
+def _ordering_key(attname: str) -> t.Callable[[t.Any], t.Tuple[bool, t.Any]]:
+    def key(obj: t.Any) -> t.Tuple[bool, t.Any]:
+        value = getattr(obj, attname)
+        return (value is not None, value if value is not None else 0)
+
+    return key
+
+
+class RelationWindow:
+    """Ordering and row limit of a related list"""
+
+    __slots__ = ("ordering", "limit", "to_attr")
+
+    def __init__(
+        self, name: str, ordering: t.Tuple[str, ...], limit: t.Optional[int]
+    ) -> None:
+        self.ordering = ordering
+        self.limit = limit
+        # Django only prefetches sliced querysets into a list attribute
+        self.to_attr = f"_{name}_window" if limit is not None else None
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        queryset = queryset.order_by(*self.ordering)
+        return queryset[: self.limit] if self.limit is not None else queryset
+
+    def sort(self, objs: t.List) -> t.Optional[t.List]:
+        """
+        Sorts loaded objects by the ordering, None when it is not on local columns
+        (NULLs first, as the ascending order of SQLite and MySQL)
+        """
+        if not objs:
+            return objs
+        opts = objs[0]._meta
+        for part in reversed(self.ordering):
+            name = part.lstrip("-")
+            try:
+                field = opts.pk if name == "pk" else opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation:
+                return None
+            objs.sort(key=_ordering_key(field.attname), reverse=part.startswith("-"))
+        return objs
+
+    def list_related(self, manager: Manager) -> t.List:
+        """The related objects of a manager, from the windowed prefetch if any"""
+        if self.to_attr is not None:
+            prefetched = getattr(manager.instance, self.to_attr, None)  # type: ignore[attr-defined]
+            if prefetched is not None:
+                return list(prefetched)
+        queryset = manager.all()
+        if queryset._result_cache is not None:
+            # prefetched without the window, queried again if it can not be sorted
+            objs = self.sort(list(queryset))
+            if objs is not None:
+                return objs[: self.limit]
+        return list(self.apply(queryset))
+
+
+def get_relation_window(schema_cls: t.Any, key: str) -> t.Optional[RelationWindow]:
+    config = getattr(schema_cls, "__ninja_schema_config__", None)
+    if config is None:
+        return None
+    return config.relation_windows.get(key)  # type: ignore[no-any-return]
+
+
+def convert_result(schema_cls: t.Any, result: t.Any, key: t.Optional[str]) -> t.Any:
+    """The value of attribute `key` of a model instance, as read by `schema_cls`"""
+    if isinstance(result, Manager):
+        window = None
+        if key is not None:
+            window = get_relation_window(schema_cls, key)
+        if window is not None:
+            return window.list_related(result)
+        return list(result.all())
+
+    elif isinstance(result, getattr(QuerySet, "__origin__", QuerySet)):
+        return list(result)
+
+    elif isinstance(result, FieldFile):
+        resolver = None
+        if key is not None:
+            resolver = get_file_url_resolver(schema_cls, key)
+        return resolve_file_url(result, resolver)
+
+    return result
 
-        elif isinstance(result, getattr(QuerySet, "__origin__", QuerySet)):
-            return list(result)
 
-        elif isinstance(result, FieldFile):
-            if not result:
-                return None
-            return result.url
+class DjangoGetterMixin:
+    _schema_cls: t.Any = None  # set by DjangoGetter
 
-        return result
+    def _convert_result(self, result: t.Any, key: t.Optional[str] = None) -> t.Any:
+        return convert_result(self._schema_cls, result, key)
 
 
 if IS_PYDANTIC_V1:
@@ -34,9 +116,16 @@ if IS_PYDANTIC_V1:
     assert pydantic_version >= [1, 6], "Pydantic 1.6+ required"
 
     class DjangoGetter(GetterDict, DjangoGetterMixin):
+        __slots__ = ("_schema_cls",)
+
+        def __init__(self, obj: t.Any, schema_cls: t.Any = None, context: t.Any = None):
+            # the validation context is pydantic v2 only
+            super().__init__(obj)
+            self._schema_cls = schema_cls
+
         def get(self, key: t.Any, default: t.Any = None) -> t.Any:
             result = super().get(key, default)
-            return self._convert_result(result)
+            return self._convert_result(result, key)
 
 else:
 
@@ -52,13 +141,14 @@ else:
             # if key.startswith("__pydantic"):
             #     return getattr(self._obj, key)
             if isinstance(self._obj, dict):
-                if key not in self._obj:
-                    raise AttributeError(key)
-                value = self._obj[key]
+                try:
+                    value = self._obj[key]
+                except KeyError:
+                    raise AttributeError(key) from None
             else:
                 try:
                     value = getattr(self._obj, key)
                 except AttributeError as e:
                     raise AttributeError(key) from e
 
-            return self._convert_result(value)
+            return self._convert_result(value, key)
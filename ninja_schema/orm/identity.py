@@ -0,0 +1,61 @@
+"""
+Identity map of the schema instances built from model rows.
+
+When many rows share a few related rows (1,000 events of 5 categories), every parent
+validates the same related row again. While an `IdentityMap` is active, nested schema
+instances are built once per (schema, model, pk) and reused by every parent, both by
+validation (`from_orm`) and by trusted construction (`from_orm_trusted`).
+
+The map lives for one call (or one explicit `with identity_map.activate():` block).
+Reused instances are shared objects: changing one changes it for every parent.
+"""
+
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import Model
+
+__all__ = ["IdentityMap", "get_identity_map"]
+
+_active_identity_map: "ContextVar[t.Optional[IdentityMap]]" = ContextVar(
+    "ninja_schema_identity_map", default=None
+)
+
+
+class IdentityMap:
+    """Schema instances by (schema, model, pk)"""
+
+    def __init__(self) -> None:
+        self._instances: t.Dict[t.Tuple[type, type, t.Any], t.Any] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def get_or_build(
+        self, schema_cls: type, obj: t.Any, build: t.Callable[[t.Any], t.Any]
+    ) -> t.Any:
+        """Returns the instance of `schema_cls` built from the row of `obj`, building it once"""
+        pk = obj.pk if isinstance(obj, Model) else None
+        if pk is None:
+            return build(obj)
+        key = (schema_cls, type(obj), pk)
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = self._instances[key] = build(obj)
+        else:
+            self.hits += 1
+        return instance
+
+    @contextmanager
+    def activate(self) -> t.Iterator["IdentityMap"]:
+        token = _active_identity_map.set(self)
+        try:
+            yield self
+        finally:
+            _active_identity_map.reset(token)
+
+
+def get_identity_map() -> t.Optional[IdentityMap]:
+    return _active_identity_map.get()
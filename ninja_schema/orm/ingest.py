@@ -0,0 +1,291 @@
+"""
+Streaming CSV and NDJSON readers.
+
+Rows are read one at a time, decoded with the schema's converted field types and
+validated in batches: one list validation per batch, falling back to row by row
+validation to report the errors of a failing batch. Optionally, the pks referenced by
+relation fields are checked per batch (`ReferenceChecker`). Valid rows can be saved
+with `bulk_create` per batch, so the whole pipeline holds at most one batch in memory.
+
+CSV cells are decoded from their text form before validation:
+
+- blank cells are `None` for nullable fields, left out (the field default applies)
+  for other non-string fields
+- int, float, Decimal, bool, date/datetime/time (ISO 8601), UUID and choices
+  (Enum or Literal, by value) are converted; a cell that fails to convert is
+  passed on as text, so it is reported by validation
+"""
+
+import codecs
+import csv
+import datetime
+import json
+import typing as t
+import uuid
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+
+from pydantic import BaseModel, ValidationError
+
+from ninja_schema.errors import ConfigError
+from ninja_schema.orm.references import ReferenceChecker
+from ninja_schema.pydanticutils import (
+    get_literal_values,
+    get_many_validator,
+    iter_schema_fields,
+    offset_validation_error,
+    unwrap_optional,
+    validate_object,
+)
+
+__all__ = ["read_csv", "read_ndjson"]
+
+DEFAULT_BATCH_SIZE = 1000
+
+TRUE_VALUES = {"1", "t", "true", "y", "yes", "on"}
+FALSE_VALUES = {"0", "f", "false", "n", "no", "off"}
+
+Decoder = t.Callable[[str], t.Any]
+# sentinel of blank cells left to the field default
+_MISSING = object()
+
+
+def _decode_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError(value)
+
+
+def _get_type_decoder(python_type: t.Any) -> t.Optional[Decoder]:
+    literal_values = get_literal_values(python_type)
+    if literal_values is not None:
+        return {str(value): value for value in literal_values}.__getitem__
+    if not isinstance(python_type, type):
+        return None
+    if issubclass(python_type, Enum):
+        members = {str(member.value): member for member in python_type}
+        return members.__getitem__
+    if issubclass(python_type, bool):
+        return _decode_bool
+    for base in (int, float, Decimal, uuid.UUID):
+        if issubclass(python_type, base):
+            return base
+    # datetime is a subclass of date
+    for temporal_type in (datetime.datetime, datetime.date, datetime.time):
+        if issubclass(python_type, temporal_type):
+            return temporal_type.fromisoformat
+    return None
+
+
+def _build_cell_decoder(annotation: t.Any) -> t.Optional[Decoder]:
+    python_type, nullable = unwrap_optional(annotation)
+    decode = _get_type_decoder(python_type)
+    is_text = (
+        decode is None
+        and isinstance(python_type, type)
+        and issubclass(python_type, str)
+    )
+    if decode is None and not nullable:
+        return None
+    blank = None if nullable else ("" if is_text else _MISSING)
+
+    def decode_cell(value: str) -> t.Any:
+        if value == "":
+            return blank
+        if decode is None:
+            return value
+        try:
+            return decode(value)
+        except (ValueError, KeyError, ArithmeticError):
+            return value
+
+    return decode_cell
+
+
+def get_csv_decoders(schema_cls: t.Type[BaseModel]) -> t.Dict[str, Decoder]:
+    """Cell decoders of a schema by field name and alias"""
+    decoders = {}
+    for name, alias, annotation in iter_schema_fields(schema_cls):
+        decoder = _build_cell_decoder(annotation)
+        if decoder is not None:
+            decoders[name] = decoders[alias] = decoder
+    return decoders
+
+
+def _as_text(fileobj: t.Any, encoding: str) -> t.Any:
+    if isinstance(fileobj.read(0), bytes):
+        return codecs.getreader(encoding)(fileobj)
+    return fileobj
+
+
+def _iter_csv_rows(
+    schema_cls: t.Type[BaseModel],
+    fileobj: t.Any,
+    encoding: str,
+    reader_kwargs: t.Dict[str, t.Any],
+) -> t.Iterator[t.Dict[str, t.Any]]:
+    decoders = get_csv_decoders(schema_cls)
+    reader = csv.reader(_as_text(fileobj, encoding), **reader_kwargs)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [(column, decoders.get(column)) for column in header]
+    for cells in reader:
+        row = {}
+        for (column, decode), value in zip(columns, cells):
+            if decode is not None:
+                value = decode(value)
+                if value is _MISSING:
+                    continue
+            row[column] = value
+        yield row
+
+
+def _iter_ndjson_rows(fileobj: t.Any) -> t.Iterator[t.Any]:
+    for line_number, line in enumerate(fileobj, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as ex:
+            raise ValueError(f"Invalid JSON on line {line_number}: {ex}") from ex
+
+
+def _iter_validated(
+    schema_cls: t.Type[BaseModel],
+    rows: t.Iterator[t.Any],
+    batch_size: int,
+    bulk_create: bool,
+    raise_errors: bool,
+    checker: t.Optional[ReferenceChecker],
+) -> t.Iterator[t.Tuple[int, t.Any]]:
+    validate_many = get_many_validator(schema_cls)
+    index = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        try:
+            results: t.List[t.Any] = validate_many(batch)
+        except ValidationError as batch_error:
+            if raise_errors:
+                # error locations start with the row index, counted from the first row
+                raise offset_validation_error(batch_error, index) from None
+            results = []
+            for row in batch:
+                try:
+                    results.append(validate_object(schema_cls, row))
+                except ValidationError as ex:
+                    results.append(ex)
+
+        if checker is not None:
+            positions = [
+                position
+                for position, result in enumerate(results)
+                if isinstance(result, BaseModel)
+            ]
+            errors = checker.check(
+                schema_cls,
+                schema_cls.get_schema_config(),  # type: ignore[attr-defined]
+                [results[position] for position in positions],
+            )
+            if errors and raise_errors:
+                raise next(iter(errors.values()))
+            for valid_index, error in errors.items():
+                results[positions[valid_index]] = error
+
+        if bulk_create:
+            valid = [result for result in results if isinstance(result, BaseModel)]
+            created = iter(schema_cls.bulk_create(valid, batch_size=batch_size))  # type: ignore[attr-defined]
+            results = [
+                next(created) if isinstance(result, BaseModel) else result
+                for result in results
+            ]
+        for result in results:
+            yield index, result
+            index += 1
+
+
+def validate_rows(
+    schema_cls: t.Type[BaseModel],
+    rows: t.Iterator[t.Any],
+    *,
+    batch_size: t.Optional[int] = None,
+    bulk_create: bool = False,
+    raise_errors: bool = False,
+    check_references: t.Union[bool, ReferenceChecker] = False,
+) -> t.Iterator[t.Tuple[int, t.Any]]:
+    """
+    Validates `rows` in batches and yields `(index, instance)`, or
+    `(index, ValidationError)` for invalid rows unless `raise_errors` is set.
+    With `check_references`, rows referencing missing related rows are invalid, see
+    `ReferenceChecker`. With `bulk_create`, the valid rows of every batch are saved
+    and the created model instances are yielded instead.
+    """
+    for option, enabled in (
+        ("bulk_create", bulk_create),
+        ("check_references", check_references),
+    ):
+        if enabled and not hasattr(schema_cls, "get_schema_config"):
+            raise ConfigError(
+                f"{option} requires a ModelSchema, {schema_cls.__name__} is not one."
+            )
+    checker = None
+    if check_references:
+        checker = (
+            check_references
+            if isinstance(check_references, ReferenceChecker)
+            else ReferenceChecker()
+        )
+    return _iter_validated(
+        schema_cls,
+        rows,
+        batch_size or DEFAULT_BATCH_SIZE,
+        bulk_create,
+        raise_errors,
+        checker,
+    )
+
+
+def read_csv(
+    schema_cls: t.Type[BaseModel],
+    fileobj: t.Any,
+    *,
+    batch_size: t.Optional[int] = None,
+    bulk_create: bool = False,
+    raise_errors: bool = False,
+    check_references: t.Union[bool, ReferenceChecker] = False,
+    encoding: str = "utf-8",
+    **reader_kwargs: t.Any,
+) -> t.Iterator[t.Tuple[int, t.Any]]:
+    return validate_rows(
+        schema_cls,
+        _iter_csv_rows(schema_cls, fileobj, encoding, reader_kwargs),
+        batch_size=batch_size,
+        bulk_create=bulk_create,
+        raise_errors=raise_errors,
+        check_references=check_references,
+    )
+
+
+def read_ndjson(
+    schema_cls: t.Type[BaseModel],
+    fileobj: t.Any,
+    *,
+    batch_size: t.Optional[int] = None,
+    bulk_create: bool = False,
+    raise_errors: bool = False,
+    check_references: t.Union[bool, ReferenceChecker] = False,
+) -> t.Iterator[t.Tuple[int, t.Any]]:
+    return validate_rows(
+        schema_cls,
+        _iter_ndjson_rows(fileobj),
+        batch_size=batch_size,
+        bulk_create=bulk_create,
+        raise_errors=raise_errors,
+        check_references=check_references,
+    )
@@ -1,11 +1,26 @@
 import typing as t
+from contextlib import ExitStack
+from itertools import islice
 
 from django.db.models import Model as DjangoModel
 
+from ninja_schema.orm.bulk import assign_changed_fields, get_reverse_accessor_names
+from ninja_schema.orm.construct import construct_from_object, get_construct_plan
+from ninja_schema.orm.encoders import get_json_backend
+from ninja_schema.orm.expressions import load_field_expressions
+from ninja_schema.orm.file_urls import FileURLMemo, get_file_url_memo
 from ninja_schema.orm.getters import DjangoGetter
+from ninja_schema.orm.identity import IdentityMap, get_identity_map
+from ninja_schema.orm.ingest import read_csv, read_ndjson
+from ninja_schema.orm.references import ReferenceChecker
+from ninja_schema.orm.rows import RowView, from_rows
+from ninja_schema.orm.streaming import DEFAULT_CHUNK_SIZE, iter_validate
 from ninja_schema.pydanticutils import IS_PYDANTIC_V1
 from ninja_schema.types import DictStrAny
 
+# rows whose file URLs are resolved together while streaming
+FILE_URL_BATCH_SIZE = 1000
+
 if t.TYPE_CHECKING:
     from pydantic.functional_validators import ModelWrapValidatorHandler
 
@@ -14,14 +29,230 @@ if t.TYPE_CHECKING:
     )
 
 
+def _get_file_urls() -> FileURLMemo:
+    # the memo of the request, if one is active
+    file_urls = get_file_url_memo()
+    return file_urls if file_urls is not None else FileURLMemo()
+
+
+def _activate(
+    file_urls: FileURLMemo, identity_map: t.Optional[IdentityMap]
+) -> ExitStack:
+    stack = ExitStack()
+    stack.enter_context(file_urls.activate())
+    if identity_map is not None:
+        stack.enter_context(identity_map.activate())
+    return stack
+
+
 class BaseMixins:
     def apply_to_model(
-        self, model_instance: t.Type[DjangoModel], **kwargs: DictStrAny
-    ) -> t.Type[DjangoModel]:
-        for attr, value in self.dict(**kwargs).items():  # type:ignore[attr-defined]
-            setattr(model_instance, attr, value)
+        self,
+        model_instance: t.Type[DjangoModel],
+        *,
+        only_set: bool = False,
+        track_changes: bool = False,
+        **kwargs: DictStrAny,
+    ) -> t.Any:
+        """
+        Assigns the schema data to `model_instance` and returns it.
+
+        `only_set=True` only applies the fields set on the schema (`exclude_unset`).
+        `track_changes=True` only assigns values that differ from the instance and
+        returns the changed field names instead, for `save(update_fields=...)`.
+        Reverse relations are read-only and are not assigned.
+        """
+        if only_set:
+            kwargs["exclude_unset"] = True  # type:ignore[assignment]
+        data = self.dict(**kwargs)  # type:ignore[attr-defined]
+        if track_changes:
+            return assign_changed_fields(model_instance, data)  # type:ignore[arg-type]
+        reverse_accessors = get_reverse_accessor_names(type(model_instance))  # type:ignore[arg-type]
+        for attr, value in data.items():
+            if attr not in reverse_accessors:
+                setattr(model_instance, attr, value)
         return model_instance
 
+    @classmethod
+    def from_orm_trusted(cls, obj: t.Any) -> t.Any:
+        """
+        Builds a schema instance from a trusted object (e.g. a model instance read
+        from the database) without validation. Nested schemas and relation pk lists
+        are still built, but field validators are not run and values are not checked.
+        """
+        return construct_from_object(cls, obj)  # type:ignore[arg-type]
+
+    @classmethod
+    def construct_many(
+        cls, objs: t.Iterable[t.Any], *, dedupe: bool = False
+    ) -> t.List[t.Any]:
+        """
+        `from_orm_trusted` for every object in `objs`, e.g. a queryset. With `dedupe`,
+        nested schemas are built once per related row and shared, see `IdentityMap`.
+        """
+        plan = get_construct_plan(cls)  # type:ignore[arg-type]
+        objs = list(objs)
+        file_urls = _get_file_urls()
+        file_urls.prefetch(cls, objs)  # type:ignore[arg-type]
+        with _activate(file_urls, IdentityMap() if dedupe else None):
+            return [construct_from_object(cls, obj, plan) for obj in objs]  # type:ignore[arg-type]
+
+    @classmethod
+    def from_orm_many(
+        cls, objs: t.Iterable[t.Any], *, dedupe: bool = False
+    ) -> t.List[t.Any]:
+        """
+        `from_orm` for every object in `objs`. With `dedupe`, nested schemas are
+        validated once per related row and shared, see `IdentityMap`.
+        """
+        objs = list(objs)
+        file_urls = _get_file_urls()
+        file_urls.prefetch(cls, objs)  # type:ignore[arg-type]
+        with _activate(file_urls, IdentityMap() if dedupe else None):
+            return [cls.from_orm(obj) for obj in objs]  # type:ignore[attr-defined]
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: t.Iterable[t.Sequence[t.Any]],
+        columns: t.Optional[t.Sequence[t.Any]] = None,
+        *,
+        trusted: bool = False,
+    ) -> t.List[t.Any]:
+        """
+        Builds schema instances from rows read by column index: namedtuples (e.g.
+        `values_list(named=True)`), a cursor, or tuples with their `columns`, and
+        from the dicts of `values()`. `relation__field` columns fill nested schemas.
+        `trusted=True` skips validation like `construct_many`.
+        """
+        return from_rows(cls, rows, columns, trusted)  # type:ignore[arg-type]
+
+    def json(self, **kwargs: t.Any) -> str:
+        """Serializes with the schema's `Config.json_backend`"""
+        return get_json_backend(type(self)).dumps(self, **kwargs)  # type:ignore[arg-type]
+
+    @classmethod
+    def _iter_schema_instances(
+        cls, objs: t.Iterable[t.Any], dedupe: bool
+    ) -> t.Iterator[t.Any]:
+        identity_map = IdentityMap() if dedupe else None
+        file_urls = _get_file_urls()
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, FILE_URL_BATCH_SIZE))
+            if not batch:
+                return
+            file_urls.prefetch(
+                cls,  # type:ignore[arg-type]
+                (obj for obj in batch if not isinstance(obj, cls)),
+            )
+            for obj in batch:
+                if isinstance(obj, cls):
+                    yield obj
+                    continue
+                # activated per object, the maps must not leak into the consumer
+                with _activate(file_urls, identity_map):
+                    instance = cls.from_orm(obj)  # type:ignore[attr-defined]
+                yield instance
+
+    @classmethod
+    def dump_json_many(
+        cls, objs: t.Iterable[t.Any], *, dedupe: bool = False, **kwargs: t.Any
+    ) -> bytes:
+        """
+        Serializes schema instances (or objects to load with `from_orm`) into one JSON array.
+        `dedupe=True` (off by default) validates nested schemas once per related row
+        and shares them, see `IdentityMap`.
+        """
+        return get_json_backend(cls).dump_many(  # type:ignore[arg-type]
+            cls._iter_schema_instances(objs, dedupe), **kwargs
+        )
+
+    @classmethod
+    def iter_json_lines(
+        cls, objs: t.Iterable[t.Any], *, dedupe: bool = False, **kwargs: t.Any
+    ) -> t.Iterator[bytes]:
+        """
+        Streams schema instances (or objects to load with `from_orm`) as
+        newline-delimited JSON, one line per object. `dedupe=True` (off by default)
+        validates nested schemas once per related row, holding them until the stream ends.
+        """
+        return get_json_backend(cls).iter_lines(  # type:ignore[arg-type]
+            cls._iter_schema_instances(objs, dedupe), **kwargs
+        )
+
+    @classmethod
+    def iter_validate(
+        cls,
+        stream: t.Any,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        raise_errors: bool = False,
+    ) -> t.Iterator[t.Tuple[int, t.Any]]:
+        """
+        Validates the elements of a JSON array read from `stream` (a file-like
+        object, bytes or an iterable of byte chunks) `chunk_size` bytes at a time.
+        Yields `(index, instance)`, or `(index, ValidationError)` for invalid elements
+        unless `raise_errors` is set.
+        """
+        return iter_validate(
+            cls,  # type:ignore[arg-type]
+            stream,
+            chunk_size=chunk_size,
+            raise_errors=raise_errors,
+        )
+
+    @classmethod
+    def read_csv(
+        cls,
+        fileobj: t.Any,
+        *,
+        batch_size: t.Optional[int] = None,
+        bulk_create: bool = False,
+        raise_errors: bool = False,
+        check_references: t.Union[bool, ReferenceChecker] = False,
+        encoding: str = "utf-8",
+        **reader_kwargs: t.Any,
+    ) -> t.Iterator[t.Tuple[int, t.Any]]:
+        """
+        Streams the rows of a CSV file with a header row, decoded with the schema's
+        field types and validated per batch. Yields `(index, instance)`, or
+        `(index, ValidationError)` for invalid rows. `check_references=True` (or a
+        `ReferenceChecker`) also rejects rows referencing missing related rows.
+        With `bulk_create=True` the valid rows are saved per batch and the created
+        model instances are yielded.
+        """
+        return read_csv(
+            cls,  # type:ignore[arg-type]
+            fileobj,
+            batch_size=batch_size,
+            bulk_create=bulk_create,
+            raise_errors=raise_errors,
+            check_references=check_references,
+            encoding=encoding,
+            **reader_kwargs,
+        )
+
+    @classmethod
+    def read_ndjson(
+        cls,
+        fileobj: t.Any,
+        *,
+        batch_size: t.Optional[int] = None,
+        bulk_create: bool = False,
+        raise_errors: bool = False,
+        check_references: t.Union[bool, ReferenceChecker] = False,
+    ) -> t.Iterator[t.Tuple[int, t.Any]]:
+        """`read_csv` for newline-delimited JSON, one object per line"""
+        return read_ndjson(
+            cls,  # type:ignore[arg-type]
+            fileobj,
+            batch_size=batch_size,
+            bulk_create=bulk_create,
+            raise_errors=raise_errors,
+            check_references=check_references,
+        )
+
 
 if not IS_PYDANTIC_V1:
     from pydantic import BaseModel, model_validator
@@ -45,6 +276,12 @@ if not IS_PYDANTIC_V1:
             to DjangoGetter, since any checks or modifications on DjangoGetter's __dict__
             will not persist to the original object.
             """
+            if isinstance(values, RowView):
+                # raw column values, read as they are
+                return handler(values)
+            if isinstance(values, DjangoModel):
+                load_field_expressions(cls, values)  # type:ignore[arg-type]
+
             forbids_extra = cls.model_config.get("extra") == "forbid"
             should_validate_assignment = cls.model_config.get(
                 "validate_assignment", False
@@ -52,6 +289,18 @@ if not IS_PYDANTIC_V1:
             if forbids_extra or should_validate_assignment:
                 handler(values)
 
+            # only the validated instance is shared, every row still goes through
+            # the checks above
+            identity_map = (
+                get_identity_map() if isinstance(values, DjangoModel) else None
+            )
+            if identity_map is not None:
+                return identity_map.get_or_build(
+                    cls,
+                    values,
+                    lambda obj: handler(DjangoGetter(obj, cls, info.context)),
+                )
+
             values = DjangoGetter(values, cls, info.context)
             return handler(values)
 
@@ -83,5 +332,37 @@ if not IS_PYDANTIC_V1:
     BaseMixins = BaseMixinsV2  # type:ignore[misc]
 
 
+else:
+    from pydantic.utils import GetterDict
+
+    class BaseMixinsV1(BaseMixins):
+        @classmethod
+        def _decompose_class(cls, obj: t.Any) -> GetterDict:
+            getter_dict = cls.__config__.getter_dict  # type:ignore[attr-defined]
+            if isinstance(obj, RowView):
+                return obj
+            if isinstance(obj, GetterDict) or not issubclass(getter_dict, DjangoGetter):
+                return super()._decompose_class(obj)  # type:ignore[misc]
+            # the getter reads the relation windows of the schema
+            return getter_dict(obj, cls)
+
+        @classmethod
+        def from_orm(cls, obj: t.Any) -> t.Any:
+            load_field_expressions(cls, obj)  # type:ignore[arg-type]
+            return super().from_orm(obj)  # type:ignore[misc]
+
+        @classmethod
+        def validate(cls, value: t.Any) -> t.Any:
+            if not isinstance(value, DjangoModel):
+                return super().validate(value)  # type:ignore[misc]
+            load_field_expressions(cls, value)  # type:ignore[arg-type]
+            identity_map = get_identity_map()
+            if identity_map is not None:
+                return identity_map.get_or_build(cls, value, super().validate)  # type:ignore[misc]
+            return super().validate(value)  # type:ignore[misc]
+
+    BaseMixins = BaseMixinsV1  # type:ignore[misc]
+
+
 class SchemaMixins(BaseMixins):
     pass
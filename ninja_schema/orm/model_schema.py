@@ -1,31 +1,58 @@
+import copyreg
 from itertools import chain
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
+    Tuple,
     Type,
     Union,
     cast,
     no_type_check,
 )
 
-from django.db.models import Field, ManyToManyRel, ManyToOneRel
+import django
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models import (
+    Count,
+    Field,
+    FileField,
+    ForeignObjectRel,
+    Model,
+    QuerySet,
+)
+from django.db.models.constants import LOOKUP_SEP
+from pydantic import ValidationError
 from pydantic.fields import FieldInfo
+from typing_extensions import Annotated
 
 from ..errors import ConfigError
 from ..pydanticutils import IS_PYDANTIC_V1, compute_field_annotations
-from .getters import DjangoGetter
+from .bulk import UpsertBatch, apply_many, bulk_create, upsert
+from .columnar import Column, to_columns
+from .db_json import db_json
+from .dump_cache import DumpCache, get_dump_cache
+from .expressions import Expr, annotate
+from .factory import rebuild_factory_schema
+from .file_urls import FileURLResolver
+from .getters import DjangoGetter, RelationWindow
 from .mixins import SchemaMixins
 from .model_validators import ModelValidatorGroup
+from .parallel import parallel_dump
+from .query_plan import QueryPlan, get_query_plan
+from .references import ReferenceChecker
 from .schema_registry import registry as global_registry
 from .utils.converter import convert_django_field_with_choices
 
 ALL_FIELDS = "__all__"
+CHOICES_TYPES = ("enum", "literal")
 
 __all__ = ["ModelSchema"]
 
@@ -231,7 +258,18 @@ class ModelSchemaConfig:
         self.model = getattr(options, "model", None)
         _include = getattr(options, "include", None) or ALL_FIELDS
         self.include = set() if _include == ALL_FIELDS else set(_include or ())
+        # "relation__name" entries select the fields of the relation's nested schema
+        self.nested_include: Dict[str, List[str]] = {}
+        for lookup in sorted(name for name in self.include if LOOKUP_SEP in name):
+            relation, nested_name = lookup.split(LOOKUP_SEP, 1)
+            self.include.discard(lookup)
+            self.include.add(relation)
+            self.nested_include.setdefault(relation, []).append(nested_name)
         self.exclude = set(getattr(options, "exclude", None) or ())
+        # reverse relations are only converted when listed, by accessor name
+        self.reverse_relations = list(getattr(options, "reverse_relations", None) or ())
+        if self.include:
+            self.include.update(self.reverse_relations)
         self.skip_registry = getattr(options, "skip_registry", False)
         self.registry = getattr(options, "registry", global_registry)
         self.abstract = getattr(options, "ninja_schema_abstract", False)
@@ -239,26 +277,112 @@ class ModelSchemaConfig:
         self.optional = (
             {ALL_FIELDS} if _optional == ALL_FIELDS else set(_optional or ())
         )
-        self.depth = int(getattr(options, "depth", 0))
+        _depth = getattr(options, "depth", 0)
+        # a {relation: depth} mapping sets the depth per relation, 0 for the others
+        self.relation_depth: Dict[str, int] = {}
+        if isinstance(_depth, (dict, list, tuple)):
+            self.relation_depth = {
+                name: int(value) for name, value in dict(_depth).items()
+            }
+            _depth = 0
+        self.depth = int(_depth)
+        self.choices_type = getattr(options, "choices_type", "enum")
+        # related lists capped to a number of rows, in an order, and counted
+        self.relation_limits: Dict[str, int] = dict(
+            getattr(options, "relation_limits", None) or {}
+        )
+        self.relation_ordering: Dict[str, Tuple[str, ...]] = {
+            name: (ordering,) if isinstance(ordering, str) else tuple(ordering)
+            for name, ordering in dict(
+                getattr(options, "relation_ordering", None) or {}
+            ).items()
+        }
+        self.relation_counts = list(getattr(options, "relation_counts", None) or ())
+        self.relation_windows: Dict[str, RelationWindow] = {}
+        # one resolver for every file field, or a {field: resolver} mapping
+        _file_url_resolver = getattr(options, "file_url_resolver", None)
+        self.field_file_url_resolvers: Dict[str, FileURLResolver] = {}
+        if isinstance(_file_url_resolver, dict):
+            self.field_file_url_resolvers = dict(_file_url_resolver)
+            _file_url_resolver = None
+        self.file_url_resolver: Optional[FileURLResolver] = _file_url_resolver
+        self.file_url_resolvers: Dict[str, FileURLResolver] = {}
+        # cache aliases whose `cached_dump` entries are invalidated from class creation
+        _dump_cache = getattr(options, "dump_cache", None) or ()
+        self.dump_cache_aliases: List[str] = (
+            [_dump_cache] if isinstance(_dump_cache, str) else list(_dump_cache)
+        )
         self.schema_class_name = schema_class_name
+        self.django_fields: Dict[str, Field] = {}
         if not self.abstract:
             self.validate_configuration()
             self.process_build_schema_parameters()
 
+    def get_conversion_key(self) -> tuple:
+        """The options that determine how the model fields are converted"""
+        return (
+            self.model,
+            frozenset(self.include),
+            frozenset(self.exclude),
+            frozenset(self.optional),
+            self.depth,
+            tuple(sorted(self.relation_depth.items())),
+            tuple(
+                (name, tuple(names))
+                for name, names in sorted(self.nested_include.items())
+            ),
+            self.choices_type,
+            tuple(self.reverse_relations),
+            tuple(sorted(self.relation_limits.items())),
+            tuple(sorted(self.relation_ordering.items())),
+            tuple(self.relation_counts),
+            id(self.registry),
+            self.skip_registry,
+        )
+
+    @classmethod
+    def get_inherited_config(cls, bases: tuple) -> Optional["ModelSchemaConfig"]:
+        for base in bases:
+            config = getattr(base, "__ninja_schema_config__", None)
+            if isinstance(config, ModelSchemaConfig):
+                return config
+        return None
+
     @classmethod
     def clone_field(cls, field: FieldInfo, **kwargs: Any) -> FieldInfo:
+        if not IS_PYDANTIC_V1:
+            # keeps the constraints, which pydantic v2 holds in `metadata`
+            return FieldInfo.merge_field_infos(field, **kwargs)
         field_dict = dict(field.__repr_args__())
         field_dict.update(**kwargs)
         new_field = FieldInfo(**field_dict)  # type: ignore
         return new_field
 
+    @staticmethod
+    def get_field_name(field: Field) -> str:
+        """Schema field name of a model field, the accessor name for reverse relations"""
+        if isinstance(field, ForeignObjectRel):
+            return cast(str, field.get_accessor_name())
+        return field.name
+
     def model_fields(self) -> Iterator[Field]:
         """returns iterator with all the fields that can be part of schema"""
+        reverse_relations = set(self.reverse_relations)
+        reverse_fields = []
         for fld in self.model._meta.get_fields():  # type: ignore
-            if isinstance(fld, (ManyToOneRel, ManyToManyRel)):
-                # skipping relations
+            if isinstance(fld, ForeignObjectRel):
+                # reverse relations are opt-in, listed after the model's own fields
+                name = fld.get_accessor_name()
+                if name in reverse_relations:
+                    reverse_relations.discard(name)
+                    reverse_fields.append(fld)
                 continue
             yield cast(Field, fld)
+        yield from cast(List[Field], reverse_fields)
+        if reverse_relations:
+            raise ConfigError(
+                f"Field(s) {reverse_relations} are not reverse relations of the model."
+            )
 
     def validate_configuration(self) -> None:
         self.include = set() if self.include == ALL_FIELDS else set(self.include or ())
@@ -271,6 +395,12 @@ class ModelSchemaConfig:
                 "Only one of 'include' or 'exclude' should be set in configuration."
             )
 
+        if self.choices_type not in CHOICES_TYPES:
+            raise ConfigError(
+                f"Invalid choices_type '{self.choices_type}'. "
+                f"Expected one of {', '.join(CHOICES_TYPES)}."
+            )
+
     def check_invalid_keys(self, **field_names: Dict[str, Any]) -> None:
         keys = field_names.keys()
         invalid_include_exclude_fields = (
@@ -286,6 +416,87 @@ class ModelSchemaConfig:
                 raise ConfigError(
                     f"Field(s) {invalid_options_fields} are not in model."
                 )
+        relations = set(self.relation_depth) | set(self.nested_include)
+        invalid_relations = {
+            name
+            for name in relations
+            if name not in field_names
+            or not getattr(field_names[name], "is_relation", False)
+        }
+        if invalid_relations:
+            raise ConfigError(
+                f"Field(s) {invalid_relations} are not relations of the model."
+            )
+        lists = (
+            set(self.relation_limits)
+            | set(self.relation_ordering)
+            | set(self.relation_counts)
+        )
+        invalid_lists = {
+            name
+            for name in lists
+            if name not in field_names
+            or not (
+                getattr(field_names[name], "many_to_many", False)
+                or getattr(field_names[name], "one_to_many", False)
+            )
+        }
+        if invalid_lists:
+            raise ConfigError(
+                f"Field(s) {invalid_lists} are not many-to-many or reverse "
+                "relations of the model."
+            )
+
+    def process_relation_windows(self, **field_names: Field) -> None:
+        if self.relation_limits and django.VERSION < (4, 2):
+            raise ConfigError("relation_limits requires Django 4.2 or newer.")
+        for name in set(self.relation_limits) | set(self.relation_ordering):
+            related_opts = field_names[name].related_model._meta  # type: ignore[union-attr]
+            ordering = self.relation_ordering.get(name) or tuple(
+                related_opts.ordering or ("pk",)
+            )
+            self.relation_windows[name] = RelationWindow(
+                name, ordering, self.relation_limits.get(name)
+            )
+
+    def process_file_url_resolvers(self, **field_names: Field) -> None:
+        invalid_file_fields = {
+            name
+            for name in self.field_file_url_resolvers
+            if not isinstance(field_names.get(name), FileField)
+        }
+        if invalid_file_fields:
+            raise ConfigError(
+                f"Field(s) {invalid_file_fields} are not file fields of the model."
+            )
+        for name, field in field_names.items():
+            if not isinstance(field, FileField):
+                continue
+            resolver = self.field_file_url_resolvers.get(name, self.file_url_resolver)
+            if resolver is not None:
+                self.file_url_resolvers[name] = resolver
+
+    def get_relation_count_fields(self, **field_names: Field) -> Dict[str, tuple]:
+        """
+        `{relation}_count` fields of the counted relations, as `Expr` annotations,
+        None when the schema is built without the parent's query
+        """
+        return {
+            f"{name}_count": (
+                Annotated[
+                    Optional[int], Expr(Count(field_names[name].name, distinct=True))
+                ],
+                None,
+            )
+            for name in self.relation_counts
+        }
+
+    def get_field_depth(self, field_name: str) -> int:
+        depth = self.relation_depth.get(field_name, self.depth)
+        if field_name in self.nested_include:
+            # nested field names imply a nested schema
+            depth = max(depth, 1)
+        return depth
 
     def is_field_in_optional(self, field_name: str) -> bool:
         if not self.optional:
@@ -349,12 +560,28 @@ class ModelSchemaMetaclass(ModelMetaclass):
 
             field_values, _seen = {}, set()
 
-            all_fields = {f.name: f for f in fields}
+            all_fields = {
+                ModelSchemaConfig.get_field_name(field): field for field in fields
+            }
             config_instance.check_invalid_keys(**all_fields)
+            config_instance.process_relation_windows(**all_fields)
+            config_instance.process_file_url_resolvers(**all_fields)
+
+            parent_config = ModelSchemaConfig.get_inherited_config(bases)
+            if (
+                parent_config is not None
+                and parent_config.get_conversion_key()
+                == config_instance.get_conversion_key()
+            ):
+                # same fields as the parent: its converted fields are inherited as
+                # they are, only the annotations of this class are processed
+                config_instance.django_fields.update(parent_config.django_fields)
+                fields = []
 
             for field in chain(fields, annotations.copy()):
-                field_name = getattr(
-                    field, "name", getattr(field, "related_name", field)
+                is_model_field = not isinstance(field, str)
+                field_name = (
+                    ModelSchemaConfig.get_field_name(field) if is_model_field else field
                 )
 
                 if (
@@ -374,6 +601,8 @@ class ModelSchemaMetaclass(ModelMetaclass):
                     continue
 
                 _seen.add(field_name)
+                if is_model_field:
+                    config_instance.django_fields[field_name] = field
                 if field_name in annotations and field_name in namespace:
                     python_type = annotations.pop(field_name)
                     pydantic_field = namespace[field_name]
@@ -393,38 +622,270 @@ class ModelSchemaMetaclass(ModelMetaclass):
                     python_type, pydantic_field = convert_django_field_with_choices(
                         field,
                         registry=config_instance.registry,
-                        depth=config_instance.depth,
+                        depth=config_instance.get_field_depth(field_name),
                         skip_registry=config_instance.skip_registry,
+                        choices_type=config_instance.choices_type,
+                        nested_fields=config_instance.nested_include.get(field_name),
+                        nested_name=f"{name}{field_name.title().replace('_', '')}",
                     )
 
-                    if pydantic_field.default is None:
-                        python_type = Optional[python_type]
-
                     if config_instance.is_field_in_optional(field_name):
                         pydantic_field = ModelSchemaConfig.clone_field(
                             field=pydantic_field, default=None, default_factory=None
                         )
+                        if not IS_PYDANTIC_V1 and pydantic_field.metadata:
+                            # the constraints apply to the value, older pydantic v2
+                            # releases reject them on an Optional
+                            python_type = Annotated[
+                                (python_type, *pydantic_field.metadata)
+                            ]
+                            pydantic_field.metadata = []
+
+                    if pydantic_field.default is None:
                         python_type = Optional[python_type]
 
                 field_values[field_name] = (python_type, pydantic_field)
+            for field_name, count_field in config_instance.get_relation_count_fields(
+                **all_fields
+            ).items():
+                field_values.setdefault(field_name, count_field)
             if IS_PYDANTIC_V1:
                 cls = super().__new__(mcs, name, bases, namespace, **kwargs)
-                return update_class_missing_fields(
+                if cls.__config__.fields or cls.__config__.alias_generator:
+                    # pydantic v1 updates the FieldInfos from these options, so the
+                    # converted ones, shared with other schemas, are cloned
+                    field_values = {
+                        field_name: (
+                            python_type,
+                            ModelSchemaConfig.clone_field(pydantic_field)
+                            if isinstance(pydantic_field, FieldInfo)
+                            else pydantic_field,
+                        )
+                        for field_name, (
+                            python_type,
+                            pydantic_field,
+                        ) in field_values.items()
+                    }
+                cls = update_class_missing_fields(
                     cls,
                     list(bases),
                     compute_field_annotations(namespace, **field_values),
                 )
-            return super().__new__(
-                mcs,
-                name,
-                bases,
-                compute_field_annotations(namespace, **field_values),
-                **kwargs,
-            )
+            else:
+                cls = super().__new__(
+                    mcs,
+                    name,
+                    bases,
+                    compute_field_annotations(namespace, **field_values),
+                    **kwargs,
+                )
+            cls.__ninja_schema_config__ = config_instance
+            for cache_alias in config_instance.dump_cache_aliases:
+                get_dump_cache(cls, cache_alias)
+            return cls
         return super().__new__(mcs, name, bases, namespace, **kwargs)
 
+    def __reduce__(cls):
+        """
+        Schemas created by `SchemaFactory.create_schema` can not be imported by
+        reference, they are pickled as (model label, normalized config, index among
+        the identical calls) and rebuilt by the receiving process instead.
+        """
+        factory_key = cls.__dict__.get("__ninja_factory_key__")
+        if factory_key is None:
+            return cls.__qualname__
+        return rebuild_factory_schema, factory_key
+
+
+# pickle saves classes by reference without looking at `__reduce__`,
+# the dispatch table entry of the metaclass is checked first
+copyreg.pickle(ModelSchemaMetaclass, ModelSchemaMetaclass.__reduce__)
+
 
 class SchemaBaseModel(SchemaMixins, BaseModel):
+    @classmethod
+    def get_schema_config(cls) -> ModelSchemaConfig:
+        config = getattr(cls, "__ninja_schema_config__", None)
+        if config is None:
+            raise ConfigError(
+                f"'{cls.__name__}' has no model configuration. Is `Config.model` set?"
+            )
+        return config
+
+    @classmethod
+    def get_query_plan(cls) -> QueryPlan:
+        """`select_related`/`prefetch_related` lookups needed to serialize the schema"""
+        return get_query_plan(cls)
+
+    @classmethod
+    def optimize_queryset(cls, queryset: QuerySet) -> QuerySet:
+        return cls.get_query_plan().apply(queryset)
+
+    @classmethod
+    def annotate(cls, queryset: QuerySet) -> QuerySet:
+        """Annotates `queryset` with the expressions of the schema's `Expr` fields"""
+        return annotate(cls, queryset)
+
+    @classmethod
+    def parallel_dump(
+        cls,
+        queryset: QuerySet,
+        *,
+        workers: Optional[int] = None,
+        partitions: Optional[int] = None,
+        trusted: bool = False,
+        mp_context: Any = None,
+    ) -> Iterator[bytes]:
+        """
+        Serializes `queryset` in `workers` processes, split into pk ranges, and yields
+        the newline-delimited JSON chunks in pk order.
+        """
+        return parallel_dump(
+            cls,
+            queryset,
+            workers=workers,
+            partitions=partitions,
+            trusted=trusted,
+            mp_context=mp_context,
+        )
+
+    @classmethod
+    def to_columns(
+        cls,
+        queryset: QuerySet,
+        *,
+        fields: Optional[List[str]] = None,
+        chunk_size: int = 2000,
+        use_numpy: Optional[bool] = None,
+    ) -> Dict[str, Column]:
+        """
+        Exports `queryset` into typed column buffers, reading it chunk by chunk
+        with `values_list`. Only fields backed by a database column are exported.
+        """
+        return to_columns(
+            cls,
+            cls.get_schema_config(),
+            queryset,
+            fields=fields,
+            chunk_size=chunk_size,
+            use_numpy=use_numpy,
+        )
+
+    @classmethod
+    def db_json(cls, queryset: QuerySet, *, chunk_size: int = 2000) -> bytes:
+        """
+        Serializes `queryset` into one JSON array with the JSON objects of the rows
+        built by the database (SQLite or PostgreSQL). Validators do not run.
+        """
+        return db_json(cls, cls.get_schema_config(), queryset, chunk_size=chunk_size)
+
+    @classmethod
+    def apply_many(
+        cls,
+        instances: Sequence[Model],
+        schemas: Sequence[BaseModel],
+        *,
+        batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Set[str]:
+        """
+        Applies `schemas` to `instances` pairwise and saves them with one `bulk_update`
+        per batch of `batch_size`, limited to the fields changed in the batch.
+        Many-to-many fields are synchronized per batch. `kwargs` are passed to `.dict()`.
+        Returns the names of the updated fields.
+        """
+        return apply_many(
+            cls,
+            cls.get_schema_config(),
+            instances,
+            schemas,
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    @classmethod
+    def bulk_create(
+        cls,
+        schemas: Sequence[BaseModel],
+        *,
+        batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Model]:
+        """
+        Creates one model instance per schema with `bulk_create` in batches of
+        `batch_size`, then sets their many-to-many fields per batch.
+        `kwargs` are passed to `.dict()`.
+        """
+        return bulk_create(
+            cls, cls.get_schema_config(), schemas, batch_size=batch_size, **kwargs
+        )
+
+    @classmethod
+    def upsert(
+        cls,
+        records: Iterable[Any],
+        *,
+        unique_fields: Sequence[str],
+        update_fields: str = "changed",
+        batch_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[UpsertBatch]:
+        """
+        Validates `records` (dicts or schema instances) per batch of `batch_size` and
+        inserts or updates them with `bulk_create(update_conflicts=True)` on
+        `unique_fields`. `update_fields="changed"` only writes rows and columns that
+        differ from the database, `"all"` rewrites every existing row.
+        Returns the counts and timings of every batch.
+        """
+        return upsert(
+            cls,
+            cls.get_schema_config(),
+            records,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    @classmethod
+    def check_references(
+        cls,
+        schemas: Sequence[BaseModel],
+        *,
+        checker: Optional[ReferenceChecker] = None,
+    ) -> Dict[int, ValidationError]:
+        """
+        Checks that the rows referenced by the foreign key and many-to-many pks of
+        `schemas` exist, with one query per related model. Returns a ValidationError
+        by index for the schemas referencing missing rows. Pass the same `checker` to
+        reuse the pks already checked, e.g. within a request.
+        """
+        checker = checker or ReferenceChecker()
+        return checker.check(cls, cls.get_schema_config(), schemas)
+
+    @classmethod
+    def cached_dump(
+        cls,
+        obj: Model,
+        *,
+        version_field: Optional[str] = None,
+        cache_alias: str = "default",
+        timeout: Any = DEFAULT_TIMEOUT,
+    ) -> bytes:
+        """
+        Returns the JSON of `obj`, stored per pk in the `cache_alias` Django cache.
+        An entry is used while the `version_field` value of `obj` is unchanged and
+        neither the row nor the rows of its relations were saved since.
+        """
+        return get_dump_cache(cls, cache_alias).dump(
+            obj, version_field=version_field, timeout=timeout
+        )
+
+    @classmethod
+    def get_dump_cache(cls, cache_alias: str = "default") -> DumpCache:
+        """`cached_dump` cache of the schema, with its `hits`, `misses` and `hit_rate`"""
+        return get_dump_cache(cls, cache_alias)
+
     if not IS_PYDANTIC_V1:
 
         @classmethod
@@ -437,10 +898,6 @@ class SchemaBaseModel(SchemaMixins, BaseModel):
             # Backward compatibility with pydantic 1.x
             return self.model_dump(*a, **kw)  # type:ignore[attr-defined,no-any-return]
 
-        def json(self, *a, **kw) -> str:
-            # Backward compatibility with pydantic 1.x
-            return self.model_dump_json(*a, **kw)  # type:ignore[attr-defined,no-any-return]
-
         @classmethod
         def json_schema(cls) -> Dict[str, Any]:
             return cls.model_json_schema()
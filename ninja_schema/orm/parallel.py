@@ -0,0 +1,194 @@
+"""
+Process-pool serialization of large querysets.
+
+The queryset is split into pk ranges. Every range is serialized by a worker process
+with its own database connection, using the schema's query plan, and the resulting
+newline-delimited JSON chunks are yielded in pk order.
+
+Workers receive the schema by reference (module and qualified name) and the queryset
+as its pickled `Query`, so the schema must be importable from its module.
+"""
+
+import importlib
+import math
+import os
+import pickle
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+
+from django.db import connections
+from django.db.models import IntegerField, Max, Min, QuerySet
+
+from ninja_schema.errors import ConfigError
+
+from .query_plan import get_query_plan
+
+__all__ = ["get_pk_ranges", "parallel_dump"]
+
+PkRange = t.Tuple[t.Optional[t.Any], t.Optional[t.Any]]
+
+# database connections a forked worker inherited from the parent process. They are
+# kept unused, not closed: closing one would also end the parent's session.
+_inherited_connections: t.List[t.Any] = []
+
+
+def get_schema_reference(schema_cls: t.Type) -> t.Tuple[str, str]:
+    reference = (schema_cls.__module__, schema_cls.__qualname__)
+    try:
+        resolved = import_schema(*reference)
+    except (ImportError, AttributeError):
+        resolved = None
+    if resolved is not schema_cls:
+        raise ConfigError(
+            f"'{schema_cls.__qualname__}' can not be imported by reference from "
+            f"'{schema_cls.__module__}'. Define the schema at module level."
+        )
+    return reference
+
+
+def import_schema(module_name: str, qualname: str) -> t.Type:
+    obj: t.Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return t.cast(t.Type, obj)
+
+
+def get_pk_ranges(queryset: QuerySet, partitions: int) -> t.List[PkRange]:
+    """
+    Splits `queryset` into at most `partitions` half-open pk ranges `[low, high)`.
+    Integer pks are split arithmetically, other pks on the boundaries of equally sized
+    slices.
+    """
+    if queryset.query.is_sliced:
+        raise ConfigError(
+            "parallel_dump can not split a sliced queryset, filter it by pk instead."
+        )
+    queryset = queryset.order_by()
+    if isinstance(queryset.model._meta.pk, IntegerField):
+        bounds = queryset.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            return []
+        low, high = bounds["low"], bounds["high"] + 1
+        step = max(math.ceil((high - low) / partitions), 1)
+        return [(start, min(start + step, high)) for start in range(low, high, step)]
+
+    count = queryset.count()
+    if not count:
+        return []
+    step = max(math.ceil(count / partitions), 1)
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    boundaries: t.List[t.Any] = [None]
+    boundaries.extend(pks[index] for index in range(step, count, step))
+    boundaries.append(None)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _detach_connections() -> None:
+    """Makes a forked worker open its own connections instead of the parent's"""
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():  # type: ignore[attr-defined]
+            # the worker reads its copy of the in-memory database
+            continue
+        _inherited_connections.append(connection.connection)
+        connection.connection = None
+
+
+def _setup_worker() -> None:
+    import django
+    from django.apps import apps
+
+    if not apps.ready:  # spawned worker
+        django.setup()
+    else:  # forked worker
+        _detach_connections()
+
+
+def _dump_range(
+    schema_reference: t.Tuple[str, str],
+    query: bytes,
+    pk_range: PkRange,
+    trusted: bool,
+) -> bytes:
+    schema_cls = import_schema(*schema_reference)
+    model = schema_cls.get_schema_config().model
+    queryset = model._default_manager.all()
+    queryset.query = pickle.loads(query)
+
+    low, high = pk_range
+    if low is not None:
+        queryset = queryset.filter(pk__gte=low)
+    if high is not None:
+        queryset = queryset.filter(pk__lt=high)
+    queryset = get_query_plan(schema_cls).apply(queryset.order_by("pk"))
+
+    if trusted:
+        queryset = schema_cls.construct_many(queryset)
+    return b"".join(schema_cls.iter_json_lines(queryset))
+
+
+def _check_connections() -> None:
+    for connection in connections.all():
+        if connection.in_atomic_block:
+            if connection.vendor == "sqlite" and connection.is_in_memory_db():  # type: ignore[attr-defined]
+                # forked workers read their copy of the in-memory database
+                continue
+            # the workers would not see the rows written in the transaction
+            raise RuntimeError(
+                "parallel_dump can not run inside a transaction, "
+                f"database '{connection.alias}' is in an atomic block."
+            )
+
+
+def _iter_chunks(
+    schema_reference: t.Tuple[str, str],
+    query: bytes,
+    pk_ranges: t.List[PkRange],
+    workers: int,
+    trusted: bool,
+    mp_context: t.Any,
+) -> t.Iterator[bytes]:
+    # the connections of the calling process stay open, workers open their own
+    _check_connections()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp_context, initializer=_setup_worker
+    ) as executor:
+
+        def submit(pk_range: PkRange) -> Future:
+            return executor.submit(
+                _dump_range, schema_reference, query, pk_range, trusted
+            )
+
+        ranges = iter(pk_ranges)
+        # a bounded window keeps finished, not yet yielded chunks in check
+        pending = deque(submit(pk_range) for pk_range in islice(ranges, workers * 2))
+        while pending:
+            chunk = pending.popleft().result()
+            pending.extend(submit(pk_range) for pk_range in islice(ranges, 1))
+            if chunk:
+                yield chunk
+
+
+def parallel_dump(
+    schema_cls: t.Type,
+    queryset: QuerySet,
+    *,
+    workers: t.Optional[int] = None,
+    partitions: t.Optional[int] = None,
+    trusted: bool = False,
+    mp_context: t.Any = None,
+) -> t.Iterator[bytes]:
+    schema_reference = get_schema_reference(schema_cls)
+    workers = workers or os.cpu_count() or 1
+    pk_ranges = get_pk_ranges(queryset, partitions or workers * 4)
+    return _iter_chunks(
+        schema_reference,
+        pickle.dumps(queryset.query),
+        pk_ranges,
+        workers,
+        trusted,
+        mp_context,
+    )
@@ -0,0 +1,138 @@
+"""
+Query plan of a ModelSchema: the `select_related` / `prefetch_related` lookups needed
+to serialize a queryset without one query per row.
+
+- nested depth schemas of forward one-to-one/foreign keys are joined with
+  `select_related`, together with the lookups of the nested schema
+- many-to-many fields and reverse foreign keys are prefetched; pk lists only load
+  the related pks, nested schemas prefetch with a queryset optimized by the nested
+  schema's own plan. Capped relations (`relation_limits`) prefetch a sliced queryset,
+  which Django windows with `ROW_NUMBER()` per parent
+- reverse one-to-one relations are joined with `select_related`, also for pks
+- `Expr` fields are added as annotations
+"""
+
+import typing as t
+
+from django.db.models import Prefetch, QuerySet
+from pydantic import BaseModel
+from typing_extensions import Annotated, get_args, get_origin
+
+from ninja_schema.pydanticutils import iter_schema_fields
+
+from .expressions import get_field_expressions
+
+if t.TYPE_CHECKING:
+    from .model_schema import ModelSchemaConfig
+
+__all__ = ["QueryPlan", "get_query_plan"]
+
+
+def get_nested_schema(annotation: t.Any) -> t.Optional[t.Type[BaseModel]]:
+    """Returns the ModelSchema used by a field annotation (`X`, `Optional[X]`, `List[X]`)"""
+    origin = get_origin(annotation)
+    if origin is Annotated or origin is t.Union or origin in (list, t.List):
+        for arg in get_args(annotation):
+            nested = get_nested_schema(arg)
+            if nested is not None:
+                return nested
+        return None
+    if (
+        isinstance(annotation, type)
+        and issubclass(annotation, BaseModel)
+        and getattr(annotation, "__ninja_schema_config__", None) is not None
+    ):
+        return annotation
+    return None
+
+
+class QueryPlan:
+    def __init__(
+        self,
+        select_related: t.Optional[t.List[str]] = None,
+        prefetch_related: t.Optional[t.List[t.Union[str, Prefetch]]] = None,
+        annotations: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> None:
+        self.select_related = select_related or []
+        self.prefetch_related = prefetch_related or []
+        self.annotations = annotations or {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<QueryPlan select_related={self.select_related} "
+            f"prefetch_related={[self._lookup(p) for p in self.prefetch_related]}>"
+        )
+
+    @staticmethod
+    def _lookup(prefetch: t.Union[str, Prefetch]) -> str:
+        return prefetch.prefetch_to if isinstance(prefetch, Prefetch) else prefetch
+
+    def add_prefixed(self, prefix: str, plan: "QueryPlan") -> None:
+        """Adds the lookups of a nested schema joined through `prefix`"""
+        self.select_related.extend(
+            f"{prefix}__{lookup}" for lookup in plan.select_related
+        )
+        for prefetch in plan.prefetch_related:
+            if isinstance(prefetch, Prefetch):
+                prefetch = Prefetch(
+                    f"{prefix}__{prefetch.prefetch_through}",
+                    queryset=prefetch.queryset,
+                    to_attr=prefetch.to_attr,
+                )
+            else:
+                prefetch = f"{prefix}__{prefetch}"
+            self.prefetch_related.append(prefetch)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def build_query_plan(
+    schema_cls: t.Type[BaseModel], config: "ModelSchemaConfig"
+) -> QueryPlan:
+    annotations = {
+        name: annotation for name, _, annotation in iter_schema_fields(schema_cls)
+    }
+    plan = QueryPlan(annotations=get_field_expressions(schema_cls))
+    for name, field in config.django_fields.items():
+        if not field.is_relation or name not in annotations:
+            continue
+        nested = get_nested_schema(annotations[name])
+        related_model = field.related_model
+
+        if field.many_to_many or field.one_to_many:
+            queryset = related_model._default_manager.all()  # type: ignore[union-attr]
+            if nested is None:
+                # reverse foreign keys match the related rows by their key column
+                columns = ["pk"] if field.many_to_many else ["pk", field.field.attname]  # type: ignore[attr-defined]
+                queryset = queryset.only(*columns)
+            else:
+                queryset = get_query_plan(nested).apply(queryset)
+            window = config.relation_windows.get(name)
+            to_attr = None
+            if window is not None:
+                queryset = window.apply(queryset)
+                to_attr = window.to_attr
+            plan.prefetch_related.append(
+                Prefetch(name, queryset=queryset, to_attr=to_attr)
+            )
+        elif nested is not None:
+            plan.select_related.append(name)
+            plan.add_prefixed(name, get_query_plan(nested))
+        elif not field.concrete:
+            plan.select_related.append(name)
+    return plan
+
+
+def get_query_plan(schema_cls: t.Type[BaseModel]) -> QueryPlan:
+    plan = schema_cls.__dict__.get("__ninja_query_plan__")
+    if plan is None:
+        plan = build_query_plan(schema_cls, schema_cls.get_schema_config())  # type: ignore[attr-defined]
+        setattr(schema_cls, "__ninja_query_plan__", plan)  # noqa: B010
+    return t.cast(QueryPlan, plan)
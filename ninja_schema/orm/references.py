@@ -0,0 +1,151 @@
+"""
+Existence checks of the rows referenced by relation fields of bulk input.
+
+Foreign key and many-to-many fields of depth 0 schemas take pks (or the `to_field`
+values of a foreign key). `ReferenceChecker` collects the values of a whole batch per
+related model and target field, checks them with one `filter(<target>__in=...)` query
+each and reports the missing ones as indexed validation errors, instead of an
+IntegrityError at `save()` after partial work.
+
+A checker remembers the pks it has seen, so one checker per request (or import run)
+does not query the same pk twice.
+"""
+
+import typing as t
+
+from django.db import models
+from django.db.models import Field
+from pydantic import BaseModel, ValidationError
+
+from ninja_schema.pydanticutils import build_validation_error, iter_schema_fields
+
+if t.TYPE_CHECKING:
+    from .model_schema import ModelSchemaConfig
+
+__all__ = ["ReferenceChecker"]
+
+ERROR_TYPE = "missing_reference"
+
+Location = t.Tuple[t.Union[str, int], ...]
+
+
+def get_reference_fields(
+    schema_cls: t.Type[BaseModel], config: "ModelSchemaConfig"
+) -> t.List[t.Tuple[str, str, Field]]:
+    """(name, alias, field) of the schema fields holding pks of related rows"""
+    aliases = {name: alias for name, alias, _ in iter_schema_fields(schema_cls)}
+    fields = []
+    for name, field in config.django_fields.items():
+        if name not in aliases or not field.is_relation:
+            continue
+        if field.many_to_many or (field.concrete and field.related_model is not None):
+            fields.append((name, aliases[name], field))
+    return fields
+
+
+def get_target_field(field: Field) -> str:
+    """The column of the related model a relation field references, "pk" for the pk"""
+    target = None if field.many_to_many else getattr(field, "target_field", None)
+    if target is None or target.primary_key:
+        return "pk"
+    return t.cast(str, target.attname)
+
+
+class ReferenceChecker:
+    """Batched, memoized existence checks of referenced pks on one database"""
+
+    def __init__(self, using: t.Optional[str] = None) -> None:
+        self.using = using
+        self.queries = 0
+        self._existing: t.Dict[t.Tuple[t.Type[models.Model], str], t.Set[t.Any]] = {}
+        self._missing: t.Dict[t.Tuple[t.Type[models.Model], str], t.Set[t.Any]] = {}
+
+    def get_missing(
+        self, model: t.Type[models.Model], pks: t.Iterable[t.Any], target: str = "pk"
+    ) -> t.Set[t.Any]:
+        """
+        Returns the values of `pks` without a `model` row with that `target` column
+        value, querying only unseen values
+        """
+        pks = set(pks)
+        existing = self._existing.setdefault((model, target), set())
+        missing = self._missing.setdefault((model, target), set())
+        unknown = pks - existing - missing
+        if unknown:
+            manager = model._default_manager
+            if self.using:
+                manager = manager.db_manager(self.using)
+            found = set(
+                manager.filter(**{f"{target}__in": unknown}).values_list(
+                    target, flat=True
+                )
+            )
+            self.queries += 1
+            existing |= found
+            missing |= unknown - found
+        return pks & missing
+
+    def check(
+        self,
+        schema_cls: t.Type[BaseModel],
+        config: "ModelSchemaConfig",
+        instances: t.Sequence[BaseModel],
+    ) -> t.Dict[int, ValidationError]:
+        """Returns a ValidationError by index for the instances referencing missing rows"""
+        fields = get_reference_fields(schema_cls, config)
+        targets = [
+            (
+                name,
+                alias,
+                field,
+                (
+                    t.cast(t.Type[models.Model], field.related_model),
+                    get_target_field(field),
+                ),
+            )
+            for name, alias, field in fields
+        ]
+        referenced: t.Dict[t.Tuple[t.Type[models.Model], str], t.Set[t.Any]] = {}
+        # (loc, (related model, target column), value) of every reference
+        values: t.List[t.List[t.Tuple[Location, t.Any, t.Any]]] = []
+        for instance in instances:
+            instance_values = []
+            for name, alias, field, key in targets:
+                value = getattr(instance, name, None)
+                references: t.List[t.Tuple[Location, t.Any, t.Any]]
+                if field.many_to_many:
+                    references = [
+                        ((alias, position), key, pk)
+                        for position, pk in enumerate(value or ())
+                        if not isinstance(pk, BaseModel)
+                    ]
+                elif value is not None and not isinstance(value, BaseModel):
+                    references = [((alias,), key, value)]
+                else:
+                    # nested schemas describe related rows, they do not reference them
+                    continue
+                referenced.setdefault(key, set()).update(pk for _, _, pk in references)
+                instance_values.extend(references)
+            values.append(instance_values)
+
+        missing = {
+            key: self.get_missing(key[0], pks, key[1])
+            for key, pks in referenced.items()
+        }
+
+        errors = {}
+        for index, instance_values in enumerate(values):
+            line_errors = [
+                (loc, self._message(key[0], key[1], pk), pk)
+                for loc, key, pk in instance_values
+                if pk in missing[key]
+            ]
+            if line_errors:
+                errors[index] = build_validation_error(
+                    schema_cls, ERROR_TYPE, line_errors
+                )
+        return errors
+
+    @staticmethod
+    def _message(model: t.Type[models.Model], target: str, pk: t.Any) -> str:
+        return f"{model.__name__} with {target} {pk!r} does not exist."
@@ -0,0 +1,265 @@
+"""
+Schema instances built from rows: tuples read by column index, or flat dicts.
+
+`from_rows` reads the rows of `values_list(named=True)`, of any namedtuple or of a raw
+cursor without building a dict per row, and the dicts of `values()`. The column names
+(the cursor description, the namedtuple fields, the dict keys or an explicit list)
+are mapped once per schema and column set to a `RowPlan` of column keys: a field is
+read from the column of its alias, and a forward relation without a nested schema
+from its `<fk>_id` column as well. The `relation__field` columns of a relation with
+a nested schema are the columns of a nested plan, so `values("id", "category__id",
+"category__name")` builds `depth` schemas without loading model instances; the
+nested object is None when its pk column (or every column, without one) is NULL.
+
+Validated rows are read through a `RowView`, trusted rows (values already converted
+by Django, as `values_list` returns them) are constructed like `from_orm_trusted`.
+Raw cursor values are not converted by the model fields, so they should be validated.
+
+File field columns hold file names. They are read as the URLs `from_orm` dumps, from
+the field's storage or its `file_url_resolver`, resolved in one batch per call.
+"""
+
+import typing as t
+from contextlib import nullcontext
+
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+from pydantic import BaseModel
+
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1, iter_schema_fields
+
+from .construct import get_construct_plan
+from .file_urls import (
+    FileURLMemo,
+    get_file_url_memo,
+    get_file_url_resolver,
+    resolve_file_url,
+)
+from .query_plan import get_nested_schema
+
+__all__ = ["FileColumn", "RowPlan", "RowView", "from_rows", "get_row_plan"]
+
+
+def _read(row: t.Any, key: t.Any) -> t.Any:
+    if isinstance(key, RowPlan):
+        return None if key.is_null(row) else RowView(row, key.keys)
+    if isinstance(key, FileColumn):
+        return key.read(row)
+    return row[key]
+
+
+class FileColumn:
+    """The column of a file field, read as the URL of the file"""
+
+    __slots__ = ("key", "field", "resolver")
+
+    def __init__(self, key: t.Any, field: models.FileField, resolver: t.Any) -> None:
+        self.key = key
+        self.field = field
+        self.resolver = resolver
+
+    def read(self, row: t.Any) -> t.Optional[str]:
+        name = row[self.key]
+        if not name:
+            return None
+        # a file of no model instance, only its storage and name are read
+        field_file = self.field.attr_class(None, self.field, name)  # type: ignore[arg-type]
+        return resolve_file_url(field_file, self.resolver)
+
+
+class RowView:
+    """A row whose values are read by attribute (or `get`), by column key"""
+
+    __slots__ = ("_row", "_keys")
+
+    def __init__(self, row: t.Any, keys: t.Dict[str, t.Any]) -> None:
+        self._row = row
+        self._keys = keys
+
+    def __getattr__(self, key: str) -> t.Any:
+        try:
+            return _read(self._row, self._keys[key])
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        column_key = self._keys.get(key)
+        return default if column_key is None else _read(self._row, column_key)
+
+    def keys(self) -> t.KeysView[str]:
+        return self._keys.keys()
+
+
+class RowPlan:
+    """Column keys of the fields of a schema for one set of columns"""
+
+    def __init__(
+        self,
+        schema_cls: t.Type[BaseModel],
+        columns: t.Sequence[str],
+        column_keys: t.Sequence[t.Any],
+    ) -> None:
+        # a column's key is its index in a tuple row, its name in a dict row
+        self.schema_cls = schema_cls
+        keys_by_column = dict(zip(columns, column_keys))
+        nested_columns: t.Dict[str, t.Tuple[t.List[str], t.List[t.Any]]] = {}
+        for column, column_key in keys_by_column.items():
+            if LOOKUP_SEP in column:
+                relation, nested_column = column.split(LOOKUP_SEP, 1)
+                names, keys = nested_columns.setdefault(relation, ([], []))
+                names.append(nested_column)
+                keys.append(column_key)
+
+        config = getattr(schema_cls, "__ninja_schema_config__", None)
+        django_fields = getattr(config, "django_fields", {})
+        annotations = {
+            name: annotation for name, _, annotation in iter_schema_fields(schema_cls)
+        }
+        # field alias: column key or nested plan, read by validation
+        self.keys: t.Dict[str, t.Any] = {}
+        # (field name, column key or nested plan, converter), read by construction
+        self.construct: t.List[t.Tuple[str, t.Any, t.Any]] = []
+        for name, source, converter in get_construct_plan(schema_cls):
+            key = keys_by_column.get(source)
+            field = django_fields.get(name)
+            nested = get_nested_schema(annotations.get(name))
+            if key is None and nested is not None and source in nested_columns:
+                key = RowPlan(nested, *nested_columns[source])
+                converter = None
+            elif (
+                key is None
+                and field is not None
+                and field.is_relation
+                and field.concrete
+                and nested is None
+            ):
+                # `values("category")` names the column after the field, not `category_id`
+                key = keys_by_column.get(field.attname)
+                if key is None:
+                    key = keys_by_column.get(field.name)
+            if key is not None and isinstance(field, models.FileField):
+                key = FileColumn(key, field, get_file_url_resolver(schema_cls, source))
+                converter = None
+            if key is not None:
+                self.keys[source] = key
+                self.construct.append((name, key, converter))
+
+        # a nested row is NULL when its pk is, or all its columns without one
+        self.null_keys = list(column_keys)
+        model = getattr(config, "model", None)
+        if model is not None:
+            pk = model._meta.pk
+            for column in (pk.name, pk.attname, "pk"):
+                if column in keys_by_column:
+                    self.null_keys = [keys_by_column[column]]
+                    break
+
+    def is_null(self, row: t.Any) -> bool:
+        return all(row[key] is None for key in self.null_keys)
+
+    def iter_file_columns(self) -> t.Iterator[FileColumn]:
+        """The file columns of the plan and of its nested plans"""
+        for _, key, _ in self.construct:
+            if isinstance(key, FileColumn):
+                yield key
+            elif isinstance(key, RowPlan):
+                yield from key.iter_file_columns()
+
+    def construct_row(self, row: t.Any) -> t.Any:
+        values = {}
+        for name, key, converter in self.construct:
+            if isinstance(key, RowPlan):
+                value = None if key.is_null(row) else key.construct_row(row)
+            elif isinstance(key, FileColumn):
+                value = key.read(row)
+            else:
+                value = row[key]
+                if converter is not None and value is not None:
+                    value = converter(value)
+            values[name] = value
+        if IS_PYDANTIC_V1:
+            return self.schema_cls.construct(**values)
+        return self.schema_cls.model_construct(**values)
+
+
+def _get_columns(rows: t.Any, first_row: t.Any) -> t.Tuple[str, ...]:
+    if isinstance(first_row, dict):
+        return tuple(first_row)
+    description = getattr(rows, "description", None)
+    if description is not None:
+        return tuple(column[0] for column in description)
+    fields = getattr(first_row, "_fields", None)
+    if fields is None:
+        raise TypeError(
+            "from_rows needs `columns` for rows that are not namedtuples, dicts "
+            "or read from a cursor."
+        )
+    return tuple(fields)
+
+
+def get_row_plan(
+    schema_cls: t.Type[BaseModel], columns: t.Sequence[t.Any], dict_rows: bool = False
+) -> RowPlan:
+    """
+    The row plan of `schema_cls` for `columns` (names or a cursor description) of
+    tuple rows, or of dict rows with `dict_rows`
+    """
+    columns = tuple(
+        column if isinstance(column, str) else column[0] for column in columns
+    )
+    plans = schema_cls.__dict__.get("__ninja_row_plans__")
+    if plans is None:
+        plans = {}
+        setattr(schema_cls, "__ninja_row_plans__", plans)  # noqa: B010
+    plan = plans.get((columns, dict_rows))
+    if plan is None:
+        column_keys = columns if dict_rows else range(len(columns))
+        plan = plans[(columns, dict_rows)] = RowPlan(schema_cls, columns, column_keys)
+    return t.cast(RowPlan, plan)
+
+
+def from_rows(
+    schema_cls: t.Type[BaseModel],
+    rows: t.Iterable[t.Sequence[t.Any]],
+    columns: t.Optional[t.Sequence[t.Any]] = None,
+    trusted: bool = False,
+) -> t.List[t.Any]:
+    iterator = iter(rows)
+    first_row = next(iterator, None)
+    if first_row is None:
+        return []
+    plan = get_row_plan(
+        schema_cls,
+        columns if columns is not None else _get_columns(rows, first_row),
+        isinstance(first_row, dict),
+    )
+    file_columns = [
+        column for column in plan.iter_file_columns() if column.resolver is not None
+    ]
+    activation: t.ContextManager = nullcontext()
+    if file_columns:
+        # the names of the whole call, one resolve_many per resolver and storage
+        all_rows = [first_row, *iterator]
+        iterator = iter(all_rows[1:])
+        file_urls = get_file_url_memo()
+        if file_urls is None:
+            file_urls = FileURLMemo()
+            activation = file_urls.activate()
+        for column in file_columns:
+            file_urls.resolve_many(
+                column.resolver,
+                column.field.storage,
+                (row[column.key] for row in all_rows if row[column.key]),
+            )
+
+    result = []
+    with activation:
+        if trusted:
+            result.append(plan.construct_row(first_row))
+            result.extend(plan.construct_row(row) for row in iterator)
+            return result
+        keys = plan.keys
+        validate = t.cast(t.Any, schema_cls).from_orm
+        result.append(validate(RowView(first_row, keys)))
+        result.extend(validate(RowView(row, keys)) for row in iterator)
+    return result
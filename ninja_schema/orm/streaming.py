@@ -0,0 +1,168 @@
+"""
+Incremental validation of large JSON array inputs.
+
+`JSONArrayReader` reads a JSON array from chunks of bytes (or str) and decodes one
+element at a time with `json.JSONDecoder.raw_decode`. Its buffer only holds the
+undecoded rest of the current chunk and the element being read, so peak memory is
+bounded by the chunk size and the largest element instead of the whole document.
+"""
+
+import codecs
+import json
+import re
+import typing as t
+
+from pydantic import BaseModel, ValidationError
+
+from ninja_schema.pydanticutils import validate_object
+
+__all__ = ["JSONArrayReader", "iter_validate"]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+# the rest of a literal, number or escape sequence cut at the end of the buffer
+_partial_token = re.compile(r'[^ \t\n\r,:\[\]{}"]*\Z')
+
+
+class JSONArrayReader:
+    """Iterates over the decoded elements of a JSON array read chunk by chunk"""
+
+    def __init__(self, chunks: t.Iterable[t.Union[bytes, str]]) -> None:
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder("utf-8")().decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._index = 0
+        # characters and lines dropped from the front of the buffer, for error locations
+        self._offset = 0
+        self._lines = 0
+        self._line_start = 0
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the unread rest of the buffer"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            data = self._decode(b"", final=True)
+        elif isinstance(chunk, str):
+            data = chunk
+        else:
+            data = self._decode(chunk)
+        consumed = self._buffer[: self._pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._lines += newlines
+            self._line_start = self._offset + consumed.rindex("\n") + 1
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character, '' at the end of input"""
+        while True:
+            self._pos = _whitespace.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str) -> str:
+        char = self._peek()
+        if not char or char not in expected:
+            raise ValueError(
+                f"Invalid JSON array: expected {' or '.join(map(repr, expected))}, "
+                f"got {char or 'end of input'!r}."
+            )
+        self._pos += 1
+        return char
+
+    def _is_truncated(self, ex: json.JSONDecodeError) -> bool:
+        """Whether the decode error may go away once the next chunk is read"""
+        return (
+            ex.pos >= len(self._buffer)
+            or ex.msg.startswith("Unterminated string")
+            or _partial_token.match(self._buffer, ex.pos) is not None
+        )
+
+    def _location(self, pos: int) -> str:
+        """`line L column C (char N)` of a buffer position within the whole input"""
+        line = self._lines + self._buffer.count("\n", 0, pos) + 1
+        line_start = self._buffer.rfind("\n", 0, pos)
+        if line_start < 0:
+            column = self._offset + pos - self._line_start + 1
+        else:
+            column = pos - line_start
+        return f"line {line} column {column} (char {self._offset + pos})"
+
+    def _read_value(self) -> t.Any:
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as ex:
+                # only a value cut at the end of the buffer is worth another chunk,
+                # anything else is malformed however much of the input is read
+                if self._is_truncated(ex) and self._fill():
+                    continue
+                raise ValueError(
+                    f"Invalid JSON array element {self._index}: {ex.msg}: "
+                    f"{self._location(ex.pos)}."
+                ) from ex
+            # a number at the end of the buffer may continue in the next chunk,
+            # also when it is cut after its "." or exponent
+            if _partial_token.match(self._buffer, end) and self._fill():
+                continue
+            self._pos = end
+            self._index += 1
+            return value
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+        else:
+            while True:
+                yield self._read_value()
+                if self._expect(",]") == "]":
+                    break
+        if self._peek():
+            raise ValueError("Invalid JSON array: extra data after the array.")
+
+
+def iter_chunks(
+    stream: t.Any, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> t.Iterator[t.Union[bytes, str]]:
+    """Chunks of a file-like object, a bytes/str object or an iterable of chunks"""
+    if hasattr(stream, "read"):
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    elif isinstance(stream, (bytes, bytearray, str)):
+        for start in range(0, len(stream), chunk_size):
+            yield stream[start : start + chunk_size]
+    else:
+        yield from stream
+
+
+def iter_validate(
+    schema_cls: t.Type[BaseModel],
+    stream: t.Any,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    raise_errors: bool = False,
+) -> t.Iterator[t.Tuple[int, t.Union[BaseModel, ValidationError]]]:
+    for index, value in enumerate(JSONArrayReader(iter_chunks(stream, chunk_size))):
+        try:
+            yield index, validate_object(schema_cls, value)
+        except ValidationError as ex:
+            if raise_errors:
+                raise
+            yield index, ex
@@ -7,12 +7,13 @@ from functools import singledispatch
 from uuid import UUID
 
 import django
+from django.core import validators
 from django.db import models
 from django.db.models.fields import Field
 from django.utils.encoding import force_str
 from pydantic import AnyUrl, EmailStr, IPvAnyAddress, Json
 from pydantic.fields import Field as PydanticField
-from typing_extensions import Annotated  # F401
+from typing_extensions import Annotated, Literal  # F401
 
 from ninja_schema.compat import ArrayField, HStoreField, JSONField, RangeField
 from ninja_schema.orm.factory import SchemaFactory
@@ -68,6 +69,11 @@ def get_choices(
             yield name, value, description
 
 
+def get_choice_values(field: Field) -> t.Tuple[t.Any, ...]:
+    """Values of the (possibly grouped) choices of `field`"""
+    return tuple(value for value, _ in field.flatchoices)
+
+
 class FieldConversionProps:
     description: str
     blank: bool
@@ -78,6 +84,18 @@ class FieldConversionProps:
 
     def __init__(self, field: Field):
         data = {}
+        if isinstance(field, models.ForeignObjectRel):
+            # reverse relations have no options, they are named after the related model
+            opts = field.related_model._meta
+            verbose_name = force_str(
+                opts.verbose_name if field.one_to_one else opts.verbose_name_plural
+            )
+            data.update(
+                description=verbose_name, title=verbose_name.title(), alias=None
+            )
+            self.__dict__ = data
+            return
+
         field_options = field.deconstruct()[3]  # 3 are the keywords
 
         data["description"] = force_str(
@@ -97,16 +115,159 @@ class FieldConversionProps:
         self.__dict__ = data
 
 
+NUMBER_TYPES = (int, float, Decimal)
+LENGTH_TYPES = (str, bytes)
+PATTERN_KEY = "regex" if IS_PYDANTIC_V1 else "pattern"
+POSITIVE_INTEGER_FIELDS: t.Tuple[t.Type[Field], ...] = (
+    models.PositiveIntegerField,
+    models.PositiveSmallIntegerField,
+)
+if django.VERSION >= (3, 1):
+    POSITIVE_INTEGER_FIELDS += (models.PositiveBigIntegerField,)
+
+
+def _accepts_compiled_pattern() -> bool:
+    if IS_PYDANTIC_V1:
+        return True
+    from pydantic_core import SchemaError, SchemaValidator, core_schema
+
+    try:
+        SchemaValidator(core_schema.str_schema(pattern=re.compile("")))  # type: ignore[arg-type]
+    except SchemaError:
+        return False
+    return True
+
+
+# older pydantic-core releases only take a str pattern, run by the Rust `regex` crate
+ACCEPTS_COMPILED_PATTERN = _accepts_compiled_pattern()
+_INLINE_FLAGS = (
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+# Python's `\Z` is the end of the string, spelled `\z` by the Rust `regex` crate
+_END_OF_STRING = re.compile(r"(?<!\\)((?:\\\\)*)\\Z")
+
+
+def _get_rust_pattern(regex: t.Pattern) -> t.Optional[str]:
+    from pydantic_core import SchemaError, SchemaValidator, core_schema
+
+    flags = regex.flags & ~re.UNICODE
+    inline = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+    if flags & ~sum(flag for flag, _ in _INLINE_FLAGS):
+        return None
+    pattern = _END_OF_STRING.sub(r"\1\\z", regex.pattern)
+    if inline:
+        pattern = f"(?{inline}){pattern}"
+    try:
+        SchemaValidator(core_schema.str_schema(pattern=pattern))
+    except SchemaError:
+        # syntax of Python's `re` the Rust engine does not have (lookarounds, ...)
+        return None
+    return pattern
+
+
+def _get_pattern(
+    validator: validators.RegexValidator,
+) -> t.Optional[t.Union[str, t.Pattern]]:
+    regex = validator.regex
+    if validator.inverse_match:
+        return None
+    # pydantic v1 matches from the start of the value while Django searches it
+    if IS_PYDANTIC_V1 and not regex.pattern.startswith(("^", "\\A")):
+        return None
+    if not ACCEPTS_COMPILED_PATTERN:
+        return _get_rust_pattern(regex)
+    # a compiled pattern is run by Python's `re`, with the same syntax as Django
+    return re.compile(regex.pattern, regex.flags)
+
+
+def get_field_constraints(python_type: t.Any, field: Field) -> DictStrAny:
+    """
+    Native constraints of the Django validators of `field` that pydantic can enforce:
+    min/max value and length, regex, decimal digits and unsigned integer bounds.
+    The database dependent integer ranges are not included.
+    """
+    constraints: DictStrAny = {}
+    if not isinstance(python_type, type):
+        return constraints
+    is_number = issubclass(python_type, NUMBER_TYPES)
+    is_sized = issubclass(python_type, LENGTH_TYPES)
+
+    def tighten(key: str, value: t.Any, pick: t.Callable) -> None:
+        constraints[key] = (
+            pick(constraints[key], value) if key in constraints else value
+        )
+
+    if is_number and isinstance(field, POSITIVE_INTEGER_FIELDS):
+        constraints["ge"] = 0
+    if issubclass(python_type, Decimal) and isinstance(field, models.DecimalField):
+        if field.max_digits is not None:
+            constraints["max_digits"] = field.max_digits
+        if field.decimal_places is not None:
+            constraints["decimal_places"] = field.decimal_places
+
+    for validator in [*field.default_validators, *field._validators]:
+        limit = getattr(validator, "limit_value", None)
+        if callable(limit):
+            continue
+        if is_number and isinstance(validator, validators.MinValueValidator):
+            tighten("ge", limit, max)
+        elif is_number and isinstance(validator, validators.MaxValueValidator):
+            tighten("le", limit, min)
+        elif is_sized and isinstance(validator, validators.MinLengthValidator):
+            tighten("min_length", limit, max)
+        elif is_sized and isinstance(validator, validators.MaxLengthValidator):
+            tighten("max_length", limit, min)
+        elif (
+            issubclass(python_type, str)
+            and type(validator) is validators.RegexValidator
+        ):
+            pattern = _get_pattern(validator)
+            # pydantic takes a single pattern, more are left to `full_clean`
+            if pattern is not None and PATTERN_KEY not in constraints:
+                constraints[PATTERN_KEY] = pattern
+    return constraints
+
+
+# (python type, FieldInfo) of every converted field without a nested schema, shared
+# by all the schemas of the field. Schemas clone a FieldInfo before changing it.
+_interned_conversions: t.Dict[t.Tuple, t.Tuple[t.Type, PydanticField]] = {}
+
+
 def convert_django_field_with_choices(
     field: Field,
     *,
     registry: SchemaRegister,
     depth: int = 0,
     skip_registry: bool = False,
+    choices_type: str = "enum",
+    nested_fields: t.Optional[t.List[str]] = None,
+    nested_name: str = "",
 ) -> t.Tuple[t.Type, PydanticField]:
-    converted = convert_django_field(
-        field, registry=registry, depth=depth, skip_registry=skip_registry
-    )
+    # nested schemas depend on the registry, they are cached by the schema factory
+    key = None
+    if not (field.is_relation and depth > 0):
+        key = (field, getattr(field, "model", None), choices_type)
+        converted = _interned_conversions.get(key)
+        if converted is not None:
+            return converted
+
+    if choices_type == "literal" and field.choices and not field.is_relation:
+        # the Literal replaces the converted type, skip converting the field
+        converted = construct_field_info(object, field, choices_type=choices_type)
+    else:
+        converted = convert_django_field(
+            field,
+            registry=registry,
+            depth=depth,
+            skip_registry=skip_registry,
+            nested_fields=nested_fields,
+            nested_name=nested_name,
+        )
+    if key is not None:
+        _interned_conversions[key] = converted
     return converted
 
 
@@ -141,27 +302,43 @@ def create_m2m_link_type(
 
 @t.no_type_check
 def construct_related_field_schema(
-    field: Field, *, registry: SchemaRegister, depth: int, skip_registry=False
+    field: Field,
+    *,
+    registry: SchemaRegister,
+    depth: int,
+    skip_registry=False,
+    nested_fields: t.Optional[t.List[str]] = None,
+    nested_name: str = "",
 ) -> t.Tuple[t.Type["ModelSchema"], PydanticField]:
     # create a sample config and return the type
     model = field.related_model
-    schema = SchemaFactory.create_schema(
-        model, depth=depth - 1, registry=registry, skip_registry=skip_registry
-    )
+    if nested_fields:
+        # a narrowed schema of the relation, not the model's registered schema
+        schema = SchemaFactory.create_schema(
+            model,
+            name=nested_name,
+            fields=nested_fields,
+            depth=depth - 1,
+            registry=registry,
+            skip_registry=True,
+        )
+    else:
+        schema = SchemaFactory.create_schema(
+            model, depth=depth - 1, registry=registry, skip_registry=skip_registry
+        )
     default = ...
     if not field.concrete and field.auto_created or field.null:
         default = None
-    if isinstance(field, models.ManyToManyField):
+    if field.many_to_many or field.one_to_many:
         schema = t.List[schema]  # type: ignore
 
+    field_props = FieldConversionProps(field)
     return (
         schema,
         PydanticField(
             default=default,
-            description=force_str(
-                getattr(field, "help_text", field.verbose_name)
-            ).strip(),
-            title=field.verbose_name.title(),
+            description=field_props.description,
+            title=field_props.title,
         ),
     )
 
@@ -177,22 +354,28 @@ def construct_relational_field_info(
     default: t.Any = ...
     field_props = FieldConversionProps(field)
 
+    # a foreign key holds the value of its `to_field`, the pk by default
+    target_field = field.related_model._meta.pk
+    if field.concrete and not field.many_to_many:
+        target_field = field.target_field
     inner_type, field_info = convert_django_field(
-        field.related_model._meta.pk, registry=registry, depth=depth
+        target_field, registry=registry, depth=depth
     )
 
     if not field.concrete and field.auto_created or field.null:
         default = None
 
     python_type = inner_type
-    if field.one_to_many or field.many_to_many:
+    is_list = field.one_to_many or field.many_to_many
+    if is_list or not field.concrete:
+        # related instances are reduced to their pk
         m2m_type = create_m2m_link_type(inner_type, field.related_model)
         if IS_PYDANTIC_V1:
-            python_type = t.List[m2m_type]
+            python_type = m2m_type
         else:
-            python_type = t.List[
-                Annotated[inner_type, BeforeValidator(m2m_type.validate)]
-            ]  # type: ignore
+            python_type = Annotated[inner_type, BeforeValidator(m2m_type.validate)]  # type: ignore
+        if is_list:
+            python_type = t.List[python_type]
 
     field_info = PydanticField(
         default=default,
@@ -212,13 +395,18 @@ def construct_field_info(
     depth: int = 0,
     __module__: str = __name__,
     is_custom_type: bool = False,
+    choices_type: str = "enum",
 ) -> t.Tuple[t.Type, PydanticField]:
     default = ...
     default_factory = None
 
     field_props = FieldConversionProps(field)
 
-    if field.choices:
+    if field.choices and choices_type == "literal":
+        # validated with a set lookup and dumped as the plain values
+        python_type = Literal[get_choice_values(field)]
+        is_custom_type = True
+    elif field.choices:
         choices = list(get_choices(field.choices))
         named_choices = [(c[2], c[1]) for c in choices]
         python_type = Enum(  # type: ignore
@@ -242,6 +430,15 @@ def construct_field_info(
     if default_factory:
         default = Undefined
 
+    constraints = {}
+    if not is_custom_type:
+        constraints = get_field_constraints(python_type, field)
+        if field_props.max_length is not None:
+            constraints["max_length"] = min(
+                field_props.max_length,
+                constraints.get("max_length", field_props.max_length),
+            )
+
     return (
         python_type,
         PydanticField(
@@ -250,7 +447,7 @@ def construct_field_info(
             default_factory=default_factory,
             title=field_props.title,
             description=field_props.description,
-            max_length=None if is_custom_type else field_props.max_length,
+            **constraints,
         ),
     )
 
@@ -393,36 +590,42 @@ def convert_time_to_string(
     return construct_field_info(datetime.time, field)
 
 
-@t.no_type_check
-@convert_django_field.register(models.OneToOneRel)
-def convert_one_to_one_field_to_django_model(
-    field: Field, registry=None, depth=0, **kwargs: DictStrAny
-) -> t.Tuple[t.Type, PydanticField]:
-    return construct_relational_field_info(field, registry=registry, depth=depth)
-
-
 @t.no_type_check
 @convert_django_field.register(models.ManyToManyField)
 @convert_django_field.register(models.ManyToManyRel)
 @convert_django_field.register(models.ManyToOneRel)
 def convert_field_to_list_or_connection(
-    field: Field, registry=None, depth=0, skip_registry=False, **kwargs: DictStrAny
+    field: Field,
+    registry=None,
+    depth=0,
+    skip_registry=False,
+    nested_fields=None,
+    nested_name="",
+    **kwargs: DictStrAny,
 ) -> t.Tuple[t.Type, PydanticField]:
     if depth > 0:
         return construct_related_field_schema(
-            field, depth=depth, registry=registry, skip_registry=skip_registry
+            field,
+            depth=depth,
+            registry=registry,
+            skip_registry=skip_registry,
+            nested_fields=nested_fields,
+            nested_name=nested_name,
         )
     return construct_relational_field_info(field, registry=registry, depth=depth)
 
 
 @t.no_type_check
 @convert_django_field.register(models.OneToOneField)
+@convert_django_field.register(models.OneToOneRel)
 @convert_django_field.register(models.ForeignKey)
 def convert_field_to_django_model(
     field: Field,
     registry: t.Optional[SchemaRegister] = None,
     depth: int = 0,
     skip_registry: bool = False,
+    nested_fields: t.Optional[t.List[str]] = None,
+    nested_name: str = "",
     **kwargs: DictStrAny,
 ) -> t.Tuple[t.Type, PydanticField]:
     if depth > 0:
@@ -431,6 +634,8 @@ def convert_field_to_django_model(
             depth=depth,
             registry=registry or global_registry,
             skip_registry=skip_registry,
+            nested_fields=nested_fields,
+            nested_name=nested_name,
         )
     return construct_relational_field_info(field, registry=registry, depth=depth)
 
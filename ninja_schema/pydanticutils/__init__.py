@@ -1,15 +1,38 @@
 import logging
 import warnings
-from typing import TYPE_CHECKING, Any
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from pydantic.version import VERSION as _PYDANTIC_VERSION
+from typing_extensions import Annotated, Literal, get_args, get_origin
 
 from ..errors import ConfigError
 
 if TYPE_CHECKING:
+    from pydantic import BaseModel, ValidationError
     from pydantic.typing import DictStrAny
 
-__all__ = ["compute_field_annotations", "IS_PYDANTIC_V1", "PYDANTIC_VERSION"]
+__all__ = [
+    "build_validation_error",
+    "compute_field_annotations",
+    "get_literal_values",
+    "get_many_validator",
+    "iter_schema_fields",
+    "offset_validation_error",
+    "unwrap_optional",
+    "validate_object",
+    "IS_PYDANTIC_V1",
+    "PYDANTIC_VERSION",
+]
 
 logger = logging.getLogger()
 
@@ -55,3 +78,146 @@ def compute_field_annotations(
     namespace.update(fields)
 
     return namespace
+
+
+def iter_schema_fields(schema_cls: Type["BaseModel"]) -> Iterator[Tuple[str, str, Any]]:
+    """yields (name, alias, annotation) of every field of a pydantic model"""
+    if IS_PYDANTIC_V1:
+        for name, field in schema_cls.__fields__.items():  # type: ignore[attr-defined]
+            annotation = field.outer_type_
+            if field.allow_none:
+                annotation = Optional[annotation]
+            yield name, field.alias, annotation
+    else:
+        for name, field in schema_cls.model_fields.items():
+            alias = field.validation_alias
+            if not isinstance(alias, str):
+                alias = field.alias
+            yield name, alias or name, field.annotation
+
+
+def unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    """
+    Strips `Annotated` and `Optional` from a field annotation,
+    returns (type, whether None is allowed)
+    """
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return unwrap_optional(get_args(annotation)[0])
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        nullable = len(args) < len(get_args(annotation))
+        if len(args) == 1:
+            return unwrap_optional(args[0])[0], nullable
+        return annotation, nullable
+    return annotation, False
+
+
+def get_literal_values(annotation: Any) -> Optional[Tuple[Any, ...]]:
+    """The values of a `Literal[...]` type, None for other types"""
+    if get_origin(annotation) is Literal:
+        return get_args(annotation)
+    return None
+
+
+def validate_object(schema_cls: Type["BaseModel"], value: Any) -> "BaseModel":
+    if IS_PYDANTIC_V1:
+        return schema_cls.parse_obj(value)
+    return schema_cls.model_validate(value)
+
+
+def get_many_validator(
+    schema_cls: Type["BaseModel"],
+) -> Callable[[List[Any]], List["BaseModel"]]:
+    """Returns a function validating a list of objects with one call"""
+    if IS_PYDANTIC_V1:
+        from pydantic import parse_obj_as
+
+        return lambda values: parse_obj_as(List[schema_cls], values)  # type: ignore[valid-type]
+
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(List[schema_cls]).validate_python  # type: ignore[valid-type]
+
+
+def build_validation_error(
+    schema_cls: Type["BaseModel"],
+    error_type: str,
+    errors: List[Tuple[Tuple[Union[str, int], ...], str, Any]],
+) -> "ValidationError":
+    """Builds a pydantic ValidationError from (loc, message, input) triples"""
+    from pydantic import ValidationError
+
+    if IS_PYDANTIC_V1:
+        from pydantic.error_wrappers import ErrorWrapper
+        from pydantic.errors import PydanticValueError
+
+        # reported as "value_error.<error_type>"
+        error_cls = type(
+            "CustomValueError",
+            (PydanticValueError,),
+            {"code": error_type, "msg_template": "{message}"},
+        )
+        return ValidationError(
+            [
+                ErrorWrapper(error_cls(message=message), loc=loc)
+                for loc, message, _ in errors
+            ],
+            schema_cls,
+        )
+
+    from pydantic_core import PydanticCustomError
+
+    return ValidationError.from_exception_data(
+        schema_cls.__name__,
+        [
+            {
+                "type": PydanticCustomError(
+                    error_type, "{message}", {"message": message}
+                ),
+                "loc": loc,
+                "input": value,
+            }
+            for loc, message, value in errors
+        ],
+    )
+
+
+def offset_validation_error(error: "ValidationError", offset: int) -> "ValidationError":
+    """Shifts the list indexes of a `get_many_validator` error by `offset`"""
+    from pydantic import ValidationError
+
+    if IS_PYDANTIC_V1:
+        from pydantic.error_wrappers import ErrorWrapper
+
+        def shift(raw_error: Any) -> Any:
+            if isinstance(raw_error, list):
+                return [shift(item) for item in raw_error]
+            # located at ("__root__", index) by parse_obj_as
+            root, index, *loc = raw_error.loc_tuple()
+            return ErrorWrapper(raw_error.exc, loc=(root, index + offset, *loc))
+
+        return ValidationError(shift(error.raw_errors), error.model)  # type: ignore[attr-defined]
+
+    from pydantic_core import PydanticCustomError
+    from pydantic_core.core_schema import ErrorType
+
+    error_types = set(get_args(ErrorType))
+    line_errors: List[Any] = []
+    for line_error in error.errors():
+        index, *loc = line_error["loc"]
+        error_type: Any = line_error["type"]
+        ctx = line_error.get("ctx")
+        if error_type not in error_types:
+            # a PydanticCustomError raised by a validator, keep its rendered message
+            error_type = PydanticCustomError(error_type, line_error["msg"])
+            ctx = None
+        line_errors.append(
+            {
+                "type": error_type,
+                "loc": (index + offset, *loc),  # type: ignore[operator]
+                "input": line_error["input"],
+                **({"ctx": ctx} if ctx is not None else {}),
+            }
+        )
+    return ValidationError.from_exception_data(error.title, line_errors)
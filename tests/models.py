@@ -1,3 +1,6 @@
+import uuid
+
+from django.core.files.storage import Storage
 from django.db import models
 
 SEMESTER_CHOICES = (
@@ -37,6 +40,11 @@ class Client(models.Model):
     key = models.CharField(max_length=20, unique=True)
 
 
+class License(models.Model):
+    client = models.ForeignKey(Client, to_field="key", on_delete=models.CASCADE)
+    seats = models.IntegerField()
+
+
 class Day(models.Model):
     name = models.CharField(max_length=20, unique=True)
 
@@ -44,3 +52,61 @@ class Day(models.Model):
 class Week(models.Model):
     name = models.CharField(max_length=20, unique=True)
     days = models.ManyToManyField(Day)
+
+
+PRODUCT_STATUS_CHOICES = (
+    ("draft", "Draft"),
+    ("published", "Published"),
+)
+
+
+class Product(models.Model):
+    uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    name = models.CharField(max_length=100)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    website = models.URLField(null=True, blank=True)
+    contact = models.EmailField()
+    status = models.CharField(
+        max_length=20, choices=PRODUCT_STATUS_CHOICES, default="draft"
+    )
+    created = models.DateTimeField(auto_now_add=True)
+
+
+class Reading(models.Model):
+    product = models.ForeignKey(Product, null=True, on_delete=models.SET_NULL)
+    value = models.FloatField(null=True)
+    count = models.IntegerField()
+    active = models.BooleanField(default=True)
+    taken_on = models.DateField()
+    taken_at = models.TimeField(null=True)
+    duration = models.DurationField(null=True)
+
+
+class StubStorage(Storage):
+    """A storage that only builds URLs, counting the calls"""
+
+    base_url = "https://files.example.com/"
+
+    def __init__(self):
+        self.url_calls = 0
+
+    def url(self, name):
+        self.url_calls += 1
+        return f"{self.base_url}{name}"
+
+    def exists(self, name):
+        return False
+
+
+stub_storage = StubStorage()
+
+
+class Document(models.Model):
+    title = models.CharField(max_length=100)
+    file = models.FileField(storage=stub_storage, upload_to="docs", blank=True)
+    preview = models.FileField(storage=stub_storage, upload_to="previews", blank=True)
+
+
+class Attachment(models.Model):
+    document = models.ForeignKey(Document, on_delete=models.CASCADE)
+    note = models.CharField(max_length=100, blank=True)
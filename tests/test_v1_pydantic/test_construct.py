@@ -0,0 +1,148 @@
+from decimal import Decimal
+
+import pytest
+
+from ninja_schema import ModelSchema, model_validator
+from ninja_schema.orm.identity import IdentityMap, get_identity_map
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Day, Event, Product, Reading, Week
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestFromOrmTrusted:
+    def test_from_orm_trusted_matches_from_orm(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = "__all__"
+
+        product = Product.objects.create(
+            name="Pen",
+            price=Decimal("1.50"),
+            website="https://example.com/pen",
+            contact="sales@example.com",
+            status="published",
+        )
+        product.refresh_from_db()
+
+        trusted = ProductSchema.from_orm_trusted(product)
+        assert trusted.dict() == ProductSchema.from_orm(product).dict()
+        assert trusted.json() == ProductSchema.from_orm(product).json()
+        assert trusted.status.value == "published"
+
+    def test_from_orm_trusted_skips_validators(self):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["id", "title"]
+
+            @model_validator("title")
+            def validate_title(cls, value):
+                return f"{value} - value cleaned"
+
+        event = Event.objects.create(title="PyConf")
+        assert EventSchema.from_orm_trusted(event).title == "PyConf"
+        assert EventSchema.from_orm(event).title == "PyConf - value cleaned"
+
+    def test_from_orm_trusted_relations(self):
+        class EventDepthSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = "__all__"
+                depth = 1
+
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+
+        category = Category.objects.create(
+            name="Conf", start_date="2021-06-01", end_date="2021-06-30"
+        )
+        event = Event.objects.create(title="PyConf", category=category)
+        week = Week.objects.create(name="First")
+        week.days.set([Day.objects.create(name="Mon"), Day.objects.create(name="Tue")])
+        event.refresh_from_db()
+
+        trusted_event = EventDepthSchema.from_orm_trusted(event)
+        assert trusted_event.dict() == EventDepthSchema.from_orm(event).dict()
+        assert trusted_event.category.name == "Conf"
+
+        trusted_week = WeekSchema.from_orm_trusted(week)
+        assert trusted_week.dict() == WeekSchema.from_orm(week).dict()
+        assert trusted_week.days == [day.pk for day in week.days.all()]
+
+    def test_construct_many(self):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["id", "title", "category"]
+
+        Event.objects.create(title="PyConf")
+        Event.objects.create(title="DjangoCon")
+
+        events = EventSchema.construct_many(Event.objects.order_by("pk"))
+        assert [event.dict() for event in events] == [
+            EventSchema.from_orm(event).dict() for event in Event.objects.order_by("pk")
+        ]
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestIdentityMap:
+    def _readings(self):
+        product = Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+        for count in range(3):
+            Reading.objects.create(product=product, count=count, taken_on="2021-06-01")
+        # select_related gives every row its own Product instance
+        return list(Reading.objects.select_related("product").order_by("pk"))
+
+    def _schema(self):
+        class ReadingDepthSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["id", "count", "product"]
+                depth = 1
+
+        return ReadingDepthSchema
+
+    def test_dedupe_shares_nested_instances(self):
+        schema_cls = self._schema()
+        readings = self._readings()
+
+        for build in (schema_cls.from_orm_many, schema_cls.construct_many):
+            first, *others = build(readings, dedupe=True)
+            assert all(other.product is first.product for other in others)
+
+            first, second, _ = build(readings)
+            assert first.product is not second.product
+            assert first.product == second.product
+
+    def test_dump_json_many_dedupe(self):
+        schema_cls = self._schema()
+        readings = self._readings()
+        assert schema_cls.dump_json_many(
+            readings, dedupe=True
+        ) == schema_cls.dump_json_many(readings)
+        assert b"".join(schema_cls.iter_json_lines(readings, dedupe=True)) == b"".join(
+            schema_cls.iter_json_lines(readings)
+        )
+
+    def test_activate(self):
+        schema_cls = self._schema()
+        readings = self._readings()
+        identity_map = IdentityMap()
+        with identity_map.activate():
+            assert get_identity_map() is identity_map
+            items = [schema_cls.from_orm(reading) for reading in readings]
+        assert get_identity_map() is None
+        assert identity_map.hits == 2
+        assert items[0].product is items[2].product
+        # unsaved rows have no identity
+        built = []
+        for _ in range(2):
+            identity_map.get_or_build(schema_cls, Product(), built.append)
+        assert len(built) == 2
@@ -1,13 +1,22 @@
 import json
+import re
 from unittest.mock import Mock
 
 import django
 import pytest
+from django.core.validators import (
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinLengthValidator,
+    MinValueValidator,
+    RegexValidator,
+)
 from django.db import models
 from django.db.models import Manager
 from pydantic import ValidationError
 
 from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
 from ninja_schema.pydanticutils import IS_PYDANTIC_V1
 from tests.models import Week
 
@@ -104,6 +113,7 @@ def test_all_fields():
             "charfield": {"title": "Charfield", "type": "string"},
             "commaseparatedintegerfield": {
                 "title": "Commaseparatedintegerfield",
+                "pattern": "^\\d+(?:,\\d+)*\\Z",
                 "type": "string",
             },
             "datefield": {"title": "Datefield", "type": "string", "format": "date"},
@@ -137,13 +147,19 @@ def test_all_fields():
             "nullbooleanfield": {"title": "Nullbooleanfield", "type": "boolean"},
             "positiveintegerfield": {
                 "title": "Positiveintegerfield",
+                "minimum": 0,
                 "type": "integer",
             },
             "positivesmallintegerfield": {
                 "title": "Positivesmallintegerfield",
+                "minimum": 0,
                 "type": "integer",
             },
-            "slugfield": {"title": "Slugfield", "type": "string"},
+            "slugfield": {
+                "title": "Slugfield",
+                "pattern": "^[-a-zA-Z0-9_]+\\Z",
+                "type": "string",
+            },
             "smallintegerfield": {"title": "Smallintegerfield", "type": "integer"},
             "textfield": {"title": "Textfield", "type": "string"},
             "timefield": {"title": "Timefield", "type": "string", "format": "time"},
@@ -239,6 +255,7 @@ def test_django_31_fields():
             },
             "positivebigintegerfield": {
                 "title": "Positivebigintegerfield",
+                "minimum": 0,
                 "type": "integer",
             },
         },
@@ -379,3 +396,112 @@ def test_manytomany_validation():
 
     schema = WeekSchema(name="FirstWeek", days=[foo, foo])
     assert schema.dict() == {"id": None, "name": "FirstWeek", "days": [1, 1]}
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+def test_validators_to_constraints():
+    class ModelWithValidators(models.Model):
+        code = models.CharField(
+            max_length=10,
+            validators=[
+                MinLengthValidator(3),
+                MaxLengthValidator(5),
+                RegexValidator(r"^[A-Z]+$"),
+            ],
+        )
+        rating = models.IntegerField(
+            validators=[MinValueValidator(1), MaxValueValidator(5)]
+        )
+        quantity = models.PositiveSmallIntegerField()
+        price = models.DecimalField(max_digits=5, decimal_places=2)
+        limit = models.IntegerField(validators=[MinValueValidator(lambda: 1)])
+
+        class Meta:
+            app_label = "tests"
+
+    class ModelWithValidatorsSchema(ModelSchema):
+        class Config:
+            model = ModelWithValidators
+            exclude = ["id"]
+
+    valid = {"code": "ABCD", "rating": 5, "quantity": 0, "price": "999.99", "limit": 0}
+    assert ModelWithValidatorsSchema(**valid).code == "ABCD"
+
+    invalid = {"code": "abcdef", "rating": 0, "quantity": -1, "price": "1.234"}
+    with pytest.raises(ValidationError) as exc_info:
+        ModelWithValidatorsSchema(**{**valid, **invalid})
+    assert {error["loc"][0]: error["type"] for error in exc_info.value.errors()} == {
+        "code": "value_error.any_str.max_length",
+        "rating": "value_error.number.not_ge",
+        "quantity": "value_error.number.not_ge",
+        "price": "value_error.decimal.max_places",
+    }
+    with pytest.raises(ValidationError, match="string does not match regex"):
+        ModelWithValidatorsSchema(**{**valid, "code": "abc"})
+    with pytest.raises(ValidationError, match="digits before the decimal point"):
+        ModelWithValidatorsSchema(**{**valid, "price": "1000"})
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+def test_regex_validator_flags_and_syntax():
+    class ModelWithPatterns(models.Model):
+        tag = models.CharField(
+            max_length=10,
+            validators=[RegexValidator(r"^[a-z]+\Z", flags=re.IGNORECASE)],
+        )
+        slug = models.CharField(
+            max_length=10, validators=[RegexValidator(r"^(?!-)[a-z-]+\Z")]
+        )
+
+        class Meta:
+            app_label = "tests"
+
+    class ModelWithPatternsSchema(ModelSchema):
+        class Config:
+            model = ModelWithPatterns
+            exclude = ["id"]
+
+    assert ModelWithPatternsSchema(tag="AbC", slug="a-b").tag == "AbC"
+    with pytest.raises(ValidationError, match="string does not match regex"):
+        ModelWithPatternsSchema(tag="a1", slug="a-b")
+    with pytest.raises(ValidationError, match="string does not match regex"):
+        ModelWithPatternsSchema(tag="abc", slug="-ab")
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+def test_choices_type_literal():
+    class ModelWithChoices(models.Model):
+        size = models.IntegerField(
+            choices=[("Small", [(1, "XS"), (2, "S")]), (3, "M")], null=True
+        )
+        status = models.CharField(
+            max_length=10, choices=[("draft", "Draft"), ("published", "Published")]
+        )
+
+        class Meta:
+            app_label = "tests"
+
+    class LiteralChoicesSchema(ModelSchema):
+        class Config:
+            model = ModelWithChoices
+            exclude = ["id"]
+            choices_type = "literal"
+
+    properties = LiteralChoicesSchema.schema()["properties"]
+    assert properties["size"]["enum"] == [1, 2, 3]
+    assert properties["status"]["enum"] == ["draft", "published"]
+
+    schema = LiteralChoicesSchema(size=2, status="published")
+    assert schema.dict() == {"size": 2, "status": "published"}
+    assert type(schema.status) is str
+    with pytest.raises(ValidationError):
+        LiteralChoicesSchema(size=4, status="published")
+    with pytest.raises(ValidationError):
+        LiteralChoicesSchema(size=None, status="archived")
+
+    with pytest.raises(ConfigError, match="Invalid choices_type 'set'"):
+
+        class InvalidChoicesSchema(ModelSchema):
+            class Config:
+                model = ModelWithChoices
+                choices_type = "set"
@@ -0,0 +1,128 @@
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Day, Event, Product, Reading, Week
+
+
+def dump_from_orm(schema_cls, queryset):
+    return [json.loads(schema_cls.from_orm(obj).json()) for obj in queryset]
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestDbJson:
+    def setup_method(self):
+        # checked once per connection, with a query
+        assert connection.features.supports_json_field
+
+    def test_flat_and_depth_one(self, django_assert_num_queries):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = "__all__"
+                depth = 1
+
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["id", "product", "value", "count", "active", "taken_on"]
+
+        category = Category.objects.create(
+            name="Conf",
+            start_date=datetime.date(2021, 6, 1),
+            end_date=datetime.date(2021, 6, 30),
+        )
+        Event.objects.create(title='Py"Conf', category=category)
+        Event.objects.create(title="Meetup")
+        product = Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+        Reading.objects.create(
+            product=product, value=1.5, count=3, taken_on=datetime.date(2021, 6, 1)
+        )
+        Reading.objects.create(
+            count=0, active=False, taken_on=datetime.date(2021, 6, 2)
+        )
+
+        for schema_cls, queryset in (
+            (EventSchema, Event.objects.order_by("pk")),
+            (ReadingSchema, Reading.objects.order_by("pk")),
+        ):
+            with django_assert_num_queries(1):
+                data = schema_cls.db_json(queryset)
+            assert json.loads(data) == dump_from_orm(
+                schema_cls, schema_cls.optimize_queryset(queryset)
+            )
+
+    def test_many_to_many(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+
+        class WeekDepthSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+                depth = 1
+
+        monday, tuesday = Day.objects.create(name="M"), Day.objects.create(name="T")
+        Week.objects.create(name="w1").days.set([monday, tuesday])
+        Week.objects.create(name="w2")
+
+        for schema_cls in (WeekSchema, WeekDepthSchema):
+            queryset = Week.objects.order_by("pk")
+            with django_assert_num_queries(1):
+                data = schema_cls.db_json(queryset)
+            assert json.loads(data) == dump_from_orm(schema_cls, queryset)
+
+    def test_many_to_many_ordering(self):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+                depth = 1
+
+        class WeekByNameSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+                depth = 1
+                relation_ordering = {"days": "-name"}
+
+        b, c, a = (Day.objects.create(name=name) for name in "bca")
+        week = Week.objects.create(name="w1")
+        # linked in neither pk nor name order
+        for day in (a, b, c):
+            week.days.add(day)
+
+        queryset = Week.objects.order_by("pk")
+        for schema_cls, names in ((WeekSchema, "bca"), (WeekByNameSchema, "cba")):
+            (data,) = json.loads(schema_cls.db_json(queryset))
+            assert [day["name"] for day in data["days"]] == list(names)
+            assert [data] == dump_from_orm(schema_cls, queryset)
+
+        class WeekCappedSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = "__all__"
+                relation_limits = {"days": 2}
+
+        with pytest.raises(ConfigError, match="days"):
+            WeekCappedSchema.db_json(queryset)
+
+    def test_unsupported_fields(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name", "price", "created"]
+
+        with pytest.raises(ConfigError, match="price, created"):
+            ProductSchema.db_json(Product.objects.all())
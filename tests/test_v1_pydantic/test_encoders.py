@@ -0,0 +1,89 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.orm.encoders import get_json_backend
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Product
+
+
+def get_product_schema(backend):
+    class ProductSchema(ModelSchema):
+        class Config:
+            model = Product
+            include = ["id", "uid", "name", "price", "status", "created"]
+            json_backend = backend
+
+    return ProductSchema
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestJSONBackends:
+    def get_product(self):
+        product = Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+        product.refresh_from_db()
+        return product
+
+    @pytest.mark.parametrize("json_backend", ["pydantic", "orjson", "json"])
+    def test_json_backends_output(self, json_backend):
+        schema = get_product_schema(json_backend)
+        product = self.get_product()
+        instance = schema.from_orm(product)
+
+        data = json.loads(instance.json())
+        assert datetime.fromisoformat(data.pop("created")) == product.created
+        assert data == {
+            "id": product.pk,
+            "uid": str(product.uid),
+            "name": "Pen",
+            "price": 1.5,
+            "status": "draft",
+        }
+        assert json.loads(instance.json(exclude={"uid", "created"})) == {
+            "id": product.pk,
+            "name": "Pen",
+            "price": 1.5,
+            "status": "draft",
+        }
+
+    @pytest.mark.parametrize("json_backend", ["pydantic", "orjson", "json"])
+    def test_bulk_and_streaming_dumps(self, json_backend):
+        schema = get_product_schema(json_backend)
+        products = [self.get_product(), self.get_product()]
+        expected = [json.loads(schema.from_orm(product).json()) for product in products]
+
+        assert json.loads(schema.dump_json_many(products)) == expected
+        lines = list(schema.iter_json_lines(products))
+        assert all(line.endswith(b"\n") for line in lines)
+        assert [json.loads(line) for line in lines] == expected
+
+    def test_config_json_encoders_are_used(self):
+        pytest.importorskip("orjson")
+
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price"]
+                json_backend = "orjson"
+                json_encoders = {Decimal: str}
+
+        instance = ProductSchema(name="Pen", price="1.50")
+        assert instance.json() == '{"name":"Pen","price":"1.50"}'
+
+    def test_orjson_falls_back_to_stdlib(self, monkeypatch):
+        from ninja_schema.orm import encoders
+
+        monkeypatch.setattr(encoders, "orjson", None)
+        assert get_json_backend(get_product_schema("orjson")).name == "json"
+
+    def test_invalid_json_backend(self):
+        schema = get_product_schema("unknown")
+        with pytest.raises(ConfigError, match="Invalid json_backend"):
+            schema(id=1, name="Pen", price="1.50", created=datetime.now()).json()
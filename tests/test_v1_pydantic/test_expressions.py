@@ -0,0 +1,48 @@
+import typing
+
+import pytest
+from django.db.models import Count, Max
+from typing_extensions import Annotated
+
+from ninja_schema import Expr, ModelSchema
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Day, Week
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestExprFields:
+    def _weeks(self):
+        monday, tuesday = Day.objects.create(name="M"), Day.objects.create(name="T")
+        first, second = Week.objects.create(name="w1"), Week.objects.create(name="w2")
+        first.days.set([monday, tuesday])
+        return first, second
+
+    def test_expr_fields(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            days_count: Annotated[int, Expr(Count("days"))]
+            last_day: Annotated[typing.Optional[str], Expr(Max("days__name"))]
+
+            class Config:
+                model = Week
+                include = ["id", "name"]
+
+        first, second = self._weeks()
+        expected = [
+            {"id": first.pk, "name": "w1", "days_count": 2, "last_day": "T"},
+            {"id": second.pk, "name": "w2", "days_count": 0, "last_day": None},
+        ]
+        with django_assert_num_queries(1):
+            weeks = list(WeekSchema.annotate(Week.objects.order_by("pk")))
+            assert [WeekSchema.from_orm(week).dict() for week in weeks] == expected
+        with django_assert_num_queries(1):
+            queryset = WeekSchema.optimize_queryset(Week.objects.order_by("pk"))
+            assert [item.dict() for item in WeekSchema.construct_many(queryset)] == (
+                expected
+            )
+
+        # instances loaded without the annotations query their own values
+        week = Week.objects.get(pk=first.pk)
+        with django_assert_num_queries(1):
+            assert WeekSchema.from_orm(week).days_count == 2
+            assert WeekSchema.from_orm(week).last_day == "T"
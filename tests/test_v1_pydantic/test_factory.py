@@ -0,0 +1,81 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ninja_schema.orm import factory
+from ninja_schema.orm.factory import SchemaFactory
+from ninja_schema.orm.schema_registry import registry
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Client, Event
+
+
+def validate_in_worker(schema, data):
+    return schema(**data)
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+class TestPickleFactorySchema:
+    def test_pickle_schema_class_and_instance(self):
+        schema = SchemaFactory.create_schema(
+            Event, name="EventPickleSchema", fields=["id", "title"], skip_registry=True
+        )
+        assert pickle.loads(pickle.dumps(schema)) is schema
+
+        instance = schema(id=1, title="PyConf")
+        restored = pickle.loads(pickle.dumps(instance))
+        assert type(restored) is schema
+        assert restored == instance
+
+    def test_pickle_second_of_identical_schemas(self):
+        first, second = (
+            SchemaFactory.create_schema(Event, depth=1, skip_registry=True)
+            for _ in range(2)
+        )
+        assert first is not second
+        assert pickle.loads(pickle.dumps(first)) is first
+        assert pickle.loads(pickle.dumps(second)) is second
+
+        instance = second(
+            title="PyConf", start_date="2021-06-12", end_date="2021-06-12"
+        )
+        restored = pickle.loads(pickle.dumps(instance))
+        assert type(restored) is second
+        assert restored == instance
+
+    def test_unpickle_rebuilds_schema_once_per_process(self, monkeypatch):
+        schema = SchemaFactory.create_schema(
+            Event, name="EventRebuildSchema", depth=1, skip_registry=True
+        )
+        data = pickle.dumps(
+            schema(title="PyConf", start_date="2021-06-12", end_date="2021-06-12")
+        )
+
+        # a fresh process has not built the schema yet
+        monkeypatch.setattr(factory, "_factory_schemas", {})
+        first = pickle.loads(data)
+        second = pickle.loads(data)
+        assert type(first) is not schema
+        assert type(first) is type(second)
+        assert type(first).__name__ == "EventRebuildSchema"
+        assert first.dict() == second.dict()
+        assert first.title == "PyConf"
+
+    def test_unpickle_uses_registered_schema(self, monkeypatch):
+        monkeypatch.setattr(registry, "schemas", {})
+        schema = SchemaFactory.create_schema(Client, name="ClientPickleSchema")
+        data = pickle.dumps(schema)
+
+        monkeypatch.setattr(factory, "_factory_schemas", {})
+        assert pickle.loads(data) is registry.get_model_schema(Client) is schema
+
+    def test_factory_schema_in_process_pool(self):
+        schema = SchemaFactory.create_schema(
+            Event, name="EventPoolSchema", fields=["title"], skip_registry=True
+        )
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            result = executor.submit(validate_in_worker, schema, {"title": "PyConf"})
+            assert result.result() == schema(title="PyConf")
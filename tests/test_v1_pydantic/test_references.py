@@ -0,0 +1,112 @@
+import datetime
+import io
+
+import pydantic
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.orm.references import ReferenceChecker
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Client, Day, Event, License, Product, Reading, Week
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestCheckReferences:
+    def test_reports_missing_pks_by_index(self, django_assert_num_queries):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["title", "category"]
+
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+
+        category = Category.objects.create(
+            name="Music",
+            start_date=datetime.date(2021, 1, 1),
+            end_date=datetime.date(2021, 12, 31),
+        )
+        mon, tue = Day.objects.create(name="M"), Day.objects.create(name="T")
+        events = [
+            EventSchema(title="a", category_id=category.pk),
+            EventSchema(title="b", category_id=category.pk + 100),
+            EventSchema(title="c", category_id=None),
+        ]
+        weeks = [
+            WeekSchema(name="w1", days=[mon.pk, tue.pk]),
+            WeekSchema(name="w2", days=[mon.pk, tue.pk + 100, tue.pk + 200]),
+        ]
+
+        checker = ReferenceChecker()
+        with django_assert_num_queries(1):
+            errors = EventSchema.check_references(events, checker=checker)
+        assert list(errors) == [1]
+        (error,) = errors[1].errors()
+        assert error["loc"] == ("category_id",)
+        assert error["type"] == "value_error.missing_reference"
+        assert error["msg"] == f"Category with pk {category.pk + 100} does not exist."
+
+        with django_assert_num_queries(1):
+            errors = WeekSchema.check_references(weeks, checker=checker)
+        assert list(errors) == [1]
+        assert [e["loc"] for e in errors[1].errors()] == [("days", 1), ("days", 2)]
+
+        # the pks already checked are not queried again
+        with django_assert_num_queries(0):
+            assert list(EventSchema.check_references(events, checker=checker)) == [1]
+            assert list(WeekSchema.check_references(weeks, checker=checker)) == [1]
+        assert checker.queries == 2
+
+    def test_to_field_foreign_key(self, django_assert_num_queries):
+        class LicenseSchema(ModelSchema):
+            class Config:
+                model = License
+                include = ["client", "seats"]
+
+        client = Client.objects.create(key="acme")
+        licenses = [
+            LicenseSchema(client_id="acme", seats=1),
+            LicenseSchema(client_id=str(client.pk), seats=2),
+        ]
+        # the foreign key holds Client.key values, checked against that column
+        with django_assert_num_queries(1):
+            errors = LicenseSchema.check_references(licenses)
+        assert list(errors) == [1]
+        (error,) = errors[1].errors()
+        assert error["msg"] == f"Client with key '{client.pk}' does not exist."
+
+    def test_read_csv_check_references(self, django_assert_num_queries):
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["product", "count", "taken_on"]
+
+        product = Product.objects.create(
+            name="Pen", price="1.00", contact="sales@example.com"
+        )
+        data = (
+            "product_id,count,taken_on\n"
+            f"{product.pk},1,2021-06-01\n"
+            f"{product.pk + 1},2,2021-06-01\n"
+            ",3,2021-06-01\n"
+        )
+        # one existence check and one insert per batch, in a transaction
+        with django_assert_num_queries(1 + 3):
+            results = list(
+                ReadingSchema.read_csv(
+                    io.StringIO(data), bulk_create=True, check_references=True
+                )
+            )
+        assert [index for index, _ in results] == [0, 1, 2]
+        assert isinstance(results[1][1], pydantic.ValidationError)
+        assert [reading.count for reading in Reading.objects.order_by("pk")] == [1, 3]
+
+        with pytest.raises(pydantic.ValidationError, match="does not exist"):
+            list(
+                ReadingSchema.read_csv(
+                    io.StringIO(data), raise_errors=True, check_references=True
+                )
+            )
@@ -0,0 +1,202 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from pydantic import ValidationError
+
+from ninja_schema import ModelSchema
+from ninja_schema.orm.file_urls import FileURLResolver
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Document, Event, Product, Reading
+
+
+class BatchResolver(FileURLResolver):
+    def __init__(self):
+        self.batches = []
+
+    def resolve_many(self, storage, names):
+        self.batches.append(list(names))
+        return {name: f"https://cdn.example.com/{name}" for name in names}
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestFromRows:
+    def setup_method(self):
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["id", "product", "count", "taken_on"]
+
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name", "status"]
+
+        self.ReadingSchema = ReadingSchema
+        self.ProductSchema = ProductSchema
+
+    def create_readings(self):
+        product = Product.objects.create(
+            name="p", price=Decimal("1"), contact="a@b.c", status="published"
+        )
+        for count in range(3):
+            Reading.objects.create(
+                product=product if count else None,
+                count=count,
+                taken_on=datetime.date(2021, 1, count + 1),
+            )
+        return product
+
+    def test_named_values_list(self, django_assert_num_queries):
+        self.create_readings()
+        queryset = Reading.objects.order_by("pk")
+        expected = [self.ReadingSchema.from_orm(obj).dict() for obj in queryset]
+        rows = queryset.values_list("id", "product_id", "count", "taken_on", named=True)
+
+        with django_assert_num_queries(1):
+            items = self.ReadingSchema.from_rows(rows)
+        assert [item.dict() for item in items] == expected
+        items = self.ReadingSchema.from_rows(rows, trusted=True)
+        assert [item.dict() for item in items] == expected
+        assert expected[1]["product"] is not None
+
+        product_rows = Product.objects.values_list("id", "name", "status", named=True)
+        (trusted,) = self.ProductSchema.from_rows(product_rows, trusted=True)
+        assert trusted == self.ProductSchema.from_rows(product_rows)[0]
+        assert (
+            trusted.status == self.ProductSchema.from_orm(Product.objects.get()).status
+        )
+
+    def test_foreign_key_column_named_after_field(self):
+        product = self.create_readings()
+        queryset = Reading.objects.order_by("pk")
+        expected = [self.ReadingSchema.from_orm(obj).dict() for obj in queryset]
+        assert expected[1]["product"] == product.pk
+
+        columns = ("id", "product", "count", "taken_on")
+        for rows in (
+            queryset.values(*columns),
+            queryset.values_list(*columns, named=True),
+        ):
+            items = self.ReadingSchema.from_rows(rows)
+            assert [item.dict() for item in items] == expected
+            items = self.ReadingSchema.from_rows(rows, trusted=True)
+            assert [item.dict() for item in items] == expected
+
+    def test_file_fields(self):
+        resolver = BatchResolver()
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["title", "file", "preview"]
+                file_url_resolver = {"preview": resolver}
+
+        Document.objects.create(title="a", file="docs/a.pdf", preview="previews/a.png")
+        Document.objects.create(title="b", file="docs/b.pdf", preview="previews/a.png")
+        Document.objects.create(title="c")
+        queryset = Document.objects.order_by("pk")
+        expected = [item.dict() for item in DocumentSchema.from_orm_many(queryset)]
+        assert expected[0]["file"] == "https://files.example.com/docs/a.pdf"
+        assert expected[0]["preview"] == "https://cdn.example.com/previews/a.png"
+
+        rows = queryset.values_list("title", "file", "preview", named=True)
+        validated = DocumentSchema.from_rows(rows)
+        trusted = DocumentSchema.from_rows(rows, trusted=True)
+        assert [item.dict() for item in validated] == expected
+        assert [item.dict() for item in trusted] == expected
+        # one batch per call, the shared preview once
+        assert resolver.batches == [["previews/a.png"]] * 3
+
+    def test_cursor_and_columns(self):
+        self.create_readings()
+        expected = [
+            self.ReadingSchema.from_orm(obj).dict()
+            for obj in Reading.objects.order_by("pk")
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id, product_id, count, taken_on "
+                f"FROM {Reading._meta.db_table} ORDER BY id"
+            )
+            items = self.ReadingSchema.from_rows(cursor)
+        assert [item.dict() for item in items] == expected
+
+        rows = [(reading["count"], reading["id"]) for reading in expected]
+        with pytest.raises(TypeError, match="needs `columns`"):
+            self.ReadingSchema.from_rows(rows)
+        with pytest.raises(ValidationError):
+            self.ReadingSchema.from_rows(rows, columns=["count", "id"])
+        assert self.ReadingSchema.from_rows([], columns=["id"]) == []
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+@pytest.mark.django_db
+class TestFromValues:
+    def create_events(self):
+        for number in range(2):
+            category = Category.objects.create(
+                name=f"c{number}",
+                start_date=datetime.date(2021, 1, 1),
+                end_date=datetime.date(2021, 2, 1),
+            )
+            Event.objects.create(title=f"e{number}", category=category)
+        Event.objects.create(title="uncategorized")
+
+    def test_nested_lookup_keys(self, django_assert_num_queries):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["id", "title", "category"]
+                depth = 1
+                skip_registry = True
+
+        self.create_events()
+        queryset = Event.objects.select_related("category").order_by("pk")
+        expected = [EventSchema.from_orm(event).dict() for event in queryset]
+        rows = Event.objects.order_by("pk").values(
+            "id",
+            "title",
+            "category__id",
+            "category__name",
+            "category__start_date",
+            "category__end_date",
+        )
+
+        with django_assert_num_queries(1):
+            items = EventSchema.from_rows(rows)
+        assert [item.dict() for item in items] == expected
+        items = EventSchema.from_rows(rows, trusted=True)
+        assert [item.dict() for item in items] == expected
+        assert expected[0]["category"]["name"] == "c0"
+        assert expected[2]["category"] is None
+
+        named = Event.objects.order_by("pk").values_list(
+            "id",
+            "title",
+            "category__id",
+            "category__name",
+            "category__start_date",
+            "category__end_date",
+            named=True,
+        )
+        assert [item.dict() for item in EventSchema.from_rows(named)] == expected
+
+    def test_nested_include(self):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["title", "category__name"]
+                skip_registry = True
+
+        self.create_events()
+        queryset = Event.objects.select_related("category").order_by("pk")
+        expected = [EventSchema.from_orm(event).dict() for event in queryset]
+        rows = Event.objects.order_by("pk").values("title", "category__name")
+        assert [item.dict() for item in EventSchema.from_rows(rows)] == expected
+        assert [
+            item.dict() for item in EventSchema.from_rows(rows, trusted=True)
+        ] == expected
+        assert expected[0]["category"] == {"name": "c0"}
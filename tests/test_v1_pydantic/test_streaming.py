@@ -0,0 +1,122 @@
+import io
+import json
+import tracemalloc
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from ninja_schema import ModelSchema, Schema
+from ninja_schema.orm.streaming import JSONArrayReader, iter_chunks
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Product
+
+
+class ItemSchema(Schema):
+    id: int
+    name: str
+
+
+@pytest.mark.skipif(not IS_PYDANTIC_V1, reason="requires pydantic == 1.6.x")
+class TestIterValidate:
+    def test_iter_validate_yields_instances_and_errors(self):
+        items = [{"id": i, "name": f'ünïcode, [{i}] "quoted"'} for i in range(20)]
+        items[3] = {"id": "three", "name": "bad"}
+        items[7] = "not an object"
+        payload = json.dumps(items, ensure_ascii=False, indent=1).encode()
+
+        for chunk_size in (1, 7, len(payload)):
+            results = list(
+                ItemSchema.iter_validate(io.BytesIO(payload), chunk_size=chunk_size)
+            )
+            assert [index for index, _ in results] == list(range(20))
+            errors = {
+                index: result
+                for index, result in results
+                if isinstance(result, pydantic.ValidationError)
+            }
+            assert list(errors) == [3, 7]
+            assert [result.dict() for _, result in results if _ not in errors] == [
+                item for index, item in enumerate(items) if index not in errors
+            ]
+
+        with pytest.raises(pydantic.ValidationError):
+            list(ItemSchema.iter_validate(payload, raise_errors=True))
+
+    def test_iter_validate_model_schema_from_chunk_iterable(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "status"]
+
+        chunks = iter(
+            [b'[{"name": "Pen", "pri', b'ce": "1.50", "status": "pub', b'lished"}]']
+        )
+        ((index, product),) = ProductSchema.iter_validate(chunks)
+        assert index == 0
+        assert product.price == Decimal("1.50")
+        assert product.status.value == "published"
+
+    @pytest.mark.parametrize(
+        "payload, message",
+        [
+            (b'{"id": 1}', "expected '\\['"),
+            (b'[{"id": 1, "name": "a"} {"id": 2}]', "expected ',' or '\\]'"),
+            (b'[{"id": 1, "name": "a"},', "element 1"),
+            (b'[{"id": 1, "name": "a"}] []', "extra data"),
+        ],
+    )
+    def test_iter_validate_rejects_invalid_json(self, payload, message):
+        with pytest.raises(ValueError, match=message):
+            list(ItemSchema.iter_validate(payload, chunk_size=4))
+
+    def test_iter_validate_rejects_malformed_element_without_reading_on(self):
+        class Stream(io.BytesIO):
+            reads = 0
+
+            def read(self, size=-1):
+                self.reads += 1
+                return super().read(size)
+
+        payload = b'[{"id": 1, "name": "a"},\n {"id": x},\n' + b" " * 10_000 + b"]"
+        stream = Stream(payload)
+        with pytest.raises(
+            ValueError, match=r"element 1: .*line 2 column 9 \(char 33\)"
+        ):
+            list(ItemSchema.iter_validate(stream, chunk_size=16))
+        assert stream.reads == 3
+
+    def test_iter_validate_reads_values_cut_between_chunks(self):
+        items = [-12.5e3, "é\\", True, None, {"a": [False]}]
+        payload = json.dumps(items, ensure_ascii=True).encode()
+        for chunk_size in range(1, len(payload) + 1):
+            assert list(JSONArrayReader(iter_chunks(payload, chunk_size))) == items
+
+    def test_iter_validate_memory_is_bounded_by_chunk_size(self):
+        count, chunk_size = 20_000, 16 * 1024
+        element = b'{"id": 1, "name": "%s"},' % (b"x" * 80)
+
+        def generate():
+            yield b"["
+            for _ in range(count - 1):
+                yield element
+            yield element[:-1] + b"]"
+
+        def read_chunks():
+            buffer = b""
+            for data in generate():
+                buffer += data
+                if len(buffer) >= chunk_size:
+                    yield buffer
+                    buffer = b""
+            yield buffer
+
+        tracemalloc.start()
+        try:
+            total = sum(1 for _ in ItemSchema.iter_validate(read_chunks()))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert total == count
+        # the document is ~2MB, a full json.loads would keep all of it
+        assert peak < 20 * chunk_size
@@ -0,0 +1,202 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Day, Event, Product, Week
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestBulkWrite:
+    def create_categories(self):
+        return [
+            Category.objects.create(
+                name=name,
+                start_date=datetime.date(2021, 1, 1),
+                end_date=datetime.date(2021, 12, 31),
+            )
+            for name in ("Music", "Sport", "Art")
+        ]
+
+    def test_apply_many_updates_changed_fields_only(self, django_assert_num_queries):
+        class EventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["title", "category"]
+
+        music, sport, art = self.create_categories()
+        events = [
+            Event.objects.create(title="Jazz", category=music),
+            Event.objects.create(title="Cup", category=sport),
+        ]
+        schemas = [
+            EventSchema(title="Jazz", category_id=art.pk),
+            EventSchema(title="Cup", category_id=None),
+        ]
+        # one bulk update inside the transaction
+        with django_assert_num_queries(3):
+            updated = EventSchema.apply_many(events, schemas)
+
+        assert updated == {"category"}
+        assert events[0].category_id == art.pk
+        assert list(
+            Event.objects.order_by("pk").values_list("title", "category_id")
+        ) == [("Jazz", art.pk), ("Cup", None)]
+        assert EventSchema.apply_many(events, schemas) == set()
+        assert EventSchema.apply_many(events, schemas, by_alias=True) == set()
+
+    def test_apply_many_syncs_many_to_many_per_batch(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+
+        mon, tue, wed = [Day.objects.create(name=name) for name in "MTW"]
+        weeks = [Week.objects.create(name=f"week-{i}") for i in range(4)]
+        weeks[0].days.set([mon, tue])
+        weeks[1].days.set([wed])
+        schemas = [
+            WeekSchema(name="week-0", days=[tue.pk, wed.pk]),
+            WeekSchema(name="week-1", days=[wed.pk]),
+            WeekSchema(name="renamed", days=[mon.pk]),
+            WeekSchema(name="week-3", days=[]),
+        ]
+        # savepoint, then per batch: update (renamed batch only), read through rows,
+        # delete stale rows (first batch only), insert new rows
+        with django_assert_num_queries(2 + 3 + 3):
+            updated = WeekSchema.apply_many(weeks, schemas, batch_size=2)
+
+        assert updated == {"name", "days"}
+        assert [
+            sorted(week.days.values_list("name", flat=True))
+            for week in Week.objects.order_by("pk")
+        ] == [["T", "W"], ["W"], ["M"], []]
+        assert Week.objects.filter(name="renamed").exists()
+
+    def test_apply_many_requires_pairs(self):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name"]
+
+        with pytest.raises(ValueError, match="Got 0 instances for 1"):
+            WeekSchema.apply_many([], [WeekSchema(name="week")])
+
+    def test_bulk_create(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "contact", "status"]
+
+        mon, tue = Day.objects.create(name="M"), Day.objects.create(name="T")
+        schemas = [
+            WeekSchema(name=f"week-{i}", days=[mon.pk, tue.pk][: i % 3])
+            for i in range(5)
+        ]
+        # savepoint, then per batch: insert, read through rows, insert through rows
+        with django_assert_num_queries(2 + 3 * 2):
+            weeks = WeekSchema.bulk_create(schemas, batch_size=3)
+
+        assert [week.name for week in weeks] == [f"week-{i}" for i in range(5)]
+        assert all(week.pk for week in weeks)
+        assert [week.days.count() for week in weeks] == [0, 1, 2, 0, 1]
+
+        (product,) = ProductSchema.bulk_create(
+            [
+                ProductSchema(
+                    name="Pen",
+                    price=Decimal("1.50"),
+                    contact="sales@example.com",
+                    status="published",
+                )
+            ]
+        )
+        product.refresh_from_db()
+        assert product.status == "published"
+        assert product.price == Decimal("1.50")
+
+    def test_upsert_writes_changed_rows_only(self, django_assert_num_queries):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["uid", "name", "price", "contact", "status"]
+
+        uids = [uuid.uuid4() for _ in range(4)]
+        records = [
+            {"uid": uid, "name": f"item-{i}", "price": "1.00", "contact": "a@b.com"}
+            for i, uid in enumerate(uids[:3])
+        ]
+        batches = ProductSchema.upsert(records, unique_fields=["uid"], batch_size=2)
+        assert [(b.size, b.created, b.updated, b.unchanged) for b in batches] == [
+            (2, 2, 0, 0),
+            (1, 1, 0, 0),
+        ]
+        assert all(b.validate_seconds >= 0 and b.write_seconds >= 0 for b in batches)
+
+        records[0]["price"] = "2.50"
+        records[1]["status"] = "published"
+        records[2]["name"] = "item-2"
+        records.append({**records[2], "uid": uids[3], "name": "item-3"})
+        # savepoint, read existing rows, one upsert
+        with django_assert_num_queries(4):
+            (batch,) = ProductSchema.upsert(records, unique_fields=["uid"])
+        assert (batch.created, batch.updated, batch.unchanged) == (1, 2, 1)
+        assert batch.update_fields == ["price", "status"]
+        assert list(
+            Product.objects.order_by("name").values_list("name", "price", "status")
+        ) == [
+            ("item-0", Decimal("2.50"), "draft"),
+            ("item-1", Decimal("1.00"), "published"),
+            ("item-2", Decimal("1.00"), "draft"),
+            ("item-3", Decimal("1.00"), "draft"),
+        ]
+
+        (batch,) = ProductSchema.upsert(
+            records, unique_fields=["uid"], update_fields="all"
+        )
+        assert (batch.created, batch.updated, batch.unchanged) == (0, 0, 4)
+        assert batch.update_fields == ["name", "price", "contact", "status"]
+        assert Product.objects.count() == 4
+
+    def test_upsert_sets_many_to_many(self):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+
+        mon, tue = Day.objects.create(name="M"), Day.objects.create(name="T")
+        WeekSchema.upsert([{"name": "w1", "days": [mon.pk]}], unique_fields=["name"])
+        (batch,) = WeekSchema.upsert(
+            [{"name": "w1", "days": [tue.pk]}, {"name": "w2", "days": [mon.pk]}],
+            unique_fields=["name"],
+        )
+        assert (batch.created, batch.unchanged) == (1, 1)
+        assert [
+            list(week.days.values_list("name", flat=True))
+            for week in Week.objects.order_by("name")
+        ] == [["T"], ["M"]]
+
+    def test_upsert_errors(self):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+
+        with pytest.raises(ConfigError, match="Expected 'changed' or 'all'"):
+            WeekSchema.upsert([], unique_fields=["name"], update_fields="some")
+        with pytest.raises(ConfigError, match="'days' is not a column"):
+            WeekSchema.upsert([], unique_fields=["days"])
+        with pytest.raises(pydantic.ValidationError):
+            WeekSchema.upsert([{"days": []}], unique_fields=["name"])
+        assert not Week.objects.exists()
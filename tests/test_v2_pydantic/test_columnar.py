@@ -0,0 +1,114 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Product, Reading
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestToColumns:
+    def create_readings(self):
+        product = Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+        Product.objects.create(
+            name="Ink", price=Decimal("12.05"), contact="sales@example.com"
+        )
+        Reading.objects.create(
+            product=product,
+            value=1.5,
+            count=3,
+            taken_on=datetime.date(2021, 6, 1),
+            taken_at=datetime.time(10, 30, 15, 500),
+            duration=datetime.timedelta(minutes=5),
+        )
+        Reading.objects.create(
+            count=-1, active=False, taken_on=datetime.date(1969, 12, 31)
+        )
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_to_columns_matches_from_orm(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = "__all__"
+
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = "__all__"
+
+        self.create_readings()
+        for schema, queryset in [
+            (ProductSchema, Product.objects.order_by("pk")),
+            (ReadingSchema, Reading.objects.order_by("pk")),
+        ]:
+            columns = schema.to_columns(queryset, chunk_size=1, use_numpy=use_numpy)
+            instances = [schema.from_orm(obj) for obj in queryset]
+            assert list(columns) == list(schema.model_fields)
+            for name, column in columns.items():
+                assert len(column) == len(instances)
+                assert column.to_pylist() == [
+                    getattr(instance, name) for instance in instances
+                ], name
+
+    def test_column_buffers(self):
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["product", "value", "count", "taken_on"]
+
+        self.create_readings()
+        columns = ReadingSchema.to_columns(
+            Reading.objects.order_by("pk"), use_numpy=False
+        )
+        assert columns["count"].kind == "int64"
+        assert list(columns["count"].values) == [3, -1]
+        assert columns["count"].validity is None
+        assert columns["value"].kind == "float64"
+        assert list(columns["value"].validity) == [1, 0]
+        assert list(columns["product"].validity) == [1, 0]
+        assert list(columns["taken_on"].values) == [18779, -1]
+
+        columns = ReadingSchema.to_columns(
+            Reading.objects.order_by("pk"), fields=["count"], use_numpy=False
+        )
+        assert list(columns) == ["count"]
+
+    def test_to_columns_decimal_and_choices(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "status"]
+
+        self.create_readings()
+        columns = ProductSchema.to_columns(
+            Product.objects.order_by("pk"), use_numpy=False
+        )
+        assert columns["price"].kind == "decimal"
+        assert columns["price"].scale == 2
+        assert list(columns["price"].values) == [150, 1205]
+        assert columns["status"].kind == "dictionary"
+        assert list(columns["status"].values) == [0, 0]
+        assert columns["name"].kind == "utf8"
+        assert bytes(columns["name"].values) == b"PenInk"
+        assert list(columns["name"].offsets) == [0, 3, 6]
+
+    def test_to_columns_invalid_fields(self):
+        class ReadingSchema(ModelSchema):
+            custom: str = ""
+
+            class Config:
+                model = Reading
+                include = ["count"]
+
+        with pytest.raises(ConfigError):
+            ReadingSchema.to_columns(Reading.objects.all(), fields=["custom"])
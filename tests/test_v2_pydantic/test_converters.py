@@ -1,16 +1,29 @@
 import json
+import re
 from unittest.mock import Mock
 
 import django
 import pytest
+from django.core.validators import (
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinLengthValidator,
+    MinValueValidator,
+    RegexValidator,
+)
 from django.db import models
 from django.db.models import Manager
 from pydantic import ValidationError
 
 from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.orm.utils.converter import ACCEPTS_COMPILED_PATTERN
 from ninja_schema.pydanticutils import IS_PYDANTIC_V1
 from tests.models import Week
 
+# the end of string anchor of the patterns run by the Rust engine
+END_OF_STRING = "\\Z" if ACCEPTS_COMPILED_PATTERN else "\\z"
+
 
 @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
 def test_inheritance():
@@ -40,7 +53,7 @@ def test_inheritance():
                 "title": "Parent Field",
                 "type": "string",
             },
-            "parentmodel_ptr": {
+            "parentmodel_ptr_id": {
                 "anyOf": [{"type": "integer"}, {"type": "null"}],
                 "default": None,
                 "description": "",
@@ -125,6 +138,7 @@ def test_all_fields():
             "charfield": {"description": "", "title": "Charfield", "type": "string"},
             "commaseparatedintegerfield": {
                 "description": "",
+                "pattern": "^\\d+(?:,\\d+)*" + END_OF_STRING,
                 "title": "Commaseparatedintegerfield",
                 "type": "string",
             },
@@ -189,15 +203,22 @@ def test_all_fields():
             },
             "positiveintegerfield": {
                 "description": "",
+                "minimum": 0,
                 "title": "Positiveintegerfield",
                 "type": "integer",
             },
             "positivesmallintegerfield": {
                 "description": "",
+                "minimum": 0,
                 "title": "Positivesmallintegerfield",
                 "type": "integer",
             },
-            "slugfield": {"description": "", "title": "Slugfield", "type": "string"},
+            "slugfield": {
+                "description": "",
+                "pattern": "^[-a-zA-Z0-9_]+" + END_OF_STRING,
+                "title": "Slugfield",
+                "type": "string",
+            },
             "smallintegerfield": {
                 "description": "",
                 "title": "Smallintegerfield",
@@ -319,6 +340,7 @@ def test_django_31_fields():
             },
             "positivebigintegerfield": {
                 "description": "",
+                "minimum": 0,
                 "title": "Positivebigintegerfield",
                 "type": "integer",
             },
@@ -489,3 +511,116 @@ def test_manytomany_validation():
 
     schema = WeekSchema(name="FirstWeek", days=[foo, foo])
     assert schema.dict() == {"id": None, "name": "FirstWeek", "days": [1, 1]}
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+def test_validators_to_constraints():
+    class ModelWithValidators(models.Model):
+        code = models.CharField(
+            max_length=10,
+            validators=[
+                MinLengthValidator(3),
+                MaxLengthValidator(5),
+                RegexValidator(r"^[A-Z]+$"),
+            ],
+        )
+        rating = models.IntegerField(
+            validators=[MinValueValidator(1), MaxValueValidator(5)]
+        )
+        quantity = models.PositiveSmallIntegerField()
+        price = models.DecimalField(max_digits=5, decimal_places=2)
+        limit = models.IntegerField(validators=[MinValueValidator(lambda: 1)])
+
+        class Meta:
+            app_label = "tests"
+
+    class ModelWithValidatorsSchema(ModelSchema):
+        class Config:
+            model = ModelWithValidators
+            exclude = ["id"]
+
+    valid = {"code": "ABCD", "rating": 5, "quantity": 0, "price": "999.99", "limit": 0}
+    assert ModelWithValidatorsSchema(**valid).code == "ABCD"
+
+    invalid = {"code": "abcdef", "rating": 0, "quantity": -1, "price": "1.234"}
+    with pytest.raises(ValidationError) as exc_info:
+        ModelWithValidatorsSchema(**{**valid, **invalid})
+    assert {error["loc"][0]: error["type"] for error in exc_info.value.errors()} == {
+        "code": "string_too_long",
+        "rating": "greater_than_equal",
+        "quantity": "greater_than_equal",
+        "price": "decimal_max_places",
+    }
+    with pytest.raises(ValidationError, match="should match pattern"):
+        ModelWithValidatorsSchema(**{**valid, "code": "abc"})
+    with pytest.raises(ValidationError, match="digits before the decimal point"):
+        ModelWithValidatorsSchema(**{**valid, "price": "1000"})
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+def test_regex_validator_flags_and_syntax():
+    class ModelWithPatterns(models.Model):
+        tag = models.CharField(
+            max_length=10,
+            validators=[RegexValidator(r"^[a-z]+\Z", flags=re.IGNORECASE)],
+        )
+        slug = models.CharField(
+            max_length=10, validators=[RegexValidator(r"^(?!-)[a-z-]+\Z")]
+        )
+
+        class Meta:
+            app_label = "tests"
+
+    class ModelWithPatternsSchema(ModelSchema):
+        class Config:
+            model = ModelWithPatterns
+            exclude = ["id"]
+
+    assert ModelWithPatternsSchema(tag="AbC", slug="a-b").tag == "AbC"
+    with pytest.raises(ValidationError, match="should match pattern"):
+        ModelWithPatternsSchema(tag="a1", slug="a-b")
+    if ACCEPTS_COMPILED_PATTERN:
+        with pytest.raises(ValidationError, match="should match pattern"):
+            ModelWithPatternsSchema(tag="abc", slug="-ab")
+    else:
+        # the Rust engine has no lookarounds, the pattern is left to `full_clean`
+        assert ModelWithPatternsSchema(tag="abc", slug="-ab").slug == "-ab"
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+def test_choices_type_literal():
+    class ModelWithChoices(models.Model):
+        size = models.IntegerField(
+            choices=[("Small", [(1, "XS"), (2, "S")]), (3, "M")], null=True
+        )
+        status = models.CharField(
+            max_length=10, choices=[("draft", "Draft"), ("published", "Published")]
+        )
+
+        class Meta:
+            app_label = "tests"
+
+    class LiteralChoicesSchema(ModelSchema):
+        class Config:
+            model = ModelWithChoices
+            exclude = ["id"]
+            choices_type = "literal"
+
+    properties = LiteralChoicesSchema.schema()["properties"]
+    assert properties["size"]["anyOf"][0] == {"enum": [1, 2, 3], "type": "integer"}
+    assert properties["status"]["enum"] == ["draft", "published"]
+
+    schema = LiteralChoicesSchema(size=2, status="published")
+    assert schema.dict() == {"size": 2, "status": "published"}
+    assert type(schema.status) is str
+    with pytest.raises(ValidationError):
+        LiteralChoicesSchema(size=4, status="published")
+    with pytest.raises(ValidationError):
+        LiteralChoicesSchema(size=None, status="archived")
+
+    with pytest.raises(ConfigError, match="Invalid choices_type 'set'"):
+
+        class InvalidChoicesSchema(ModelSchema):
+            class Config:
+                model = ModelWithChoices
+                choices_type = "set"
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from ninja_schema import ModelSchema
+from ninja_schema.orm.dump_cache import DumpCache
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Day, Product, Reading, Week
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestCachedDump:
+    def setup_method(self):
+        cache.clear()
+
+    def _product(self):
+        return Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+
+    def test_cached_dump_versions(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name", "status"]
+
+        product = self._product()
+        data = ProductSchema.cached_dump(product, version_field="status")
+        assert data == ProductSchema.from_orm(product).json().encode()
+        assert ProductSchema.cached_dump(product, version_field="status") == data
+
+        # no signal is sent, the version tells the entry is stale
+        Product.objects.filter(pk=product.pk).update(name="Pencil", status="published")
+        product.refresh_from_db()
+        assert b"Pencil" in ProductSchema.cached_dump(product, version_field="status")
+
+        product.name = "Marker"
+        product.save()
+        assert b"Marker" in ProductSchema.cached_dump(product, version_field="status")
+
+        dump_cache = ProductSchema.get_dump_cache()
+        assert (dump_cache.hits, dump_cache.misses) == (1, 3)
+        assert dump_cache.hit_rate == 0.25
+
+    def test_config_dump_cache_watches_from_class_creation(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name"]
+                dump_cache = "default"
+
+        product = self._product()
+        # an entry written by another process sharing the cache
+        DumpCache(ProductSchema, "default").dump(product)
+
+        # saved before any cached_dump call of this process
+        product.name = "Pencil"
+        product.save()
+        assert b"Pencil" in ProductSchema.cached_dump(product)
+        dump_cache = ProductSchema.get_dump_cache()
+        assert (dump_cache.hits, dump_cache.misses) == (0, 1)
+
+    def test_cached_dump_invalidated_by_relations(self):
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["id", "count", "product"]
+                depth = 1
+
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["id", "name", "days"]
+
+        product = self._product()
+        reading = Reading.objects.create(
+            product=product, count=1, taken_on="2021-06-01"
+        )
+        ReadingSchema.cached_dump(reading)
+        product.name = "Pencil"
+        product.save()
+        reading = Reading.objects.select_related("product").get(pk=reading.pk)
+        assert b"Pencil" in ReadingSchema.cached_dump(reading)
+        assert ReadingSchema.get_dump_cache().hits == 0
+
+        week = Week.objects.create(name="w1")
+        monday, tuesday = Day.objects.create(name="M"), Day.objects.create(name="T")
+        week.days.add(monday)
+        assert WeekSchema.cached_dump(week) == WeekSchema.cached_dump(week)
+        tuesday.week_set.add(week)
+        assert WeekSchema.cached_dump(week) == WeekSchema.from_orm(week).json().encode()
+
+        dump_cache = WeekSchema.get_dump_cache()
+        assert (dump_cache.hits, dump_cache.misses) == (1, 2)
@@ -0,0 +1,187 @@
+import pytest
+from django.core.cache import cache
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.orm.file_urls import (
+    CachedFileURLResolver,
+    FileURLMemo,
+    FileURLMemoMiddleware,
+    FileURLResolver,
+    get_file_url_memo,
+)
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Attachment, Document, stub_storage
+
+
+class BatchResolver(FileURLResolver):
+    def __init__(self):
+        self.batches = []
+
+    def resolve_many(self, storage, names):
+        self.batches.append(list(names))
+        return {name: f"https://cdn.example.com/{name}?signed" for name in names}
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestFileURLs:
+    def setup_method(self):
+        stub_storage.url_calls = 0
+        cache.clear()
+
+    def create_documents(self):
+        return [
+            Document.objects.create(title="a", file="docs/a.pdf"),
+            Document.objects.create(title="b", file="docs/b.pdf"),
+            Document.objects.create(title="c", file="docs/a.pdf"),
+            Document.objects.create(title="d"),
+        ]
+
+    def test_storage_url_by_default(self):
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["title", "file"]
+
+        documents = self.create_documents()
+        assert DocumentSchema.from_orm(documents[0]).dict() == {
+            "title": "a",
+            "file": "https://files.example.com/docs/a.pdf",
+        }
+        assert DocumentSchema.from_orm(documents[3]).file is None
+        assert stub_storage.url_calls == 1
+
+    def test_batch_resolution(self):
+        resolver = BatchResolver()
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["title", "file"]
+                file_url_resolver = resolver
+
+        self.create_documents()
+        queryset = Document.objects.order_by("pk")
+        expected = [
+            "https://cdn.example.com/docs/a.pdf?signed",
+            "https://cdn.example.com/docs/b.pdf?signed",
+            "https://cdn.example.com/docs/a.pdf?signed",
+            None,
+        ]
+
+        items = DocumentSchema.from_orm_many(queryset)
+        assert [item.file for item in items] == expected
+        assert resolver.batches == [["docs/a.pdf", "docs/b.pdf"]]
+
+        items = DocumentSchema.construct_many(queryset)
+        assert [item.file for item in items] == expected
+        assert len(resolver.batches) == 2
+
+        DocumentSchema.dump_json_many(queryset)
+        assert len(resolver.batches) == 3
+        # a single instance resolves its own file
+        assert DocumentSchema.from_orm(queryset[1]).file == expected[1]
+        assert resolver.batches[-1] == ["docs/b.pdf"]
+        assert stub_storage.url_calls == 0
+
+    def test_resolver_per_field(self):
+        resolver = BatchResolver()
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["file", "preview"]
+                file_url_resolver = {"preview": resolver}
+
+        Document.objects.create(title="a", file="docs/a.pdf", preview="previews/a.png")
+        (item,) = DocumentSchema.from_orm_many(Document.objects.all())
+        assert item.file == "https://files.example.com/docs/a.pdf"
+        assert item.preview == "https://cdn.example.com/previews/a.png?signed"
+        assert resolver.batches == [["previews/a.png"]]
+
+        with pytest.raises(ConfigError, match="are not file fields of the model"):
+
+            class TitleSchema(ModelSchema):
+                class Config:
+                    model = Document
+                    file_url_resolver = {"title": resolver}
+
+    def test_cached_resolver(self):
+        resolver = CachedFileURLResolver(timeout=60)
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["file"]
+                file_url_resolver = resolver
+
+        self.create_documents()
+        first = DocumentSchema.from_orm_many(Document.objects.order_by("pk"))
+        assert stub_storage.url_calls == 2
+        second = DocumentSchema.from_orm_many(Document.objects.order_by("pk"))
+        assert stub_storage.url_calls == 2
+        assert [item.file for item in second] == [item.file for item in first]
+        assert (resolver.hits, resolver.misses) == (2, 2)
+
+    def test_nested_schemas_batched(self, django_assert_num_queries):
+        resolver = BatchResolver()
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["title", "file"]
+                file_url_resolver = resolver
+
+        class AttachmentSchema(ModelSchema):
+            document: DocumentSchema
+
+            class Config:
+                model = Attachment
+                include = ["note", "document"]
+
+        for document in self.create_documents()[:3]:
+            Attachment.objects.create(document=document, note=document.title)
+        queryset = Attachment.objects.select_related("document").order_by("pk")
+        with django_assert_num_queries(1):
+            items = AttachmentSchema.from_orm_many(queryset)
+        assert [item.document.file for item in items] == [
+            "https://cdn.example.com/docs/a.pdf?signed",
+            "https://cdn.example.com/docs/b.pdf?signed",
+            "https://cdn.example.com/docs/a.pdf?signed",
+        ]
+        assert resolver.batches == [["docs/a.pdf", "docs/b.pdf"]]
+
+        # not joined: the nested files are resolved as they are read, no extra query
+        with django_assert_num_queries(4):
+            AttachmentSchema.from_orm_many(Attachment.objects.order_by("pk"))
+        assert resolver.batches[1:] == [["docs/a.pdf"], ["docs/b.pdf"]]
+
+    def test_request_scoped_memo(self):
+        resolver = BatchResolver()
+
+        class DocumentSchema(ModelSchema):
+            class Config:
+                model = Document
+                include = ["file"]
+                file_url_resolver = resolver
+
+        self.create_documents()
+
+        def view(request):
+            first = DocumentSchema.from_orm_many(Document.objects.order_by("pk"))
+            DocumentSchema.dump_json_many(Document.objects.order_by("pk"))
+            single = DocumentSchema.from_orm(Document.objects.get(title="b"))
+            return [item.file for item in first] + [single.file]
+
+        urls = FileURLMemoMiddleware(view)(None)
+        assert urls[1] == urls[4] == "https://cdn.example.com/docs/b.pdf?signed"
+        assert resolver.batches == [["docs/a.pdf", "docs/b.pdf"]]
+        assert get_file_url_memo() is None
+
+        # a memo activated by hand spans the calls of its block
+        with FileURLMemo().activate() as memo:
+            DocumentSchema.from_orm_many(Document.objects.order_by("pk"))
+            DocumentSchema.construct_many(Document.objects.order_by("pk"))
+        assert len(memo) == 2
+        assert len(resolver.batches) == 2
@@ -0,0 +1,113 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from ninja_schema import ModelSchema, Schema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Product, Reading
+
+READINGS_CSV = """count,value,active,taken_on,taken_at,duration
+3,1.5,true,2021-06-01,10:30:15,
+-1,,0,1969-12-31,,
+x,2.0,,2021-06-02,,
+"""
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+class TestReadCSV:
+    @pytest.fixture
+    def reading_schema(self):
+        class ReadingSchema(ModelSchema):
+            class Config:
+                model = Reading
+                include = ["count", "value", "active", "taken_on", "taken_at"]
+
+        return ReadingSchema
+
+    @pytest.mark.parametrize("as_bytes", [False, True])
+    def test_read_csv_decodes_columns(self, reading_schema, as_bytes):
+        fileobj = (
+            io.BytesIO(READINGS_CSV.encode()) if as_bytes else io.StringIO(READINGS_CSV)
+        )
+        results = list(reading_schema.read_csv(fileobj, batch_size=2))
+        assert [index for index, _ in results] == [0, 1, 2]
+
+        first, second = results[0][1], results[1][1]
+        assert (first.count, first.value, first.active) == (3, 1.5, True)
+        assert first.taken_on == datetime.date(2021, 6, 1)
+        assert first.taken_at == datetime.time(10, 30, 15)
+        # blank nullable cells are None, blank non-nullable cells use the default
+        assert (second.count, second.value, second.active) == (-1, None, False)
+        assert second.taken_at is None
+
+        error = results[2][1]
+        assert isinstance(error, pydantic.ValidationError)
+        assert [e["loc"] for e in error.errors()] == [("count",)]
+
+    def test_read_csv_raise_errors(self, reading_schema):
+        with pytest.raises(pydantic.ValidationError):
+            list(reading_schema.read_csv(io.StringIO(READINGS_CSV), raise_errors=True))
+
+    def test_read_csv_raise_errors_locates_rows_after_first_batch(self, reading_schema):
+        with pytest.raises(pydantic.ValidationError) as exc_info:
+            list(
+                reading_schema.read_csv(
+                    io.StringIO(READINGS_CSV), batch_size=2, raise_errors=True
+                )
+            )
+        # the third row, first of the second batch
+        assert [e["loc"] for e in exc_info.value.errors()] == [(2, "count")]
+
+    @pytest.mark.django_db
+    def test_read_csv_bulk_create(self, django_assert_num_queries):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "contact", "status", "website"]
+
+        csv_data = (
+            "name,price,contact,status,website\n"
+            "Pen,1.50,a@b.com,published,https://example.com\n"
+            "Ink,not a price,a@b.com,draft,\n"
+            "Pad,2,a@b.com,,\n"
+        )
+        results = ProductSchema.read_csv(
+            io.StringIO(csv_data), batch_size=2, bulk_create=True
+        )
+        # savepoint, insert and release per batch
+        with django_assert_num_queries(6):
+            results = list(results)
+
+        assert isinstance(results[1][1], pydantic.ValidationError)
+        saved = [product for _, product in results if isinstance(product, Product)]
+        assert [product.pk for product in saved] == list(
+            Product.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        assert list(
+            Product.objects.order_by("pk").values_list("name", "price", "status")
+        ) == [("Pen", Decimal("1.50"), "published"), ("Pad", Decimal("2"), "draft")]
+
+    def test_read_ndjson(self, reading_schema):
+        lines = [
+            {"count": 1, "taken_on": "2021-06-01", "active": False},
+            {"count": "two", "taken_on": "2021-06-01"},
+        ]
+        data = "\n".join(json.dumps(line) for line in lines) + "\n\n"
+        results = list(reading_schema.read_ndjson(io.BytesIO(data.encode())))
+        assert results[0][1].active is False
+        assert isinstance(results[1][1], pydantic.ValidationError)
+
+        with pytest.raises(ValueError, match="line 2"):
+            list(reading_schema.read_ndjson(io.StringIO('{"count": 1}\n{"count"\n')))
+
+    def test_bulk_create_requires_model_schema(self):
+        class ItemSchema(Schema):
+            id: int
+
+        with pytest.raises(ConfigError, match="requires a ModelSchema"):
+            ItemSchema.read_ndjson(io.StringIO(""), bulk_create=True)
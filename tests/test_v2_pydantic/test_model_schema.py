@@ -1,5 +1,7 @@
 import json
 import typing as t
+from decimal import Decimal
+from unittest import mock
 
 import pydantic
 import pytest
@@ -7,8 +9,9 @@ from django.db.models import Model as DjangoModel
 
 from ninja_schema import ModelSchema, SchemaFactory, model_validator
 from ninja_schema.errors import ConfigError
+from ninja_schema.orm.utils.converter import convert_django_field_with_choices
 from ninja_schema.pydanticutils import IS_PYDANTIC_V1
-from tests.models import Event
+from tests.models import Event, Product
 
 T = t.TypeVar("T", bound=DjangoModel)
 
@@ -222,12 +225,12 @@ class TestModelSchema:
                     "title": "Id",
                 },
                 "title": {
-                    "anyOf": [{"type": "string"}, {"type": "null"}],
+                    "anyOf": [{"maxLength": 100, "type": "string"}, {"type": "null"}],
                     "default": None,
                     "description": "",
                     "title": "Title",
                 },
-                "category": {
+                "category_id": {
                     "anyOf": [{"type": "integer"}, {"type": "null"}],
                     "default": None,
                     "description": "",
@@ -280,6 +283,23 @@ class TestModelSchema:
             "type": "object",
         }
 
+    @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+    def test_schema_optional_fields_keep_constraints(self):
+        class ProductUpdateSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price"]
+                optional = "__all__"
+
+        assert ProductUpdateSchema().dict() == {"name": None, "price": None}
+        assert ProductUpdateSchema(price="12.50").price == Decimal("12.50")
+        with pytest.raises(pydantic.ValidationError):
+            ProductUpdateSchema(name="x" * 101)
+        with pytest.raises(pydantic.ValidationError):
+            ProductUpdateSchema(price="1.125")
+        with pytest.raises(pydantic.ValidationError):
+            ProductUpdateSchema(price="123456789.5")
+
     @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
     def test_schema_custom_fields(self):
         class Event6Schema(ModelSchema):
@@ -483,6 +503,41 @@ class TestModelSchema:
         json_event.apply_to_model(event)
         assert event.title == "PyConf Updated"
 
+    @pytest.mark.django_db
+    @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+    def test_apply_to_model_tracks_changed_fields(self, django_assert_num_queries):
+        class ProductUpdateSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "contact", "status"]
+                optional = "__all__"
+
+        product = Product.objects.create(
+            name="Pen", price=Decimal("1.50"), contact="sales@example.com"
+        )
+        schema = ProductUpdateSchema(
+            name="Pen", price=Decimal("2.00"), status="published"
+        )
+        update_fields = schema.apply_to_model(
+            product, only_set=True, track_changes=True
+        )
+        assert update_fields == ["price", "status"]
+        assert product.status == "published"
+        assert product.contact == "sales@example.com"
+
+        with django_assert_num_queries(1) as context:
+            product.save(update_fields=update_fields)
+        assert "contact" not in context.captured_queries[0]["sql"]
+        product.refresh_from_db()
+        assert (product.name, product.price) == ("Pen", Decimal("2.00"))
+        assert schema.apply_to_model(product, only_set=True, track_changes=True) == []
+
+        update_fields = ProductUpdateSchema(name="Pen").apply_to_model(
+            product, track_changes=True
+        )
+        assert "name" not in update_fields
+        assert "contact" in update_fields and product.contact is None
+
     @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
     def test_abstract_model_schema_does_not_raise_exception_for_incomplete_configuration(
         self,
@@ -553,3 +608,129 @@ class TestModelSchema:
         instance_event = event.save()
         assert isinstance(instance_event, Event)
         assert instance_event.title == "PyConf 2021"
+
+    @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+    def test_subclass_reuses_parent_fields(self):
+        class ProductBase(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "price", "status"]
+
+        with mock.patch(
+            "ninja_schema.orm.model_schema.convert_django_field_with_choices",
+            wraps=convert_django_field_with_choices,
+        ) as convert:
+
+            class ProductDetail(ProductBase):
+                name: t.Optional[str]
+                rank: t.Optional[int]
+
+                class Config:
+                    model = Product
+                    include = ["name", "price", "status"]
+
+            assert convert.call_count == 0
+
+            class ProductNames(ProductBase):
+                class Config:
+                    model = Product
+                    include = ["name"]
+
+            assert convert.call_count == 1
+
+        detail = ProductDetail(price="1.50", status="published")
+        assert (detail.name, detail.rank) == (None, None)
+        assert set(ProductDetail.__ninja_schema_config__.django_fields) == {
+            "name",
+            "price",
+            "status",
+        }
+        assert (
+            ProductDetail.schema()["properties"]["status"]
+            == (ProductBase.schema()["properties"]["status"])
+        )
+        assert list(ProductNames.__ninja_schema_config__.django_fields) == ["name"]
+
+    @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+    def test_converted_fields_are_shared(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "status"]
+
+        class ProductUpdateSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["name", "status"]
+                optional = ["name"]
+
+        fields, update_fields = (
+            ProductSchema.model_fields,
+            ProductUpdateSchema.model_fields,
+        )
+        # one choices Enum for both schemas
+        assert fields["status"].annotation is update_fields["status"].annotation
+        assert fields["name"].is_required()
+        assert not update_fields["name"].is_required()
+        _, schema = pydantic.json_schema.models_json_schema(
+            [(ProductSchema, "validation"), (ProductUpdateSchema, "validation")]
+        )
+        assert list(schema["$defs"]) == [
+            "ProductSchema",
+            "ProductUpdateSchema",
+            "StatusEnum",
+        ]
+
+    @pytest.mark.django_db
+    @pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+    def test_schema_nested_field_selection(self, django_assert_num_queries):
+        from tests.models import Category, Day, Week
+
+        class EventNestedSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = ["id", "title", "category__name"]
+
+        class WeekNestedSchema(ModelSchema):
+            class Config:
+                model = Week
+                depth = {"days": 1}
+
+        category = Category.objects.create(
+            name="Music", start_date="2021-01-01", end_date="2021-12-31"
+        )
+        event = Event.objects.create(title="Jazz", category=category)
+        week = Week.objects.create(name="week-1")
+        monday = Day.objects.create(name="Monday")
+        week.days.set([monday])
+
+        assert EventNestedSchema.get_query_plan().select_related == ["category"]
+        with django_assert_num_queries(1):
+            (event,) = EventNestedSchema.optimize_queryset(Event.objects.all())
+            assert EventNestedSchema.from_orm(event).dict() == {
+                "id": event.pk,
+                "title": "Jazz",
+                "category": {"name": "Music"},
+            }
+        with django_assert_num_queries(2):
+            (week,) = WeekNestedSchema.optimize_queryset(Week.objects.all())
+            assert WeekNestedSchema.from_orm(week).dict()["days"] == [
+                {"id": monday.pk, "name": "Monday"}
+            ]
+        assert list(EventNestedSchema.schema()["$defs"]) == [
+            "EventNestedSchemaCategory"
+        ]
+
+        with pytest.raises(ConfigError, match="are not relations of the model"):
+
+            class EventInvalidSchema(ModelSchema):
+                class Config:
+                    model = Event
+                    include = ["title__name"]
+
+        with pytest.raises(ConfigError, match="are not relations of the model"):
+
+            class WeekInvalidSchema(ModelSchema):
+                class Config:
+                    model = Week
+                    depth = {"name": 1}
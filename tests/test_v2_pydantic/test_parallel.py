@@ -0,0 +1,130 @@
+import json
+import multiprocessing
+
+import pytest
+from django.db import connections
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.orm.parallel import get_pk_ranges
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Day, Event, Week
+
+
+class EventParallelSchema(ModelSchema):
+    model_config = {"model": Event, "include": "__all__", "depth": 1}
+
+
+class WeekParallelSchema(ModelSchema):
+    model_config = {"model": Week, "include": "__all__", "depth": 1}
+
+
+def create_events(count):
+    return [
+        Event.objects.create(
+            title=f"Event {i}",
+            category=Category.objects.create(
+                name=f"Conf {i}", start_date="2021-06-01", end_date="2021-06-30"
+            )
+            if i % 2
+            else None,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestParallelDump:
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_parallel_dump_is_ordered(self, trusted):
+        create_events(23)
+        chunks = list(
+            EventParallelSchema.parallel_dump(
+                Event.objects.all(),
+                workers=2,
+                partitions=5,
+                trusted=trusted,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+        )
+        assert len(chunks) == 5
+        lines = b"".join(chunks).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            json.loads(EventParallelSchema.from_orm(event).json())
+            for event in Event.objects.order_by("pk")
+        ]
+
+    def test_parallel_dump_filtered_queryset(self):
+        create_events(10)
+        chunks = EventParallelSchema.parallel_dump(
+            Event.objects.filter(category__isnull=False),
+            workers=2,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        titles = [json.loads(line)["title"] for line in b"".join(chunks).splitlines()]
+        assert titles == ["Event 1", "Event 3", "Event 5", "Event 7", "Event 9"]
+
+    def test_parallel_dump_keeps_caller_connections(self, monkeypatch):
+        create_events(4)
+        closed = []
+        monkeypatch.setattr(
+            type(connections["default"]),
+            "close",
+            lambda self: closed.append(self.alias),
+        )
+        chunks = EventParallelSchema.parallel_dump(
+            Event.objects.all(),
+            workers=2,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        assert len(b"".join(chunks).splitlines()) == 4
+        assert closed == []
+
+    def test_parallel_dump_rejects_sliced_queryset(self):
+        create_events(4)
+        with pytest.raises(ConfigError, match="can not split a sliced queryset"):
+            EventParallelSchema.parallel_dump(Event.objects.all()[:2], workers=2)
+
+    def test_parallel_dump_requires_importable_schema(self):
+        class LocalEventSchema(ModelSchema):
+            class Config:
+                model = Event
+                include = "__all__"
+
+        with pytest.raises(ConfigError, match="can not be imported by reference"):
+            LocalEventSchema.parallel_dump(Event.objects.all(), workers=2)
+
+    def test_get_pk_ranges(self):
+        events = create_events(10)
+        first = events[0].pk
+        assert get_pk_ranges(Event.objects.all(), 3) == [
+            (first, first + 4),
+            (first + 4, first + 8),
+            (first + 8, first + 10),
+        ]
+        assert get_pk_ranges(Event.objects.none(), 3) == []
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestQueryPlan:
+    def test_query_plan(self, django_assert_num_queries):
+        create_events(5)
+        week = Week.objects.create(name="First")
+        week.days.set([Day.objects.create(name="Mon"), Day.objects.create(name="Tue")])
+
+        assert EventParallelSchema.get_query_plan().select_related == ["category"]
+        with django_assert_num_queries(1):
+            events = [
+                EventParallelSchema.from_orm(event)
+                for event in EventParallelSchema.optimize_queryset(Event.objects.all())
+            ]
+        assert events[1].category.name == "Conf 1"
+
+        with django_assert_num_queries(2):
+            weeks = [
+                WeekParallelSchema.from_orm(week)
+                for week in WeekParallelSchema.optimize_queryset(Week.objects.all())
+            ]
+        assert [day.name for day in weeks[0].days] == ["Mon", "Tue"]
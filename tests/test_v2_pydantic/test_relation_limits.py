@@ -0,0 +1,106 @@
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Day, Week
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestRelationLimits:
+    def test_capped_relations(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+                relation_limits = {"days": 2}
+                relation_ordering = {"days": "-name"}
+                relation_counts = ["days"]
+                depth = 1
+
+        class DaySchema(ModelSchema):
+            class Config:
+                model = Day
+                include = ["name"]
+                reverse_relations = ["week_set"]
+                relation_limits = {"week_set": 1}
+
+        days = [Day.objects.create(name=name) for name in "MTWRF"]
+        busy, quiet = (
+            Week.objects.create(name="busy"),
+            Week.objects.create(name="quiet"),
+        )
+        busy.days.set(days)
+        quiet.days.set(days[:1])
+        expected = [
+            {
+                "name": "busy",
+                "days": [
+                    {"id": days[2].pk, "name": "W"},
+                    {"id": days[1].pk, "name": "T"},
+                ],
+                "days_count": 5,
+            },
+            {
+                "name": "quiet",
+                "days": [{"id": days[0].pk, "name": "M"}],
+                "days_count": 1,
+            },
+        ]
+
+        with django_assert_num_queries(2):
+            queryset = WeekSchema.optimize_queryset(Week.objects.order_by("pk"))
+            assert [WeekSchema.from_orm(week).dict() for week in queryset] == expected
+        with django_assert_num_queries(2):
+            queryset = WeekSchema.optimize_queryset(Week.objects.order_by("pk"))
+            items = [item.dict() for item in WeekSchema.construct_many(queryset)]
+        assert items == expected
+        # without the query plan, the list is limited by its own query
+        assert WeekSchema.from_orm(Week.objects.get(pk=busy.pk)).dict() == expected[0]
+
+        monday = DaySchema.from_orm(days[0])
+        assert len(monday.week_set) == 1
+
+        # the count is read from the parent's query, a schema built without it has None
+        week = WeekSchema(name="new", days=[])
+        assert week.days_count is None
+
+    def test_prefetched_without_window(self, django_assert_num_queries):
+        class WeekSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+                relation_limits = {"days": 2}
+                relation_ordering = {"days": "-name"}
+                depth = 1
+
+        class WeekByRelationSchema(ModelSchema):
+            class Config:
+                model = Week
+                include = ["name", "days"]
+                relation_limits = {"days": 2}
+                relation_ordering = {"days": "week__name"}
+
+        days = [Day.objects.create(name=name) for name in "MTWRF"]
+        week = Week.objects.create(name="busy")
+        week.days.set(days)
+
+        # a plain prefetch holds every row in pk order, sorted before the cut
+        week = Week.objects.prefetch_related("days").get(pk=week.pk)
+        with django_assert_num_queries(0):
+            data = WeekSchema.from_orm(week).dict()
+        assert [day["name"] for day in data["days"]] == ["W", "T"]
+
+        # an ordering across relations is queried again
+        with django_assert_num_queries(1):
+            data = WeekByRelationSchema.from_orm(week).dict()
+        assert len(data["days"]) == 2
+
+    def test_relation_limits_need_lists(self):
+        with pytest.raises(ConfigError, match="are not many-to-many or reverse"):
+
+            class WeekSchema(ModelSchema):
+                class Config:
+                    model = Week
+                    relation_limits = {"name": 2}
@@ -0,0 +1,160 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from ninja_schema import ModelSchema
+from ninja_schema.errors import ConfigError
+from ninja_schema.pydanticutils import IS_PYDANTIC_V1
+from tests.models import Category, Day, Event, Product, Reading, Week
+
+
+@pytest.mark.skipif(IS_PYDANTIC_V1, reason="requires pydantic == 2.1.x")
+@pytest.mark.django_db
+class TestReverseRelations:
+    def _products(self):
+        products = []
+        for name in ("Pen", "Ink"):
+            product = Product.objects.create(
+                name=name, price=Decimal("1.50"), contact="sales@example.com"
+            )
+            for count in (1, 2):
+                Reading.objects.create(
+                    product=product, count=count, taken_on=datetime.date(2021, 6, 1)
+                )
+            products.append(product)
+        return products
+
+    def test_reverse_foreign_key(self, django_assert_num_queries):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name"]
+                reverse_relations = ["reading_set"]
+
+        class ProductReadingsSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "reading_set__count"]
+                reverse_relations = ["reading_set"]
+
+        pen, ink = self._products()
+        # reverse relations follow the model's own fields
+        assert list(ProductSchema.json_schema()["properties"]) == [
+            "id",
+            "name",
+            "reading_set",
+        ]
+        with django_assert_num_queries(2):
+            queryset = ProductSchema.optimize_queryset(Product.objects.order_by("pk"))
+            items = [ProductSchema.from_orm(product).dict() for product in queryset]
+        assert list(items[0]) == ["id", "name", "reading_set"]
+        assert items[0] == {
+            "id": pen.pk,
+            "name": "Pen",
+            "reading_set": list(pen.reading_set.values_list("pk", flat=True)),
+        }
+
+        with django_assert_num_queries(2):
+            queryset = ProductReadingsSchema.optimize_queryset(
+                Product.objects.order_by("pk")
+            )
+            items = ProductReadingsSchema.construct_many(queryset)
+        assert items[1].dict() == {
+            "id": ink.pk,
+            "reading_set": [{"count": 1}, {"count": 2}],
+        }
+
+    def test_reverse_many_to_many_and_one_to_one(self, django_assert_num_queries):
+        class DaySchema(ModelSchema):
+            class Config:
+                model = Day
+                include = ["name"]
+                reverse_relations = ["week_set"]
+
+        class CategorySchema(ModelSchema):
+            class Config:
+                model = Category
+                include = ["name"]
+                reverse_relations = ["event"]
+                depth = 1
+                skip_registry = True
+
+        monday = Day.objects.create(name="M")
+        week = Week.objects.create(name="w1")
+        week.days.add(monday)
+        music, talks = (
+            Category.objects.create(
+                name=name,
+                start_date=datetime.date(2021, 6, 1),
+                end_date=datetime.date(2021, 6, 30),
+            )
+            for name in ("Music", "Talks")
+        )
+        event = Event.objects.create(title="Gig", category=music)
+
+        with django_assert_num_queries(2):
+            days = DaySchema.optimize_queryset(Day.objects.all())
+            assert [DaySchema.from_orm(day).dict() for day in days] == [
+                {"name": "M", "week_set": [week.pk]}
+            ]
+        with django_assert_num_queries(1):
+            categories = CategorySchema.optimize_queryset(
+                Category.objects.order_by("pk")
+            )
+            items = [CategorySchema.from_orm(category) for category in categories]
+        assert items[0].event.id == event.pk
+        assert items[1].dict() == {"name": "Talks", "event": None}
+
+    def test_reverse_relations_are_opt_in(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = "__all__"
+
+        assert "reading_set" not in ProductSchema.json_schema()["properties"]
+
+        with pytest.raises(ConfigError, match="are not reverse relations"):
+
+            class InvalidSchema(ModelSchema):
+                class Config:
+                    model = Product
+                    reverse_relations = ["readings"]
+
+    def test_write_round_trip(self):
+        class ProductSchema(ModelSchema):
+            class Config:
+                model = Product
+                include = ["id", "name", "price", "contact"]
+                reverse_relations = ["reading_set"]
+
+        pen, ink = self._products()
+        data = ProductSchema.from_orm(pen).dict()
+        assert len(data["reading_set"]) == 2
+
+        # reverse relations are read-only, they are not assigned
+        ProductSchema(**{**data, "name": "Pencil"}).apply_to_model(pen)
+        assert pen.name == "Pencil"
+        pen = Product.objects.get(pk=pen.pk)
+        edited = ProductSchema(**{**data, "name": "Marker"})
+        assert edited.apply_to_model(pen, track_changes=True) == ["name"]
+
+        ink_data = ProductSchema.from_orm(ink).dict()
+        updated = ProductSchema.apply_many(
+            [ink], [ProductSchema(**{**ink_data, "name": "Ink 2"})]
+        )
+        assert updated == {"name"}
+
+        (created,) = ProductSchema.bulk_create(
+            [ProductSchema(**{**data, "id": ink.pk + 100, "name": "Quill"})]
+        )
+        assert created.reading_set.count() == 0
+
+        ProductSchema.upsert([{**ink_data, "name": "Ink 3"}], unique_fields=["id"])
+        assert Product.objects.get(pk=ink.pk).name == "Ink 3"
+        assert [reading.product_id for reading in Reading.objects.order_by("pk")] == [
+            pen.pk,
+            pen.pk,
+            ink.pk,
+            ink.pk,
+        ]